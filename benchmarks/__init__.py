@@ -0,0 +1,7 @@
+"""
+Benchmarks für den Kern von Calendrum, laufen ohne Kivy.
+
+    python -m benchmarks.suite          Gesamte Suite mit JSON-Ausgabe und Vergleich gegen eine Basislinie
+    python -m benchmarks.bench_id_index Kosten je Operation des ID-Index bei wachsender Eventliste
+    python -m benchmarks.bench_start    Startzeit des Kerns bei wachsender events.csv
+"""
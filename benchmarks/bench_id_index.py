@@ -0,0 +1,62 @@
+"""
+Benchmark: Kosten je Operation des ID-Index im Eventmanager.
+
+Misst Erstellen, Aufrufen und Entfernen bei wachsender Anzahl von Events.
+Die Zeiten je Operation sollten unabhängig von der Größe der Eventliste flach bleiben.
+Läuft ohne Dateizugriffe (Speicher-Basisklasse als reiner Arbeitsspeicher-Backend).
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.bench_id_index [max_anzahl]
+"""
+
+from contextlib import redirect_stdout
+from time import perf_counter
+import io
+import sys
+
+from scripts.m_datumzeit import Datumzeit
+from scripts.m_eventman import Eventman
+from scripts.m_speicher import Speicher
+
+STICHPROBE = 1000  # Anzahl gemessener Operationen je Größe
+
+
+def messen(anzahl:int) -> dict[str, float]:
+    """Füllt einen Eventmanager mit anzahl Events und misst die Kosten je Operation.
+    :param anzahl: Anzahl der Events vor der Messung.
+    :return: Mikrosekunden je Operation für erstellen, aufrufen und entfernen.
+    """
+    with redirect_stdout(io.StringIO()):
+        em = Eventman(speicher=Speicher())
+    zeit = Datumzeit(2999, 1, 1, 0, 0, 0)
+    ausgabe = io.StringIO()
+    with redirect_stdout(ausgabe):
+        for i in range(anzahl):
+            em.event_erstellen(zeit, "test", f"Event {i}")
+            if i % 10000 == 0:
+                ausgabe.seek(0); ausgabe.truncate()
+        ergebnis = {}
+        start = perf_counter()
+        for i in range(STICHPROBE):
+            em.event_erstellen(zeit, "test", "Messung")
+        ergebnis["erstellen"] = (perf_counter() - start) / STICHPROBE * 1e6
+        ids = [ev.id for ev in em.event_liste[:STICHPROBE]]
+        start = perf_counter()
+        for event_id in ids:
+            em.event_aufrufen(event_id)
+        ergebnis["aufrufen"] = (perf_counter() - start) / STICHPROBE * 1e6
+        start = perf_counter()
+        for event_id in ids:
+            em.event_entfernen(event_id)
+        ergebnis["entfernen"] = (perf_counter() - start) / STICHPROBE * 1e6
+    return ergebnis
+
+
+if __name__ == "__main__":
+    max_anzahl = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    anzahl = 1000
+    print(f"{'Events':>10} {'erstellen µs':>14} {'aufrufen µs':>14} {'entfernen µs':>14}")
+    while anzahl <= max_anzahl:
+        werte = messen(anzahl)
+        print(f"{anzahl:>10} {werte['erstellen']:>14.2f} {werte['aufrufen']:>14.2f} {werte['entfernen']:>14.2f}")
+        anzahl *= 10
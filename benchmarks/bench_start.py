@@ -0,0 +1,72 @@
+"""
+Benchmark: Startzeit des Kerns bei wachsender Anzahl gespeicherter Events.
+
+Misst ohne Kivy die Schritte, die die App nach dem ersten Frame im Hintergrund ausführt:
+Laden der events.csv in den Eventmanager, Aufbau des Zeitindex im Kalender und Berechnung des ersten Monats.
+Zusätzlich wird die Importzeit der Kernmodule gemessen, die vor dem ersten Frame anfällt.
+Die App selbst meldet beim Start "erster Frame nach … ms, … Events geladen nach … ms" (CalendrumApp.startzeiten).
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.bench_start [max_anzahl]
+"""
+
+from contextlib import redirect_stdout
+from time import perf_counter
+import io
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.generator import csv_schreiben
+
+
+def importzeit() -> float:
+    """Misst in einem frischen Interpreter, wie lange der Import der Kernmodule dauert.
+    :return: Millisekunden.
+    """
+    code = ("from time import perf_counter; start = perf_counter(); "
+            "import scripts.m_eventman, scripts.m_kalender, scripts.m_monatsansicht; "
+            "import sys; print((perf_counter() - start) * 1000); "
+            "print(any(name.split('.')[0] == 'kivy' for name in sys.modules))")
+    ausgabe = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.split()
+    if ausgabe[1] != "False":
+        print("Warnung: Der Import der Kernmodule lädt Kivy.")
+    return float(ausgabe[0])
+
+
+def messen(anzahl:int) -> dict[str, float]:
+    """Misst Laden, Indexaufbau und ersten Monat für eine events.csv mit anzahl Events.
+    :param anzahl: Anzahl der Events.
+    :return: Millisekunden je Schritt.
+    """
+    from scripts.m_eventman import Eventman
+    from scripts.m_kalender import Kalender
+    from scripts.m_monatsansicht import Monatsansicht
+    with tempfile.TemporaryDirectory() as ordner:
+        Eventman.EVENTS_CSV = os.path.join(ordner, "events.csv")
+        csv_schreiben(Eventman.EVENTS_CSV, anzahl)
+        ergebnis = {}
+        with redirect_stdout(io.StringIO()):
+            start = perf_counter()
+            em = Eventman()
+            ergebnis["laden"] = (perf_counter() - start) * 1000
+            start = perf_counter()
+            kalender = Kalender(em.event_liste, em)
+            ergebnis["index"] = (perf_counter() - start) * 1000
+            start = perf_counter()
+            Monatsansicht(kalender, em).raster(2090, 1)
+            ergebnis["monat"] = (perf_counter() - start) * 1000
+            em.schliessen()
+    return ergebnis
+
+
+if __name__ == "__main__":
+    max_anzahl = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"Import der Kernmodule: {importzeit():.1f} ms")
+    anzahl = 100
+    print(f"{'Events':>10} {'laden ms':>10} {'index ms':>10} {'monat ms':>10} {'gesamt ms':>10}")
+    while anzahl <= max_anzahl:
+        werte = messen(anzahl)
+        print(f"{anzahl:>10} {werte['laden']:>10.1f} {werte['index']:>10.1f} {werte['monat']:>10.1f} {sum(werte.values()):>10.1f}")
+        anzahl *= 10
@@ -0,0 +1,69 @@
+"""
+Synthetische Events für die Benchmarks.
+
+Erzeugt reproduzierbar (fester Seed) beliebig viele Events mit einstellbarer Mischung
+aus einmaligen und wiederholten Events sowie einstellbarer Verteilung der Aktionen.
+Die Events können direkt an Eventman.event_erstellen_viele() übergeben oder als events.csv geschrieben werden.
+"""
+
+from csv import writer
+from random import Random
+
+from scripts.m_datumzeit import Zeitpunkt
+from scripts.m_speicher import CsvSpeicher
+from scripts.m_wiederholung import Regel
+
+# Anteile der Wiederholungsarten, "einmalig" = ohne Regel
+WIEDERHOLUNG_STANDARD = {"einmalig": 0.85, "taeglich": 0.05, "woechentlich": 0.04, "monatlich": 0.04, "jaehrlich": 0.02}
+# Gewichte der Aktionen, Schlüssel müssen in Eventman.event_aktionen stehen
+AKTIONEN_STANDARD = {"klingeln": 4, "email": 2, "sms": 2, "anruf": 1, "alarm": 1, "test": 1}
+START_STANDARD = Zeitpunkt.aus_datum(2090, 1, 1)  # weit in der Zukunft, damit beim Laden nichts ausgelöst wird
+
+
+def events_erzeugen(
+        anzahl:int,
+        seed:int = 1,
+        wiederholung:dict[str, float] | None = None,
+        aktionen:dict[str, float] | None = None,
+        start:Zeitpunkt = START_STANDARD,
+        tage:int = 3 * 365):
+    """Erzeugt synthetische Events als Dictionaries mit den Parametern von Eventman.event_erstellen().
+    :param anzahl: Anzahl der Events.
+    :param seed: Startwert des Zufallsgenerators, gleicher Seed → gleiche Events.
+    :param wiederholung: Anteile je Wiederholungsart, siehe WIEDERHOLUNG_STANDARD.
+    :param aktionen: Gewichte je Aktion, siehe AKTIONEN_STANDARD.
+    :param start: Frühester Zeitpunkt der Events.
+    :param tage: Länge des Zeitraums ab start, über den die Events verteilt werden.
+    :return: Generator über Dictionaries (event_zeit, event_akt, event_name, regel).
+    """
+    zufall = Random(seed)
+    wiederholung = wiederholung or WIEDERHOLUNG_STANDARD
+    aktionen = aktionen or AKTIONEN_STANDARD
+    arten, arten_gewichte = list(wiederholung), list(wiederholung.values())
+    namen, namen_gewichte = list(aktionen), list(aktionen.values())
+    zeitraum = tage * 86400
+    for i in range(anzahl):
+        zeit = start.plus_sekunden(zufall.randrange(zeitraum) // 60 * 60)
+        art = zufall.choices(arten, arten_gewichte)[0]
+        regel = None
+        if art == "woechentlich":
+            regel = Regel(art, zeit, wochentage=zufall.sample(range(7), zufall.randint(1, 3)))
+        elif art != "einmalig":
+            regel = Regel(art, zeit, intervall=zufall.choice((1, 1, 2)))
+        yield {"event_zeit": zeit, "event_akt": zufall.choices(namen, namen_gewichte)[0],
+               "event_name": f"Event {i}", "regel": regel}
+
+
+def csv_schreiben(pfad:str, anzahl:int, **optionen) -> None:
+    """Schreibt synthetische Events als events.csv im Format von CsvSpeicher.
+    :param pfad: Zieldatei.
+    :param anzahl: Anzahl der Events.
+    :param optionen: Weitere Parameter von events_erzeugen().
+    """
+    with open(pfad, 'w', newline='', encoding='utf-8') as f:
+        csv_writer = writer(f)
+        csv_writer.writerow([*CsvSpeicher.KOPF, f"{CsvSpeicher.ID_PRAEFIX}{anzahl + 1}"])
+        for event_id, angabe in enumerate(events_erzeugen(anzahl, **optionen), start=1):
+            regel = angabe["regel"]
+            csv_writer.writerow([event_id, str(angabe["event_zeit"].als_liste()), angabe["event_akt"], angabe["event_name"],
+                                 "False", "False", "False", str(regel) if regel is not None else ""])
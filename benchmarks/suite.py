@@ -0,0 +1,404 @@
+"""
+Benchmark-Suite für den Kern (Datumzeit, Event, Eventman, Kalender, Monatsansicht), läuft ohne Kivy.
+
+Jeder Benchmark wird mehrfach wiederholt, gespeichert wird der Median. Ergebnisse werden als JSON geschrieben
+und können mit einer gespeicherten Basislinie verglichen werden, um Verschlechterungen und Gewinne zu sehen.
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.suite [--groesse 10000] [--seed 1] [--wiederholungen 5]
+                               [--ausgabe ergebnis.json] [--vergleich basislinie.json] [--schwelle 0.10]
+                               [--nur name,name]
+"""
+
+from argparse import ArgumentParser
+from contextlib import redirect_stdout
+from datetime import datetime
+from statistics import median
+from time import perf_counter
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+
+from benchmarks.generator import csv_schreiben, events_erzeugen
+from scripts.m_aktionen import Dispatcher
+from scripts.m_datumzeit import Datumzeit, Zeitpunkt
+from scripts.m_eventman import Eventman
+from scripts.m_kalender import Kalender
+from scripts.m_monatsansicht import Monatsansicht
+from scripts.m_speicher import Speicher
+from scripts.m_spalten import NUMPY_VERFUEGBAR, Spaltenspeicher
+from scripts.m_wecker_termine import Wecker, WeckerPlaner
+
+STICHPROBE = 1000  # Anzahl der Operationen bei Messungen je Operation
+BENCHMARKS: dict = {}  # Name → (Funktion, Einheit), gefüllt durch @benchmark
+
+
+def benchmark(einheit:str):
+    """Registriert eine Benchmark-Funktion.
+    Die Funktion erhält den Kontext und gibt die gemessene Zeit in Sekunden zurück.
+    :param einheit: "gesamt" oder "je Operation".
+    """
+    def registrieren(funktion):
+        BENCHMARKS[funktion.__name__] = (funktion, einheit)
+        return funktion
+    return registrieren
+
+
+class Kontext:
+    """Gemeinsame Eingaben aller Benchmarks einer Größe, werden einmal erzeugt.
+    ————————————Attribute: ————————————
+        groesse (int): Anzahl der Events.
+        seed (int): Startwert des Generators.
+        ordner (str): Temporäres Verzeichnis für Dateien.
+        csv_pfad (str): events.csv mit groesse synthetischen Events.
+        snapshot_pfad (str): Binärer Snapshot, den der Eventmanager neben der events.csv schreibt.
+    """
+
+    def __init__(self, groesse:int, seed:int, ordner:str) -> None:
+        self.groesse = groesse
+        self.seed = seed
+        self.ordner = ordner
+        self.csv_pfad = os.path.join(ordner, "events.csv")
+        self.snapshot_pfad = os.path.join(ordner, "events.snapshot")
+        csv_schreiben(self.csv_pfad, groesse, seed=seed)
+
+    def eventman(self) -> Eventman:
+        """Gibt einen Eventmanager ohne Dateizugriffe mit den synthetischen Events zurück."""
+        em = Eventman(speicher=Speicher())
+        em.event_erstellen_viele(events_erzeugen(self.groesse, seed=self.seed))
+        return em
+
+    def csv_eventman(self, journal_modus:bool = False, snapshot:bool = False) -> Eventman:
+        """Gibt einen Eventmanager zurück, der die synthetische events.csv lädt.
+        :param snapshot: Bei False wird ein vorhandener Snapshot vorher gelöscht, damit wirklich die CSV-Datei gelesen wird.
+        """
+        if not snapshot and os.path.exists(self.snapshot_pfad):
+            os.remove(self.snapshot_pfad)
+        Eventman.EVENTS_CSV = self.csv_pfad
+        Eventman.EVENTS_JOURNAL = os.path.join(self.ordner, "events.journal")
+        return Eventman(journal_modus=journal_modus)
+
+
+@benchmark("gesamt")
+def csv_laden(kontext:Kontext) -> float:
+    start = perf_counter()
+    em = kontext.csv_eventman()
+    dauer = perf_counter() - start
+    em.schliessen()
+    return dauer
+
+
+@benchmark("gesamt")
+def snapshot_laden(kontext:Kontext) -> float:
+    """Start aus dem binären Snapshot, Events werden erst beim Zugriff erzeugt."""
+    if not os.path.exists(kontext.snapshot_pfad):
+        kontext.csv_eventman().schliessen()
+    start = perf_counter()
+    em = kontext.csv_eventman(snapshot=True)
+    dauer = perf_counter() - start
+    em.schliessen()
+    return dauer
+
+
+@benchmark("je Operation")
+def speichern_csv(kontext:Kontext) -> float:
+    """Ein Event erstellen, ohne Journal wird dabei die ganze CSV-Datei neu geschrieben."""
+    em = kontext.csv_eventman()
+    zeit = Zeitpunkt.aus_datum(2999, 1, 1)
+    start = perf_counter()
+    for _ in range(10):
+        em.event_erstellen(zeit, "test", "Messung")
+    dauer = (perf_counter() - start) / 10
+    em.schliessen()
+    csv_schreiben(kontext.csv_pfad, kontext.groesse, seed=kontext.seed)
+    return dauer
+
+
+@benchmark("je Operation")
+def speichern_journal(kontext:Kontext) -> float:
+    """Ein Event erstellen im Journal-Modus (eine angehängte Zeile)."""
+    em = kontext.csv_eventman(journal_modus=True)
+    zeit = Zeitpunkt.aus_datum(2999, 1, 1)
+    start = perf_counter()
+    for _ in range(STICHPROBE):
+        em.event_erstellen(zeit, "test", "Messung")
+    dauer = (perf_counter() - start) / STICHPROBE
+    em.schliessen()
+    os.remove(Eventman.EVENTS_JOURNAL)
+    csv_schreiben(kontext.csv_pfad, kontext.groesse, seed=kontext.seed)
+    return dauer
+
+
+@benchmark("gesamt")
+def abgleich_journal(kontext:Kontext) -> float:
+    """Zweiter Prozess (hier ein zweiter Eventmanager) übernimmt STICHPROBE fremde Änderungen aus dem Journal."""
+    em = kontext.csv_eventman(journal_modus=True)
+    anderer = kontext.csv_eventman(journal_modus=True)
+    zeit = Zeitpunkt.aus_datum(2999, 1, 1)
+    for _ in range(STICHPROBE):
+        anderer.event_erstellen(zeit, "test", "Messung")
+    start = perf_counter()
+    em.aktualisieren()
+    dauer = perf_counter() - start
+    anderer.schliessen()
+    em.schliessen()
+    os.remove(Eventman.EVENTS_JOURNAL)
+    csv_schreiben(kontext.csv_pfad, kontext.groesse, seed=kontext.seed)
+    return dauer
+
+
+@benchmark("je Operation")
+def trigger_leerlauf(kontext:Kontext) -> float:
+    """event_trigger() ohne fällige Events."""
+    em = kontext.eventman()
+    start = perf_counter()
+    for _ in range(STICHPROBE):
+        em.event_trigger()
+    return (perf_counter() - start) / STICHPROBE
+
+
+@benchmark("je Operation")
+def wecker_schlummern(kontext:Kontext) -> float:
+    """Schlummern (Verschieben und Neuplanen) eines von STICHPROBE geplanten Weckern, danach ausloesen() ohne Fälligkeit."""
+    planer = WeckerPlaner()
+    ab = Zeitpunkt.jetzt().plus_tage(1)
+    wecker = [Wecker(ab.plus_sekunden(i * 60).als_datumzeit(), None) for i in range(STICHPROBE)]
+    for w in wecker:
+        planer.planen(w)
+    with redirect_stdout(io.StringIO()):  # schlummermodus() meldet die neue Weckzeit
+        start = perf_counter()
+        for w in wecker:
+            planer.schlummern(w, 5)
+            planer.ausloesen()
+        dauer = perf_counter() - start
+    return dauer / STICHPROBE
+
+
+@benchmark("gesamt")
+def trigger_burst(kontext:Kontext) -> float:
+    """event_trigger() mit 1 % der Events gleichzeitig fällig (mindestens 10), ein Viertel davon täglich wiederholt."""
+    em = kontext.eventman()
+    faellig = Zeitpunkt.jetzt().plus_tage(-1)
+    anzahl = max(kontext.groesse // 100, 10)
+    em.event_erstellen_viele({"event_zeit": faellig, "event_akt": "test", "event_name": "Burst", "taeglich": i % 4 == 0}
+                             for i in range(anzahl))
+    start = perf_counter()
+    em.event_trigger()
+    return perf_counter() - start
+
+
+@benchmark("gesamt")
+def alarme_verteilen(kontext:Kontext) -> float:
+    """1000 gleichzeitig fällige Alarme mit Dispatcher: gemessen wird nur event_trigger(), also die Zeit im UI-Thread."""
+    dispatcher = Dispatcher(max_warteschlange=2048)
+    dispatcher.registrieren("alarm", lambda auftrag: None, max_parallel=4)
+    em = Eventman(speicher=Speicher(), dispatcher=dispatcher)
+    faellig = Zeitpunkt.jetzt().plus_tage(-1)
+    em.event_erstellen_viele((faellig, "alarm", "Alarm") for _ in range(1000))
+    start = perf_counter()
+    em.event_trigger()
+    dauer = perf_counter() - start
+    dispatcher.schliessen()
+    return dauer
+
+
+@benchmark("je Operation")
+def event_aufrufen(kontext:Kontext) -> float:
+    em = kontext.eventman()
+    ids = [ev.id for ev in em.event_liste[::max(len(em) // STICHPROBE, 1)]]
+    start = perf_counter()
+    for event_id in ids:
+        em.event_aufrufen(event_id)
+    return (perf_counter() - start) / len(ids)
+
+
+@benchmark("je Operation")
+def event_entfernen(kontext:Kontext) -> float:
+    em = kontext.eventman()
+    ids = [ev.id for ev in em.event_liste[::max(len(em) // STICHPROBE, 1)]]
+    start = perf_counter()
+    for event_id in ids:
+        em.event_entfernen(event_id)
+    return (perf_counter() - start) / len(ids)
+
+
+@benchmark("je Operation")
+def datumzeit_erzeugen(kontext:Kontext) -> float:
+    start = perf_counter()
+    for i in range(STICHPROBE):
+        Datumzeit(2025, i % 12 + 1, i % 28 + 1, i % 24, i % 60, 0)
+    return (perf_counter() - start) / STICHPROBE
+
+
+@benchmark("je Operation")
+def datumzeit_vergleichen(kontext:Kontext) -> float:
+    """Vergleich zweier Datumzeit-Objekte über ihre Zeitpunkte, wie bei Events."""
+    paare = [(Datumzeit(2025, i % 12 + 1, i % 28 + 1, 0, 0, 0), Datumzeit(2025, 6, 15, i % 24, 0, 0)) for i in range(STICHPROBE)]
+    start = perf_counter()
+    for a, b in paare:
+        a.zeitpunkt() < b.zeitpunkt()
+    return (perf_counter() - start) / STICHPROBE
+
+
+@benchmark("gesamt")
+def termine_anzeigen(kontext:Kontext) -> float:
+    """Sortieren und Ausgeben der Termine im Kalender."""
+    termine = [(Datumzeit(*angabe["event_zeit"].als_liste()), angabe["event_name"])
+               for angabe in events_erzeugen(min(kontext.groesse, 100_000), seed=kontext.seed)]
+    kalender = Kalender(termine)
+    start = perf_counter()
+    kalender.termine_anzeigen()
+    return perf_counter() - start
+
+
+@benchmark("je Operation")
+def agenda_naechste_50(kontext:Kontext) -> float:
+    """Die nächsten 50 Termine ab wechselnden Zeitpunkten formatieren, bei bereits sortiertem Kalender."""
+    termine = [(Datumzeit(*angabe["event_zeit"].als_liste()), angabe["event_name"])
+               for angabe in events_erzeugen(min(kontext.groesse, 100_000), seed=kontext.seed)]
+    kalender = Kalender(termine)
+    len(kalender.termine)  # einmaliges Sortieren gehört nicht zur Messung
+    ab = [Datumzeit(2030 + i % 60, i % 12 + 1, i % 28 + 1, 0, 0, 0) for i in range(STICHPROBE)]
+    start = perf_counter()
+    for dz in ab:
+        for _ in kalender.termine_ab(dz, 50):
+            pass
+    return (perf_counter() - start) / STICHPROBE
+
+
+@benchmark("je Operation")
+def feiertag_pruefen(kontext:Kontext) -> float:
+    """ist_feiertag() im Kalender für Tage aus 10 Jahren, die Feiertage eines Jahres werden nur einmal berechnet."""
+    kalender = Kalender([], region="BY")
+    tage = [Datumzeit(2090 + i % 10, i % 12 + 1, i % 28 + 1, 0, 0, 0) for i in range(STICHPROBE)]
+    start = perf_counter()
+    for dz in tage:
+        kalender.ist_feiertag(dz)
+    return (perf_counter() - start) / STICHPROBE
+
+
+@benchmark("je Operation")
+def monatsraster_kalt(kontext:Kontext) -> float:
+    """Berechnung eines Monatsrasters ohne Zwischenspeicher, 12 Monate."""
+    em = kontext.eventman()
+    kalender = Kalender(em.event_liste, em)
+    start = perf_counter()
+    for monat in range(1, 13):
+        Monatsansicht(kalender).raster(2091, monat)
+    return (perf_counter() - start) / 12
+
+
+@benchmark("je Operation")
+def tagesabfrage(kontext:Kontext) -> float:
+    """Vorkommen an einem Tag über den Zeitindex, wiederholte Events eingeschlossen."""
+    em = kontext.eventman()
+    zeitindex = Kalender(em.event_liste, em).zeitindex
+    tage = [Zeitpunkt.aus_datum(2090 + i % 10, i % 12 + 1, i % 28 + 1) for i in range(STICHPROBE)]
+    start = perf_counter()
+    for tag in tage:
+        for _ in zeitindex.vorkommen_im_bereich(tag, tag.plus_tage(1)):
+            pass
+    return (perf_counter() - start) / STICHPROBE
+
+
+@benchmark("je Operation")
+def monatsraster_warm(kontext:Kontext) -> float:
+    """Blättern zwischen bereits berechneten Monaten."""
+    em = kontext.eventman()
+    ansicht = Monatsansicht(Kalender(em.event_liste, em), em)
+    for monat in range(1, 13):
+        ansicht.raster(2091, monat)
+    start = perf_counter()
+    for i in range(STICHPROBE):
+        ansicht.raster(2091, i % 12 + 1)
+    return (perf_counter() - start) / STICHPROBE
+
+
+if NUMPY_VERFUEGBAR:  # die Spalten-Benchmarks gibt es nur mit numpy
+    @benchmark("gesamt")
+    def spalten_heatmap(kontext:Kontext) -> float:
+        """Anzahl je Tag für zwölf Monate über den Spaltenspeicher."""
+        spalten = Spaltenspeicher(kontext.eventman())
+        start = perf_counter()
+        for monat in range(1, 13):
+            spalten.anzahl_je_tag(2090, monat)
+        return perf_counter() - start
+
+
+
+def ausfuehren(groesse:int, seed:int, wiederholungen:int, namen:list[str] | None = None) -> dict:
+    """Führt die Benchmarks aus.
+    :param groesse: Anzahl der synthetischen Events.
+    :param seed: Startwert des Generators.
+    :param wiederholungen: Läufe je Benchmark, gespeichert wird der Median.
+    :param namen: Nur diese Benchmarks, None für alle.
+    :return: Ergebnis als JSON-fähiges Dictionary.
+    """
+    ergebnisse = {}
+    with tempfile.TemporaryDirectory() as ordner:
+        kontext = Kontext(groesse, seed, ordner)
+        for name, (funktion, einheit) in BENCHMARKS.items():
+            if namen and name not in namen:
+                continue
+            with redirect_stdout(io.StringIO()):
+                zeiten = [funktion(kontext) for _ in range(wiederholungen)]
+            ergebnisse[name] = {"sekunden": median(zeiten), "min": min(zeiten), "einheit": einheit}
+            print(f"{name:<24} {median(zeiten) * 1e6:>14.2f} µs  ({einheit})", file=sys.stderr)
+    return {
+        "meta": {"groesse": groesse, "seed": seed, "wiederholungen": wiederholungen,
+                 "python": platform.python_version(), "plattform": platform.platform(),
+                 "zeitpunkt": datetime.now().isoformat(timespec="seconds")},
+        "ergebnisse": ergebnisse,
+    }
+
+
+def vergleichen(aktuell:dict, basis:dict, schwelle:float) -> bool:
+    """Vergleicht zwei Ergebnisse und gibt eine Tabelle aus.
+    :param aktuell: Neues Ergebnis.
+    :param basis: Gespeicherte Basislinie.
+    :param schwelle: Relative Verschlechterung, ab der ein Benchmark als Regression gilt (0.10 = 10 %).
+    :return: True, wenn keine Regression gefunden wurde.
+    """
+    if aktuell["meta"]["groesse"] != basis["meta"]["groesse"]:
+        print(f"Warnung: unterschiedliche Größen ({aktuell['meta']['groesse']} gegen {basis['meta']['groesse']})")
+    ok = True
+    print(f"{'Benchmark':<24} {'Basis µs':>12} {'Aktuell µs':>12} {'Faktor':>8}")
+    for name, wert in aktuell["ergebnisse"].items():
+        alt = basis["ergebnisse"].get(name)
+        if alt is None:
+            print(f"{name:<24} {'-':>12} {wert['sekunden'] * 1e6:>12.2f}      neu")
+            continue
+        faktor = wert["sekunden"] / alt["sekunden"] if alt["sekunden"] else float("inf")
+        markierung = ""
+        if faktor > 1 + schwelle:
+            markierung, ok = "  REGRESSION", False
+        elif faktor < 1 - schwelle:
+            markierung = "  schneller"
+        print(f"{name:<24} {alt['sekunden'] * 1e6:>12.2f} {wert['sekunden'] * 1e6:>12.2f} {faktor:>8.2f}{markierung}")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Benchmark-Suite für den Kern von Calendrum")
+    parser.add_argument("--groesse", type=int, default=10_000, help="Anzahl der synthetischen Events (1k–1M)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--wiederholungen", type=int, default=5)
+    parser.add_argument("--ausgabe", help="Ergebnis als JSON in diese Datei schreiben")
+    parser.add_argument("--vergleich", help="Basislinie (JSON), mit der verglichen wird")
+    parser.add_argument("--schwelle", type=float, default=0.10, help="Relative Verschlechterung, ab der eine Regression gemeldet wird")
+    parser.add_argument("--nur", help="Kommagetrennte Namen der auszuführenden Benchmarks")
+    argumente = parser.parse_args()
+    ergebnis = ausfuehren(argumente.groesse, argumente.seed, argumente.wiederholungen,
+                          argumente.nur.split(",") if argumente.nur else None)
+    if argumente.ausgabe:
+        with open(argumente.ausgabe, "w", encoding="utf-8") as f:
+            json.dump(ergebnis, f, indent=2)
+    else:
+        print(json.dumps(ergebnis, indent=2))
+    if argumente.vergleich:
+        with open(argumente.vergleich, encoding="utf-8") as f:
+            if not vergleichen(ergebnis, json.load(f), argumente.schwelle):
+                sys.exit(1)
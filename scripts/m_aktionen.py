@@ -0,0 +1,297 @@
+"""
+Modul: m_aktionen
+
+Verteiler für die Aktionen ausgelöster Events ("klingeln", "email", "sms", ...).
+Für jede Aktion wird ein Handler registriert, der in einem begrenzten Thread-Pool läuft, nie im Kivy-Thread.
+Je Aktion gibt es eine Obergrenze gleichzeitig laufender Handler, fehlgeschlagene Aufträge werden mit
+exponentiell wachsender Wartezeit wiederholt. Die Warteschlange ist begrenzt: Ist sie voll, wartet der Aufrufer
+höchstens die angegebene Zeit und der Auftrag wird sonst abgewiesen, statt den Speicher unbegrenzt zu füllen.
+Für E-Mail und SMS gibt es lokale Ersatz-Handler, die nichts versenden, damit alles offline testbar ist.
+
+    dispatcher = standard_dispatcher()
+    eventman = Eventman(dispatcher=dispatcher)
+    ...
+    dispatcher.schliessen()
+
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from random import Random
+from threading import Condition, Lock, Thread
+from time import monotonic
+import heapq
+
+from scripts.m_datumzeit import Zeitpunkt
+
+
+class Auftrag:
+    """Ein auszuführender Handler-Aufruf für ein ausgelöstes Event.
+    Enthält eine Kopie der Event-Daten zum Auslösezeitpunkt, da das Event danach verschoben oder entfernt werden kann.
+    ————————————Attribute: ————————————
+        aktion (str): Aktion, z.B. "email".
+        event_id (int): ID des ausgelösten Events.
+        name (str): Name des Events.
+        zeitpunkt (Zeitpunkt): Fälligkeit, zu der das Event ausgelöst wurde.
+        versuch (int): Nummer des laufenden Versuchs, beginnend mit 1.
+    """
+    __slots__ = ("aktion", "event_id", "name", "zeitpunkt", "versuch")
+
+    def __init__(self, aktion:str, event_id:int, name:str, zeitpunkt:Zeitpunkt) -> None:
+        self.aktion = aktion
+        self.event_id = event_id
+        self.name = name
+        self.zeitpunkt = zeitpunkt
+        self.versuch = 1
+
+    def __repr__(self) -> str:
+        return f"Auftrag(aktion={self.aktion!r}, event_id={self.event_id}, name={self.name!r}, versuch={self.versuch})"
+
+
+class Dispatcher:
+    """Verteilt Aufträge an die registrierten Handler.
+    Ein Koordinator-Thread gibt wartende Aufträge an den Thread-Pool, solange die Obergrenze der Aktion nicht erreicht ist,
+    und legt fehlgeschlagene Aufträge nach Ablauf ihrer Wartezeit erneut vor.
+    ————————————Attribute: ————————————
+        max_warteschlange (int): Höchstzahl angenommener, noch nicht abgeschlossener Aufträge (inkl. Wiederholungen).
+        versuche (int): Höchstzahl der Versuche je Auftrag.
+        backoff (float): Wartezeit in Sekunden vor der ersten Wiederholung, verdoppelt sich je Versuch.
+        max_backoff (float): Obergrenze der Wartezeit in Sekunden.
+        __handler (dict[str, callable]): Handler je Aktion, erhält den Auftrag.
+        __grenzen (dict[str, int]): Höchstzahl gleichzeitig laufender Handler je Aktion.
+        __wartend (dict[str, deque[Auftrag]]): Angenommene Aufträge je Aktion.
+        __laufend (dict[str, int]): Gerade laufende Handler je Aktion.
+        __verzoegert (list[tuple]): Min-Heap der Wiederholungen als (Zeitpunkt monotonic, Nummer, Auftrag).
+        __offen (int): Angenommene, noch nicht abgeschlossene Aufträge.
+        __zaehler (dict[str, int]): Zähler für statistik().
+    ————————————Methoden: ————————————
+        registrieren(aktion: str, handler: callable, max_parallel: int) → None: Registriert den Handler einer Aktion.
+        ausloesen(ev: Event, warten: float) → bool: Nimmt einen Auftrag für ein ausgelöstes Event an.
+        warten_bis_leer(timeout: float | None) → bool: Wartet, bis alle Aufträge abgeschlossen sind.
+        statistik() → dict[str, int]: Zähler für ausgelöste, erledigte, wiederholte, fehlgeschlagene und abgewiesene Aufträge.
+        schliessen(warten: bool) → None: Nimmt keine Aufträge mehr an und beendet die Threads.
+    """
+
+    def __init__(
+            self,
+            arbeiter:int = 4,
+            max_warteschlange:int = 4096,
+            versuche:int = 3,
+            backoff:float = 0.5,
+            max_backoff:float = 30.0) -> None:
+        """Startet Koordinator und Thread-Pool.
+        :param arbeiter: Anzahl der Threads im Pool.
+        :param max_warteschlange: Höchstzahl offener Aufträge, darüber greift der Gegendruck.
+        :param versuche: Höchstzahl der Versuche je Auftrag.
+        :param backoff: Wartezeit in Sekunden vor der ersten Wiederholung.
+        :param max_backoff: Obergrenze der Wartezeit in Sekunden.
+        """
+        if arbeiter < 1 or max_warteschlange < 1 or versuche < 1:
+            raise ValueError("arbeiter, max_warteschlange und versuche müssen mindestens 1 sein.")
+        self.max_warteschlange = max_warteschlange
+        self.versuche = versuche
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.__handler: dict = {}
+        self.__grenzen: dict[str, int] = {}
+        self.__wartend: dict[str, deque] = {}
+        self.__laufend: dict[str, int] = {}
+        self.__verzoegert: list[tuple] = []
+        self.__nummer = 0  # Reihenfolge gleichzeitiger Wiederholungen im Heap
+        self.__offen = 0
+        self.__zaehler = {"ausgeloest": 0, "erledigt": 0, "wiederholt": 0, "fehlgeschlagen": 0, "abgewiesen": 0, "ohne_handler": 0}
+        self.__bedingung = Condition(Lock())
+        self.__geschlossen = False
+        self.__pool = ThreadPoolExecutor(max_workers=arbeiter, thread_name_prefix="aktion")
+        self.__koordinator = Thread(target=self.__koordinieren, name="aktionen-koordinator", daemon=True)
+        self.__koordinator.start()
+
+    def registrieren(self, aktion:str, handler, max_parallel:int = 1) -> None:
+        """Registriert den Handler einer Aktion, ein vorhandener Handler wird ersetzt.
+        Der Handler läuft im Thread-Pool und darf keine Kivy-Widgets ändern (dafür Clock.schedule_once verwenden).
+        Eine Exception im Handler gilt als Fehlschlag und führt zur Wiederholung.
+        :param aktion: Aktion, z.B. "email".
+        :param handler: Funktion, die einen Auftrag erhält.
+        :param max_parallel: Höchstzahl gleichzeitig laufender Handler dieser Aktion.
+        :raises TypeError: Wenn handler nicht aufrufbar ist.
+        :raises ValueError: Wenn max_parallel kleiner als 1 ist.
+        """
+        if not callable(handler):
+            raise TypeError("handler muss aufrufbar sein.")
+        if max_parallel < 1:
+            raise ValueError("max_parallel muss mindestens 1 sein.")
+        with self.__bedingung:
+            self.__handler[aktion] = handler
+            self.__grenzen[aktion] = max_parallel
+            self.__wartend.setdefault(aktion, deque())
+            self.__laufend.setdefault(aktion, 0)
+            self.__bedingung.notify_all()
+
+    def ausloesen(self, ev, warten:float = 0.0) -> bool:
+        """Nimmt einen Auftrag für ein ausgelöstes Event an. Kehrt sofort zurück, der Handler läuft im Thread-Pool.
+        Ist die Warteschlange voll, wird höchstens warten Sekunden auf Platz gewartet (Gegendruck).
+        Im Kivy-Thread sollte warten 0 bleiben, damit die Oberfläche nicht stockt.
+        :param ev: Ausgelöstes Event, die Aktion ist ev.akt.
+        :param warten: Höchstens so viele Sekunden auf Platz in der Warteschlange warten.
+        :return: True, wenn der Auftrag angenommen wurde, False wenn er abgewiesen wurde (voll, geschlossen, kein Handler).
+        """
+        auftrag = Auftrag(ev.akt, ev.id, ev.name, ev.zeitpunkt)
+        with self.__bedingung:
+            if self.__geschlossen:
+                self.__zaehler["abgewiesen"] += 1
+                return False
+            if auftrag.aktion not in self.__handler:
+                self.__zaehler["ohne_handler"] += 1
+                return False
+            if self.__offen >= self.max_warteschlange:
+                ende = monotonic() + warten
+                while self.__offen >= self.max_warteschlange and not self.__geschlossen:
+                    rest = ende - monotonic()
+                    if rest <= 0:
+                        self.__zaehler["abgewiesen"] += 1
+                        return False
+                    self.__bedingung.wait(rest)
+                if self.__geschlossen:
+                    self.__zaehler["abgewiesen"] += 1
+                    return False
+            self.__wartend[auftrag.aktion].append(auftrag)
+            self.__offen += 1
+            self.__zaehler["ausgeloest"] += 1
+            self.__bedingung.notify_all()
+        return True
+
+    def __koordinieren(self) -> None:
+        """Koordinator-Thread: legt fällige Wiederholungen vor und gibt Aufträge im Rahmen der Obergrenzen an den Pool."""
+        with self.__bedingung:
+            while not (self.__geschlossen and self.__offen == 0):
+                jetzt = monotonic()
+                while self.__verzoegert and self.__verzoegert[0][0] <= jetzt:
+                    auftrag = heapq.heappop(self.__verzoegert)[2]
+                    self.__wartend[auftrag.aktion].append(auftrag)
+                for aktion, wartend in self.__wartend.items():
+                    while wartend and self.__laufend[aktion] < self.__grenzen[aktion]:
+                        self.__laufend[aktion] += 1
+                        self.__pool.submit(self.__ausfuehren, self.__handler[aktion], wartend.popleft())
+                timeout = self.__verzoegert[0][0] - jetzt if self.__verzoegert else None
+                self.__bedingung.wait(timeout)
+
+    def __ausfuehren(self, handler, auftrag:Auftrag) -> None:
+        """Führt einen Handler im Pool aus und plant bei einem Fehler die Wiederholung."""
+        try:
+            handler(auftrag)
+            fehler = None
+        except Exception as e:
+            fehler = e
+        with self.__bedingung:
+            self.__laufend[auftrag.aktion] -= 1
+            if fehler is None:
+                self.__zaehler["erledigt"] += 1
+                self.__offen -= 1
+            elif auftrag.versuch < self.versuche and not self.__geschlossen:
+                wartezeit = min(self.backoff * 2 ** (auftrag.versuch - 1), self.max_backoff)
+                auftrag.versuch += 1
+                self.__nummer += 1
+                heapq.heappush(self.__verzoegert, (monotonic() + wartezeit, self.__nummer, auftrag))
+                self.__zaehler["wiederholt"] += 1
+            else:
+                self.__zaehler["fehlgeschlagen"] += 1
+                self.__offen -= 1
+                print(f"Aktion '{auftrag.aktion}' für Event-ID '{auftrag.event_id}' nach {auftrag.versuch} Versuchen fehlgeschlagen: {fehler}\n")
+            self.__bedingung.notify_all()
+
+    @property
+    def offen(self) -> int:
+        """Gibt die Anzahl der angenommenen, noch nicht abgeschlossenen Aufträge zurück."""
+        with self.__bedingung:
+            return self.__offen
+
+    def warten_bis_leer(self, timeout:float | None = None) -> bool:
+        """Wartet, bis alle angenommenen Aufträge erledigt oder endgültig fehlgeschlagen sind.
+        :param timeout: Höchstens so viele Sekunden warten, None für unbegrenzt.
+        :return: True, wenn keine Aufträge mehr offen sind.
+        """
+        with self.__bedingung:
+            return self.__bedingung.wait_for(lambda: self.__offen == 0, timeout)
+
+    def statistik(self) -> dict[str, int]:
+        """Gibt die Zähler zurück: ausgeloest, erledigt, wiederholt, fehlgeschlagen, abgewiesen, ohne_handler und offen."""
+        with self.__bedingung:
+            return {**self.__zaehler, "offen": self.__offen}
+
+    def schliessen(self, warten:bool = True) -> None:
+        """Nimmt keine neuen Aufträge mehr an und beendet Koordinator und Thread-Pool.
+        :param warten: Bei True werden offene Aufträge noch ausgeführt (ohne weitere Wiederholungen), sonst verworfen.
+        """
+        with self.__bedingung:
+            self.__geschlossen = True
+            for auftrag in (eintrag[2] for eintrag in self.__verzoegert):
+                if warten:
+                    self.__wartend[auftrag.aktion].append(auftrag)
+                else:
+                    self.__offen -= 1
+            self.__verzoegert = []
+            if not warten:
+                for wartend in self.__wartend.values():
+                    self.__offen -= len(wartend)
+                    wartend.clear()
+            self.__bedingung.notify_all()
+        self.__koordinator.join()
+        self.__pool.shutdown(wait=True)
+
+
+class LokalerVersand:
+    """Ersatz-Handler für E-Mail und SMS, der nichts versendet, sondern die Nachrichten lokal ablegt.
+    Mit einer Fehlerquote lassen sich Wiederholungen offline ausprobieren.
+    ————————————Attribute: ————————————
+        art (str): "email" oder "sms", steht in jeder abgelegten Nachricht.
+        pfad (str | None): Datei, an die jede Nachricht als Zeile angehängt wird, None nur im Speicher.
+        gesendet (list[str]): Abgelegte Nachrichten in Reihenfolge.
+        fehlerquote (float): Anteil der Aufrufe, die mit ConnectionError fehlschlagen (0 bis 1).
+    """
+
+    def __init__(self, art:str, pfad:str | None = None, fehlerquote:float = 0.0, seed:int | None = None) -> None:
+        """
+        :param art: "email" oder "sms".
+        :param pfad: Datei für den Postausgang, None nur im Speicher.
+        :param fehlerquote: Anteil simulierter Fehlschläge.
+        :param seed: Startwert für die simulierten Fehlschläge.
+        """
+        self.art = art
+        self.pfad = pfad
+        self.fehlerquote = fehlerquote
+        self.gesendet: list[str] = []
+        self.__zufall = Random(seed)
+        self.__lock = Lock()
+
+    def __call__(self, auftrag:Auftrag) -> None:
+        """Legt die Nachricht zu einem Auftrag ab.
+        :raises ConnectionError: Bei einem simulierten Fehlschlag.
+        """
+        with self.__lock:
+            if self.fehlerquote and self.__zufall.random() < self.fehlerquote:
+                raise ConnectionError(f"{self.art}: simulierter Versandfehler")
+            nachricht = f"{self.art}\t{auftrag.event_id}\t{auftrag.zeitpunkt}\t{auftrag.name}"
+            self.gesendet.append(nachricht)
+            if self.pfad is not None:
+                with open(self.pfad, 'a', encoding='utf-8') as f:
+                    f.write(nachricht + "\n")
+
+
+def ausgeben(auftrag:Auftrag) -> None:
+    """Einfacher Handler für Aktionen ohne eigenen Kanal (klingeln, alarm, anruf, test): gibt den Auftrag aus."""
+    print(f"Aktion '{auftrag.aktion}' für Event '{auftrag.name}' (ID {auftrag.event_id}) ausgeführt.\n")
+
+
+def standard_dispatcher(postausgang:str | None = None, **optionen) -> Dispatcher:
+    """Erstellt einen Dispatcher mit Handlern für alle Aktionen des Eventmanagers.
+    E-Mail und SMS gehen an lokale Ersatz-Handler, die übrigen Aktionen werden ausgegeben.
+    :param postausgang: Datei, an die E-Mails und SMS angehängt werden, None nur im Speicher.
+    :param optionen: Weitere Parameter von Dispatcher.
+    :return: Laufender Dispatcher.
+    """
+    dispatcher = Dispatcher(**optionen)
+    dispatcher.registrieren("email", LokalerVersand("email", postausgang), max_parallel=2)
+    dispatcher.registrieren("sms", LokalerVersand("sms", postausgang), max_parallel=2)
+    for aktion in ("klingeln", "anruf", "alarm", "test"):
+        dispatcher.registrieren(aktion, ausgeben)
+    return dispatcher
@@ -13,11 +13,12 @@ Datumzeit
 +maxTage(Monat:int):int
 +istSchaltjahr(Jahr:int):bool
 + systemzeit(): None
-+ wochentag(): str
++ wochentag: str (berechnet beim Lesen)
 
 """
 from logging import exception
-from time import strftime
+from time import strftime, localtime
+from scripts import m_kalendermathe as km
 
 class Datumzeit:
     def __init__(self, J:int=0, M:int=0, T:int=0, h:int=0, m:int=0, s:int=0):
@@ -31,7 +32,6 @@ class Datumzeit:
         self.minute = m
         self.sekunde = s
         self.__is_set = False if J + M + T + h + m + s == 0 else True
-        self.wochentag = self.__gen_wochentag() if self.__is_set else "None"
 
     def get_jahr(self):
         return self.__jahr if self.__chk_jahr(self.__jahr) else None
@@ -49,12 +49,8 @@ class Datumzeit:
     def get_monat(self):
         return self.__monat if self.__chk_monat(self.__monat) else 0
     def set_monat(self, M):
-        if M < 1:
-            M = 12
-        elif M > 12:
-            M = 1
-        self.__monat = M
-        self.__set_ein()
+        # kein stilles Umbrechen mehr, für Monatsarithmetik Zeitpunkt.plus_monate() verwenden
+        if self.__chk_monat(M): self.__monat = M; self.__set_ein()
     def __chk_monat(self,M)->bool:
         if type(M) != int:
             raise exception("Monat muss int sein")
@@ -119,18 +115,10 @@ class Datumzeit:
     def __str__(self)->str:
         return f"{self.jahr:4d}.{self.monat:02d}.{self.tag:02d} {self.stunde:02d}:{self.minute:02d}:{self.sekunde:02d}" if self.__is_set else "nicht gesetzt"
 
-    def __gen_wochentag(self)->str:
-        y = self.jahr
-        m = self.monat
-        t = self.tag
-        # Monat anpassen: Januar und Februar als Monate 13 und 14 des Vorjahres
-        if m < 3:
-            m += 12
-            y -= 1
-        # Zeller-Formel
-        h = (t + ((13 * (m + 1)) // 5) + y + (y // 4) - (y // 100) + (y // 400)) % 7
-        # Zuordnung des Wochentags
-        return ["Samstag", "Sonntag", "Montag", "Dienstag", "Mittwoch", "Donnerstag", "Freitag"][h]
+    @property
+    def wochentag(self)->str:
+        """Name des Wochentags, wird erst beim Lesen über m_kalendermathe berechnet, "None" wenn nicht gesetzt"""
+        return km.WOCHENTAG_NAMEN[km.wochentag(self.jahr, self.monat, self.tag)] if self.__is_set else "None"
 
     def __set_ein(self)->None:
         self.__is_set = True
@@ -146,15 +134,158 @@ class Datumzeit:
         self.sekunde = int(dz_list[5])
 
     def ist_schaltjahr(self,Jahr)->bool:
-        return Jahr % 4 == 0 and not Jahr % 100 == 0 or Jahr % 400 == 0
+        return km.ist_schaltjahr(Jahr)
 
     def max_tage(self, Monat, Jahr)->int:
-        tage = [0, 31, -1, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31][Monat]
-        if tage == -1:
-            tage = 28 + int(self.ist_schaltjahr(Jahr))
-        return tage
+        return km.monatslaenge(Jahr, Monat)
 
+    def setze_zeitpunkt(self, zp:"Zeitpunkt")->None:
+        """übernimmt Datum und Uhrzeit eines Zeitpunkts"""
+        self.jahr, self.monat, self.tag, self.stunde, self.minute, self.sekunde = zp.als_liste()
 
+    def zeitpunkt(self) -> "Zeitpunkt":
+        """wandelt die Datumzeit in einen kompakten Zeitpunkt um"""
+        return Zeitpunkt.aus_datum(self.jahr, self.monat, self.tag, self.stunde, self.minute, self.sekunde)
+
+
+class Zeitpunkt:
+    """Kompakter, unveränderlicher Zeitpunkt für Vergleiche und Sortierung.
+    Speichert nur eine Ganzzahl: Sekunden seit 0001-01-01 00:00:00 (proleptischer gregorianischer Kalender, Ortszeit).
+    Jahr, Monat, Tag usw. werden erst beim Lesen berechnet. Vergleiche und Hash sind reine Ganzzahl-Operationen.
+    Zuweisen ist gesperrt, damit geteilte Zeitpunkte (z.B. in Events, Regeln und Indizes) nicht nachträglich verändert werden.
+    ————————————Attribute: ————————————
+        sekunden (int): Sekunden seit 0001-01-01 00:00:00, nur lesbar.
+    ————————————Methoden: ————————————
+        aus_datum(J, M, T, h, m, s) → Zeitpunkt: Erzeugt einen geprüften Zeitpunkt aus Datum und Uhrzeit.
+        aus_datumzeit(dz: Datumzeit) → Zeitpunkt: Wandelt eine Datumzeit um.
+        jetzt() → Zeitpunkt: Aktuelle Systemzeit.
+        als_liste() → list[int]: [J, M, T, h, m, s]
+        als_datumzeit() → Datumzeit: Wandelt zurück in eine veränderbare Datumzeit.
+        plus_tage(n), plus_monate(n), plus_sekunden(n) → Zeitpunkt: Kalenderarithmetik in O(1), siehe m_kalendermathe.
+        differenz(other: Zeitpunkt) → int: Abstand in Sekunden.
+    """
+    __slots__ = ("sekunden",)
+
+    def __init__(self, sekunden:int):
+        _sekunden_setzen(self, sekunden)  # direkt über den Slot, __setattr__ ist gesperrt
+
+    def __setattr__(self, name:str, wert) -> None:
+        raise AttributeError("Zeitpunkt ist unveränderlich, z.B. plus_sekunden() gibt einen neuen Zeitpunkt zurück.")
+
+    def __delattr__(self, name:str) -> None:
+        raise AttributeError("Zeitpunkt ist unveränderlich.")
+
+    def __reduce__(self):
+        """Für copy und pickle, die sonst über das gesperrte __setattr__ gingen."""
+        return Zeitpunkt, (self.sekunden,)
+
+    @classmethod
+    def aus_datum(cls, J:int, M:int, T:int, h:int=0, m:int=0, s:int=0) -> "Zeitpunkt":
+        """erzeugt einen Zeitpunkt aus Datum und Uhrzeit
+        :raises ValueError: bei ungültigem Datum oder ungültiger Uhrzeit"""
+        if not (0 <= h <= 23 and 0 <= m <= 59 and 0 <= s <= 59):
+            raise ValueError(f"Uhrzeit {h}:{m}:{s} außerhalb des Geltungsbereichs")
+        return cls((km.ordinal(J, M, T) - 1) * km.SEKUNDEN_PRO_TAG + h * 3600 + m * 60 + s)
+
+    @classmethod
+    def aus_datumzeit(cls, dz:Datumzeit) -> "Zeitpunkt":
+        """wandelt eine Datumzeit in einen Zeitpunkt um"""
+        return cls.aus_datum(dz.jahr, dz.monat, dz.tag, dz.stunde, dz.minute, dz.sekunde)
+
+    @classmethod
+    def jetzt(cls, zeitstempel:float | None = None) -> "Zeitpunkt":
+        """gibt die jetzige Systemzeit (oder einen Unix-Zeitstempel) als Zeitpunkt in Ortszeit zurück"""
+        t = localtime(zeitstempel)
+        return cls.aus_datum(t.tm_year, t.tm_mon, t.tm_mday, t.tm_hour, t.tm_min, min(t.tm_sec, 59))
+
+    def __datum(self) -> tuple[int, int, int]:
+        return km.aus_ordinal(self.sekunden // km.SEKUNDEN_PRO_TAG + 1)
+
+    @property
+    def jahr(self) -> int:
+        return self.__datum()[0]
+    @property
+    def monat(self) -> int:
+        return self.__datum()[1]
+    @property
+    def tag(self) -> int:
+        return self.__datum()[2]
+    @property
+    def stunde(self) -> int:
+        return self.sekunden % 86400 // 3600
+    @property
+    def minute(self) -> int:
+        return self.sekunden % 3600 // 60
+    @property
+    def sekunde(self) -> int:
+        return self.sekunden % 60
+
+    def als_liste(self) -> list[int]:
+        """gibt [J, M, T, h, m, s] zurück, das Datum wird dabei nur einmal berechnet"""
+        J, M, T = self.__datum()
+        rest = self.sekunden % km.SEKUNDEN_PRO_TAG
+        return [J, M, T, rest // 3600, rest % 3600 // 60, rest % 60]
+
+    def als_datumzeit(self) -> Datumzeit:
+        """wandelt den Zeitpunkt in eine veränderbare Datumzeit um"""
+        return Datumzeit(*self.als_liste())
+
+    def plus_tage(self, anzahl:int) -> "Zeitpunkt":
+        """gibt den um anzahl Tage verschobenen Zeitpunkt zurück, O(1)"""
+        return Zeitpunkt(km.plus_tage(self.sekunden, anzahl))
+
+    def plus_monate(self, anzahl:int) -> "Zeitpunkt":
+        """gibt den um anzahl Monate verschobenen Zeitpunkt zurück, der Tag wird auf das Monatsende begrenzt, O(1)"""
+        return Zeitpunkt(km.plus_monate(self.sekunden, anzahl))
+
+    def plus_sekunden(self, anzahl:int) -> "Zeitpunkt":
+        """gibt den um anzahl Sekunden verschobenen Zeitpunkt zurück, O(1)"""
+        return Zeitpunkt(km.plus_sekunden(self.sekunden, anzahl))
+
+    def differenz(self, other:"Zeitpunkt") -> int:
+        """gibt den Abstand self - other in Sekunden zurück"""
+        return km.differenz(self.sekunden, other.sekunden)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Zeitpunkt):
+            return NotImplemented
+        return self.sekunden == other.sekunden
+
+    def __hash__(self) -> int:
+        return hash(self.sekunden)
+
+    def __lt__(self, other) -> bool:
+        if not isinstance(other, Zeitpunkt):
+            return NotImplemented
+        return self.sekunden < other.sekunden
+
+    def __le__(self, other) -> bool:
+        if not isinstance(other, Zeitpunkt):
+            return NotImplemented
+        return self.sekunden <= other.sekunden
+
+    def __gt__(self, other) -> bool:
+        if not isinstance(other, Zeitpunkt):
+            return NotImplemented
+        return self.sekunden > other.sekunden
+
+    def __ge__(self, other) -> bool:
+        if not isinstance(other, Zeitpunkt):
+            return NotImplemented
+        return self.sekunden >= other.sekunden
+
+    def __int__(self) -> int:
+        return self.sekunden
+
+    def __repr__(self) -> str:
+        return f"Zeitpunkt.aus_datum({', '.join(str(wert) for wert in self.als_liste())})"
+
+    def __str__(self) -> str:
+        J, M, T, h, m, s = self.als_liste()
+        return f"{J:4d}.{M:02d}.{T:02d} {h:02d}:{m:02d}:{s:02d}"
+
+
+_sekunden_setzen = Zeitpunkt.sekunden.__set__  # Slot-Deskriptor, einziger Schreibzugriff auf sekunden
 
 
 if __name__ == '__main__':
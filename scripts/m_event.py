@@ -1,39 +1,62 @@
-from scripts.m_datumzeit import Datumzeit
+from scripts.m_datumzeit import Datumzeit, Zeitpunkt
+from scripts.m_wiederholung import Regel
 
 class Event:
     """Repräsentiert ein Event mit Zeit, Aktion, Name und Dauer.
     MUSS über die Eventmanager-Klasse durch event_erstellen() instanziiert werden.
     Events, die nicht über den Eventmanager erstellt wurden, werden nicht gespeichert und können nicht verwaltet werden.
+    Die Zeit wird intern als kompakter Zeitpunkt gespeichert, Vergleiche sind dadurch reine Ganzzahl-Vergleiche.
     ————————————Attribute: ————————————
-        event_zeit (Datumzeit): Zeitstempel des Events
+        event_zeit (Datumzeit | Zeitpunkt): Zeitstempel des Events
         event_liste (list[Event]): Liste, in der die Events zwischengespeichert werden, verwaltet durch den Eventmanager.
         event_akt (str): Aktion, die beim Triggern des Events ausgelöst werden soll.
         event_name (str): Name des Events zur darstellung in der UI. Soll vom User verändert werden können.
         taeglich (bool): Ob das Event bei Ablauf auf den nächsten Tag verschoben werden soll.
         monatlich (bool): Ob das Event bei Ablauf auf den nächsten Monat verschoben werden soll.
         jaehrlich (bool): Ob das Event bei Ablauf auf das nächste Jahr verschoben werden soll.
+        regel (Regel | None): Wiederholungsregel, hat Vorrang vor den Flags. Die Flags erzeugen eine einfache Regel ab der Event-Zeit.
+        event_id (int | None): Feste ID, z.B. beim Laden. Ohne Angabe wird die nächste freie ID vergeben.
     ————————————Methoden: ————————————
-        abgelaufen(zeitpunkt: Datumzeit) → bool: Prüft, ob das Event abgelaufen ist.
+        abgelaufen(zeitpunkt: Datumzeit | Zeitpunkt) → bool: Prüft, ob das Event abgelaufen ist.
+        vorkommen(von: Zeitpunkt, bis: Zeitpunkt) → Iterator[Zeitpunkt]: Vorkommen des Events in [von, bis[.
     """
+    __slots__ = ("__liste", "__zeitpunkt", "__akt", "__name", "__regel", "__id")
+
     def __init__(
             self,
-            event_zeit :Datumzeit,
+            event_zeit :Datumzeit | Zeitpunkt,
             event_liste :list,
             event_akt :str = "",
             event_name :str = "",
             taeglich :bool = False,
             monatlich :bool = False,
-            jaehrlich :bool = False):
+            jaehrlich :bool = False,
+            event_id :int | None = None,
+            regel :Regel | None = None):
         self.__liste = event_liste
-        self.__zeit = event_zeit
+        self.__zeitpunkt = self.__als_zeitpunkt(event_zeit)
         self.__akt = event_akt
         self.__name = event_name
-        self.__taeglich = taeglich
-        self.__monatlich = monatlich
-        self.__jaehrlich = jaehrlich
-        if not self.__liste: self.__id = 1
+        if regel is not None and not isinstance(regel, Regel):
+            raise TypeError("regel muss ein Regel-Objekt sein.")
+        self.__regel = regel
+        if regel is None:
+            frequenz = "jaehrlich" if jaehrlich else "monatlich" if monatlich else "taeglich" if taeglich else None
+            if frequenz is not None:
+                self.__regel = Regel(frequenz, self.__zeitpunkt)
+        if event_id is not None: self.__id = event_id  # z.B. beim Laden gespeicherter Events
+        elif not self.__liste: self.__id = 1
         else: self.__id = max(event.id for event in self.__liste) + 1
 
+    @staticmethod
+    def __als_zeitpunkt(zeit) -> Zeitpunkt:
+        """Wandelt eine Datumzeit in einen Zeitpunkt um, Zeitpunkte werden unverändert übernommen."""
+        if isinstance(zeit, Zeitpunkt):
+            return zeit
+        if isinstance(zeit, Datumzeit):
+            return zeit.zeitpunkt()
+        raise TypeError("Event-Zeit muss ein Datumzeit- oder Zeitpunkt-Objekt sein.")
+
     @property
     def liste(self) -> list:
         """Gibt die Liste der Events zurück.
@@ -54,20 +77,21 @@ class Event:
 
     @property
     def zeit(self) -> list[int]:
-        """Gibt die Zeit des Events als Liste zum Vergleichen zurück.
+        """Gibt die Zeit des Events als Liste zurück. Zum Vergleichen besser zeitpunkt verwenden.
         :return: Liste mit Jahr, Monat, Tag, Stunde, Minute und Sekunde des Events."""
-        return [self.__zeit.jahr,
-                self.__zeit.monat,
-                self.__zeit.tag,
-                self.__zeit.stunde,
-                self.__zeit.minute,
-                self.__zeit.sekunde]
+        return self.__zeitpunkt.als_liste()
     @zeit.setter
-    def zeit(self, neue_event_zeit :Datumzeit):
-        if not isinstance(neue_event_zeit, Datumzeit):
-            raise TypeError("neue_event_zeit muss ein Datumzeit-Objekt sein.")
+    def zeit(self, neue_event_zeit :Datumzeit | Zeitpunkt):
+        if not isinstance(neue_event_zeit, (Datumzeit, Zeitpunkt)):
+            raise TypeError("neue_event_zeit muss ein Datumzeit- oder Zeitpunkt-Objekt sein.")
         else:
-            self.__zeit = neue_event_zeit
+            self.__zeitpunkt = self.__als_zeitpunkt(neue_event_zeit)
+
+    @property
+    def zeitpunkt(self) -> Zeitpunkt:
+        """Gibt die Zeit des Events als kompakten Zeitpunkt zurück.
+        :return: Zeitpunkt des Events."""
+        return self.__zeitpunkt
 
     @property
     def akt(self) -> str:
@@ -93,38 +117,59 @@ class Event:
         else:
             self.__name = neuer_name
 
+    @property
+    def regel(self) -> Regel | None:
+        """Gibt die Wiederholungsregel des Events zurück.
+        :return: Regel oder None für einmalige Events."""
+        return self.__regel
+    @regel.setter
+    def regel(self, neue_regel:Regel | None):
+        if neue_regel is not None and not isinstance(neue_regel, Regel):
+            raise TypeError("neue_regel muss ein Regel-Objekt oder None sein.")
+        else:
+            self.__regel = neue_regel
+
+    def __frequenz_ist(self, frequenz:str) -> bool:
+        """Prüft, ob das Event eine einfache Regel der angegebenen Frequenz hat (Intervall 1, ohne Ende)."""
+        regel = self.__regel
+        return (regel is not None and regel.frequenz == frequenz and regel.intervall == 1
+                and regel.anzahl is None and regel.bis is None)
+
+    def __frequenz_setzen(self, frequenz:str, aktiv:bool) -> None:
+        """Setzt bzw. entfernt eine einfache Regel der angegebenen Frequenz ab der Event-Zeit."""
+        if not isinstance(aktiv, bool):
+            raise TypeError(f"ist_{frequenz} muss ein boolean sein.")
+        if aktiv:
+            self.__regel = Regel(frequenz, self.__zeitpunkt)
+        elif self.__regel is not None and self.__regel.frequenz == frequenz:
+            self.__regel = None
+
     @property
     def taeglich(self) -> bool:
         """Gibt zurück, ob das Event täglich wiederholt werden soll.
         :return: True, wenn das Event täglich wiederholt werden soll, sonst False."""
-        return self.__taeglich
+        return self.__frequenz_ist("taeglich")
     @taeglich.setter
     def taeglich(self, ist_taeglich:bool):
-        if not isinstance(ist_taeglich, bool):
-            raise TypeError("ist_taeglich muss ein boolean sein.")
-        else:
-            self.__taeglich = ist_taeglich
+        self.__frequenz_setzen("taeglich", ist_taeglich)
 
     @property
     def monatlich(self) -> bool:
         """Gibt zurück, ob das Event monatlich wiederholt werden soll.
         :return: True, wenn das Event monatlich wiederholt werden soll, sonst False."""
-        return self.__monatlich
+        return self.__frequenz_ist("monatlich")
     @monatlich.setter
     def monatlich(self, ist_monatlich:bool):
-        self.__monatlich = ist_monatlich
+        self.__frequenz_setzen("monatlich", ist_monatlich)
 
     @property
     def jaehrlich(self) -> bool:
         """Gibt zurück, ob das Event jährlich wiederholt werden soll.
         :return: True, wenn das Event jährlich wiederholt werden soll, sonst False."""
-        return self.__jaehrlich
+        return self.__frequenz_ist("jaehrlich")
     @jaehrlich.setter
     def jaehrlich(self, ist_jaehrlich:bool):
-        if not isinstance(ist_jaehrlich, bool):
-            raise TypeError("ist_jaehrlich muss ein boolean sein.")
-        else:
-            self.__jaehrlich = ist_jaehrlich
+        self.__frequenz_setzen("jaehrlich", ist_jaehrlich)
 
 
     def __lt__(self, other) -> bool:
@@ -133,59 +178,61 @@ class Event:
         :return: False, wenn das erste Objekt noch nicht abgelaufen ist
         """
         if not isinstance(other, Event):
+            if isinstance(other, Zeitpunkt):
+                return self.__zeitpunkt.sekunden < other.sekunden
             if isinstance(other, Datumzeit):
-                return self.zeit < [other.jahr,other.monat,other.tag,other.stunde,other.minute,other.sekunde]
+                return self.__zeitpunkt.sekunden < other.zeitpunkt().sekunden
             return NotImplemented
-        return self.zeit < other.zeit
+        return self.__zeitpunkt.sekunden < other.zeitpunkt.sekunden
 
     def __repr__(self) -> str:
         """Gibt eine ausführliche Darstellung des Events zurück.
         :return: String mit den Attributen des Events in lesbarer Form.
         """
-        return (f"Event(event_zeit=Datumzeit({self.__zeit.jahr}, {self.__zeit.monat}, {self.__zeit.tag}, "
-                f"{self.__zeit.stunde}, {self.__zeit.minute}, {self.__zeit.sekunde}), "
+        J, M, T, h, m, s = self.__zeitpunkt.als_liste()
+        return (f"Event(event_zeit=Datumzeit({J}, {M}, {T}, {h}, {m}, {s}), "
                 f"event_akt={self.__akt}, "
                 f"event_name={self.__name}, "
-                f"taeglich={self.__taeglich}, "
-                f"monatlich={self.__monatlich}, "
-                f"jaehrlich={self.__jaehrlich})")
+                f"regel={self.__regel!r})")
 
     def __str__(self) -> str:
         """Gibt eine lesbare Darstellung des Events zurück.
         :return: String mit den Details des Events."""
+        J, M, T, h, m, s = self.__zeitpunkt.als_liste()
         return (f"EventNr: {self.__id}\n"
-                f"Zeit: {self.__zeit.jahr}-{self.__zeit.monat:02d}-{self.__zeit.tag:02d} "
-                f"{self.__zeit.stunde:02d}:{self.__zeit.minute:02d}:{self.__zeit.sekunde:02d} Uhr\n"
+                f"Zeit: {J}-{M:02d}-{T:02d} {h:02d}:{m:02d}:{s:02d} Uhr\n"
                 f"Aktion: {self.__akt}\n"
                 f"Name: {self.__name}\n"
-                f"Täglich: {self.__taeglich}\n"
-                f"Monatlich: {self.__monatlich}\n"
-                f"Jährlich: {self.__jaehrlich}\n")
+                f"Täglich: {self.taeglich}\n"
+                f"Monatlich: {self.monatlich}\n"
+                f"Jährlich: {self.jaehrlich}\n"
+                f"Regel: {self.__regel}\n")
 
 
-    def abgelaufen(self, zeitpunkt:Datumzeit) -> bool:
+    def abgelaufen(self, zeitpunkt:Datumzeit | Zeitpunkt) -> bool:
         """Prüft, ob das Event abgelaufen ist.
         :param zeitpunkt: Zeitpunkt, zu dem geprüft werden soll, ob das Event abgelaufen ist.
         :return: True, wenn das Event abgelaufen ist, sonst False."""
-        if not isinstance(zeitpunkt, Datumzeit):
-            raise TypeError("zeitpunkt muss ein Datumzeit-Objekt sein.")
-        event_zeit = [
-            self.__zeit.jahr,
-            self.__zeit.monat,
-            self.__zeit.tag,
-            self.__zeit.stunde,
-            self.__zeit.minute,
-            self.__zeit.sekunde
-        ]
-        zeit_stempel = [
-            zeitpunkt.jahr,
-            zeitpunkt.monat,
-            zeitpunkt.tag,
-            zeitpunkt.stunde,
-            zeitpunkt.minute,
-            zeitpunkt.sekunde
-        ]
-        return event_zeit <= zeit_stempel
+        if isinstance(zeitpunkt, Datumzeit):
+            zeitpunkt = zeitpunkt.zeitpunkt()
+        elif not isinstance(zeitpunkt, Zeitpunkt):
+            raise TypeError("zeitpunkt muss ein Datumzeit- oder Zeitpunkt-Objekt sein.")
+        return self.__zeitpunkt.sekunden <= zeitpunkt.sekunden
+
+    def vorkommen(self, von:Zeitpunkt, bis:Zeitpunkt):
+        """Liefert die Vorkommen des Events im Bereich [von, bis[, Wiederholungen werden erst beim Iterieren erzeugt.
+        Das erste Vorkommen ist die aktuelle Fälligkeit, auch wenn das Event abweichend von der Regel verschoben wurde.
+        Frühere Vorkommen der Regel gelten als erledigt.
+        :param von: Beginn des Bereichs.
+        :param bis: Ende des Bereichs (exklusiv).
+        :return: Generator über Zeitpunkte in aufsteigender Reihenfolge."""
+        if self.__zeitpunkt.sekunden >= bis.sekunden:
+            return
+        if von.sekunden <= self.__zeitpunkt.sekunden:
+            yield self.__zeitpunkt
+            von = self.__zeitpunkt.plus_sekunden(1)
+        if self.__regel is not None:
+            yield from self.__regel.vorkommen(von, bis)
 
 
 
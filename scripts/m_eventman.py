@@ -1,7 +1,20 @@
-from scripts.m_datumzeit import Datumzeit
+from scripts.m_datumzeit import Datumzeit, Zeitpunkt
 from scripts.m_event import Event
-from csv import writer, reader
-import ast
+from scripts.m_wiederholung import Regel
+from scripts.m_speicher import Speicher, CsvSpeicher, NachlaufSpeicher, regel_parsen
+from scripts.m_snapshot import Snapshot, EventListe
+from scripts import m_snapshot as snapshot
+from scripts.m_aktionen import Dispatcher
+from scripts import m_kalendermathe as km
+from scripts import m_messung as messung
+from contextlib import contextmanager
+from time import time
+import heapq
+from itertools import repeat
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # numpy nur laden, wenn der Spaltenspeicher gebraucht wird
+    from scripts.m_spalten import Spaltenspeicher
 
 
 class Eventman:
@@ -9,28 +22,98 @@ class Eventman:
     Diese Klasse ermöglicht das Erstellen, Aufrufen und Entfernen von Events.
     Die Events werden in einer CSV-Datei gespeichert und können über eine Event-ID verwaltet werden.
     Löst automatisch abgelaufene Events aus, wenn die Klasse instanziiert wird.
+    Hat das Speicher-Backend einen Snapshot-Pfad, wird beim Schließen ein binärer Snapshot geschrieben und beim nächsten Start
+    bevorzugt geladen, solange die Quelldateien unverändert sind. Die Events werden dann erst beim Zugriff erzeugt.
     Events müssen mit der event_erstellen() Methode der Event-Manager-Klasse erstellt werden, um sie in der Eventliste wiederzufinden.
+    Benutzen mehrere Prozesse dieselben Dateien, vergibt das Backend die Event-IDs und aktualisieren() übernimmt die Änderungen der anderen.
     ————————————Attribute: ————————————
         __zeit (Datumzeit): Aktuelle Systemzeit.
-        __event_liste (list[Event]): Format von Event-Objekten kann in der Event-Klasse nachgelesen werden.
+        __event_liste (list[Event] | EventListe): Format von Event-Objekten kann in der Event-Klasse nachgelesen werden. Nach dem Laden eines Snapshots eine EventListe.
+            Ohne feste Reihenfolge: Beim Entfernen rückt das letzte Event an die frei gewordene Position.
+        __index (dict[int, int]): ID-Index, Event-ID → Position in __event_liste. Ermöglicht Aufrufen und Entfernen in O(1).
+        __ladefehler (list[str]): Beim Laden übersprungene fehlerhafte Datensätze.
+        __naechste_id (int): Monoton steigender ID-Zähler. Die Hochwassermarke wird mit dem Speicher-Backend gespeichert.
+        __reserviert_bis (int): Ende (exklusiv) der beim Backend reservierten IDs, ab hier wird neu reserviert.
         __event_aktionen (list[str]): Liste der verfügbaren Event-Aktionen.
+        __planer (list[tuple]): Min-Heap der Fälligkeiten als (Zeitpunkt in Sekunden, Event-ID)-Einträge.
+        __geplant (dict[int, tuple]): Aktueller Heap-Eintrag je Event-ID. Veraltete Einträge im Heap werden beim Herausnehmen übersprungen.
+        __planer_callback (callable | None): Wird mit der Verzögerung in Sekunden bis zur nächsten Fälligkeit aufgerufen (z.B. Clock.schedule_once in der App).
+        __batch_tiefe (int): Verschachtelungstiefe offener batch()-Blöcke, 0 außerhalb einer Transaktion.
+        __batch_aenderungen (list[tuple]): In der laufenden Transaktion gesammelte, noch nicht gespeicherte Änderungen.
+        __batch_rueckgaengig (list[callable]): Rückgängig-Schritte der laufenden Transaktion, für den Rollback.
+        __speicher (Speicher): Speicher-Backend (CSV mit oder ohne Journal, SQLite, ...).
+        __beobachter (list[callable]): Werden nach jeder gespeicherten Änderung mit der Liste der Änderungen aufgerufen (z.B. Zeitindex des Kalenders).
+        __snapshot (Snapshot | None): Eingeblendeter binärer Snapshot, aus dem die Event-Liste geladen wurde.
+        __spalten (Spaltenspeicher | None): Optionaler spaltenorientierter Speicher (numpy) für vektorisierte Auswertungen.
+        __dispatcher (Dispatcher | None): Führt die Aktionen ausgelöster Events im Hintergrund aus (m_aktionen).
     ————————————Methoden: ————————————
         event_erstellen(event_zeit: Datumzeit, event_liste: list[Event], event_akt: str, event_name: str) → None: Fügt ein Event der Liste hinzu und speichert es in der CSV-Datei.
+        event_erstellen_viele(angaben: Iterable) → list[int]: Erstellt viele Events mit einem einzigen Speichervorgang.
+        batch() → ContextManager: Transaktion, Änderungen werden erst am Ende einmal gespeichert, bei Fehlern zurückgerollt.
         event_aufrufen(event_id: int) → Event: Ruft ein Event anhand der Event-ID auf und gibt es zurück.
         event_entfernen(event_id: int) → None: Entfernt ein Event anhand der Event-ID aus der Eventliste und CSV-Datei.
+        event_verschieben(event_id: int, neue_zeit: Datumzeit) → None: Verschiebt ein Event auf eine neue Zeit und plant es neu ein.
+        naechste_faelligkeit() → float | None: Sekunden bis zum nächsten fälligen Event.
+        events_im_bereich(start: Datumzeit, ende: Datumzeit) → list[Event]: Events mit Fälligkeit in [start, ende[.
+        events_im_monat(jahr: int, monat: int) → list[Event]: Events eines Monats.
+        vorkommen_im_bereich(start: Datumzeit, ende: Datumzeit) → Iterator[tuple[Zeitpunkt, Event]]: Alle Vorkommen inkl. Wiederholungen in [start, ende[.
+        naechstes_event() → Event | None: Event mit der frühesten Fälligkeit.
+        beobachter_anmelden(callback: callable) → None: Meldet eine Funktion an, die über gespeicherte Änderungen informiert wird.
+        beobachter_abmelden(callback: callable) → None: Meldet eine Funktion wieder ab.
+        aktualisieren() → int: Übernimmt Änderungen, die andere Prozesse gespeichert haben.
+        sichern() → None: Schreibt bei verzögertem Schreiben alle ausstehenden Änderungen sofort.
+        schliessen() → None: Schließt das Speicher-Backend und schreibt den Snapshot, z.B. beim Beenden der App.
         trigger_event(entfernen=True) → list[str] | None: Überprüft, ob Events abgelaufen sind und löst sie aus. Gibt die Aktionen der ausgelösten Events zurück.
     """
     EVENTS_CSV = '../events.csv'  #Pfad zur CSV-Datei, in der die Events gespeichert werden
+    EVENTS_JOURNAL = '../events.journal'  # Pfad zum Journal im Journal-Modus
+    MAX_SCHLAFZEIT = 3600  # Sekunden, nach denen der Planer spätestens erneut geweckt wird (Schutz gegen Änderungen der Systemzeit)
+    ID_BLOCK = 64  # Anzahl der IDs, die innerhalb von batch() auf einmal beim Backend reserviert werden
 
-    def __init__(self) -> None:
+    def __init__(
+            self,
+            journal_modus:bool = False,
+            speicher:Speicher | None = None,
+            spalten:bool = False,
+            dispatcher:Dispatcher | None = None,
+            nachlauf:float | None = None) -> None:
         """Initialisiert die Eventman-Klasse und lädt die Events aus der CSV-Datei.
         Setzt die aktuelle Systemzeit und initialisiert die Event-Liste und verfügbaren Event-Aktionen.
+        :param journal_modus: Bei True werden Änderungen an ein Journal angehängt, statt die CSV-Datei jedes Mal neu zu schreiben.
+        :param speicher: Eigenes Speicher-Backend (z.B. SqliteSpeicher). Ohne Angabe wird die CSV-Datei verwendet.
+        :param spalten: Bei True wird zusätzlich ein Spaltenspeicher für vektorisierte Auswertungen geführt (benötigt numpy).
+        :param dispatcher: Erhält jedes ausgelöste Event, auch die beim Laden bereits abgelaufenen. Ohne Angabe werden nur die Aktionen zurückgegeben.
+        :param nachlauf: Ruhezeit in Sekunden für verzögertes Schreiben in einem Hintergrund-Thread (NachlaufSpeicher). None schreibt sofort.
         """
         self.__zeit:Datumzeit = Datumzeit()  # Aktuelle Systemzeit
         self.__zeit.jetzt()
         self.__event_liste: list[Event] = []
+        self.__index: dict[int, int] = {}
+        self.__naechste_id: int = 1
+        self.__reserviert_bis: int = 0
+        self.__ladefehler: list[str] = []
         self.__event_aktionen: list[str] = ["klingeln", "email", "sms", "anruf", "alarm", "test"]
+        self.__planer: list[tuple] = []
+        self.__geplant: dict[int, tuple] = {}
+        self.__planer_callback = None
+        self.__massenladen: bool = False  # True während __events_laden(), der Heap wird danach aufgebaut
+        self.__batch_tiefe: int = 0
+        self.__batch_aenderungen: list[tuple] = []
+        self.__batch_rueckgaengig: list = []
+        self.__beobachter: list = []
+        self.__snapshot: Snapshot | None = None
+        self.__spalten: "Spaltenspeicher | None" = None
+        self.__dispatcher: Dispatcher | None = dispatcher
+        if speicher is None:
+            speicher = CsvSpeicher(self.EVENTS_CSV, self.EVENTS_JOURNAL if journal_modus else None)
+        if nachlauf is not None:
+            speicher = NachlaufSpeicher(speicher, nachlauf)
+        self.__speicher: Speicher = speicher
         self.__events_laden()  # Lädt die Events aus der CSV-Datei
+        if spalten:
+            from scripts.m_spalten import Spaltenspeicher
+            self.__spalten = Spaltenspeicher(self.__event_liste)
+            self.beobachter_anmelden(self.__spalten.aenderungen_anwenden)
         self.event_trigger() # Überprüft, ob die Events bereits ausgelöst werden sollten
 
     @property
@@ -42,7 +125,8 @@ class Eventman:
 
     @property
     def event_liste(self) -> list[Event]:
-        """Gibt die Event-Liste zurück.
+        """Gibt die Event-Liste zurück. Die Reihenfolge ist nicht festgelegt, sie ändert sich beim Entfernen von Events.
+        Für eine Reihenfolge nach Zeit oder ID selbst sortieren oder z.B. den Zeitindex des Kalenders benutzen.
         :return: Liste der Events als Event-Objekte.
         """
         return self.__event_liste
@@ -54,6 +138,33 @@ class Eventman:
         """
         return self.__event_aktionen if self.__event_aktionen else []
 
+    @property
+    def spalten(self) -> "Spaltenspeicher | None":
+        """Gibt den Spaltenspeicher für vektorisierte Auswertungen zurück.
+        :return: Spaltenspeicher, oder None wenn der Eventmanager ohne spalten=True erstellt wurde.
+        """
+        return self.__spalten
+
+    @property
+    def ladefehler(self) -> list[str]:
+        """Gibt die beim Laden übersprungenen fehlerhaften Datensätze zurück.
+        :return: Liste mit einer Fehlerbeschreibung je Datensatz.
+        """
+        return self.__ladefehler
+
+    @property
+    def planer_callback(self):
+        """Gibt die Funktion zurück, mit der das nächste Wecken des Planers angefordert wird.
+        :return: Callable, das die Verzögerung in Sekunden (oder None) erhält, sonst None.
+        """
+        return self.__planer_callback
+    @planer_callback.setter
+    def planer_callback(self, callback) -> None:
+        if callback is not None and not callable(callback):
+            raise TypeError("planer_callback muss aufrufbar sein.")
+        self.__planer_callback = callback
+        self.__neu_planen()
+
     def __iter__(self) -> iter:
         """Ermöglicht die Iteration über die Event-Liste."""
         yield from self.__event_liste
@@ -64,116 +175,383 @@ class Eventman:
         """
         return len(self.__event_liste)
 
+    @messung.gemessen("eventman.events_laden")
     def __events_laden(self) -> None:
-        """Lädt die Events aus der CSV-Datei in die Event-Liste.
-        Erstellt die Datei, falls sie nicht existiert.
-        :raises exception: Bei Fehlern beim Laden der Events aus der CSV-Datei.
+        """Lädt die Events in einem Durchlauf aus dem Speicher-Backend in die Event-Liste.
+        Dabei wird nichts gespeichert. Fehlerhafte Datensätze werden übersprungen und gesammelt gemeldet.
+        Ein aktueller binärer Snapshot wird bevorzugt, dann werden nur ID-Index und Planer aufgebaut.
         """
+        self.__ladefehler = []
+        if self.__snapshot_laden():
+            return
+        self.__massenladen = True
+        for event_id, zeitstempel, aktion, name, taeglich, monatlich, jaehrlich, regel in self.__speicher.laden():
+            try:
+                if event_id in self.__index:
+                    raise ValueError("doppelte Event-ID")
+                zeit_objekt = Zeitpunkt.aus_datum(*zeitstempel)
+                self.__event_anlegen(
+                    event_zeit=zeit_objekt,
+                    event_akt=aktion,
+                    event_name=name,
+                    taeglich=taeglich,
+                    monatlich=monatlich,
+                    jaehrlich=jaehrlich,
+                    event_id=event_id,
+                    regel=regel)
+            except Exception as e:
+                self.__ladefehler.append(f"Event-ID {event_id}: {str(e).strip()}")
+        self.__massenladen = False
+        heapq.heapify(self.__planer)
+        self.__ladefehler = self.__speicher.ladefehler + self.__ladefehler
+        self.__naechste_id = max(self.__naechste_id, self.__speicher.naechste_id)
+        if self.__ladefehler:
+            print(f"{len(self.__ladefehler)} fehlerhafte Events wurden beim Laden übersprungen:\n" + "\n".join(self.__ladefehler) + "\n")
+
+    def __snapshot_laden(self) -> bool:
+        """Blendet den binären Snapshot ein, wenn das Backend einen hat und er den Stand der Quelldateien wiedergibt.
+        ID-Index und Planer werden direkt aus den Spalten aufgebaut, Event-Objekte entstehen erst beim Zugriff.
+        Ein fehlender, veralteter oder beschädigter Snapshot wird ignoriert, dann wird normal geladen.
+        :return: True, wenn aus dem Snapshot geladen wurde.
+        """
+        pfad = self.__speicher.snapshot_pfad
+        if pfad is None:
+            return False
         try:
-            with open(self.EVENTS_CSV, 'r', encoding='utf-8') as f:
-                csv_reader = reader(f)
-                next(csv_reader)
-                for row in csv_reader:
-                    if row:
-                        try:
-                            event_id = int(row[0])
-                            zeitstempel = ast.literal_eval(row[1])  # Konvertiert den Zeitstempel in eine Liste
-                            zeit_objekt = Datumzeit(zeitstempel[0], zeitstempel[1], zeitstempel[2], zeitstempel[3], zeitstempel[4], zeitstempel[5])
-                            aktion = row[2]
-                            name = row[3]
-                            taeglich = ast.literal_eval(row[4])
-                            monatlich = ast.literal_eval(row[5])
-                            jaehrlich = ast.literal_eval(row[6])
-                            self.event_erstellen(
-                                event_zeit=zeit_objekt,
-                                event_akt=aktion,
-                                event_name=name,
-                                taeglich=taeglich,
-                                monatlich=monatlich,
-                                jaehrlich=jaehrlich)
-                        except Exception as e:
-                            self.event_entfernen(event_id) #Fehlerhafte Events werden gelöscht
-                            raise Exception(f"Fehler beim Laden von Events: {e}.\n")
+            geladen = Snapshot(pfad)
         except FileNotFoundError:
-            with open(self.EVENTS_CSV, 'w', newline='', encoding='utf-8') as f:
-                csv_writer = writer(f)
-                csv_writer.writerow(['EventID', 'Zeitstempel', 'Aktion', 'Name', 'Täglich ?', 'Monatlich ?', 'Jährlich ?'])
+            return False
+        except (ValueError, OSError) as e:
+            print(f"Snapshot wird ignoriert: {str(e).strip()}\n")
+            return False
+        self.__speicher.stand_merken()  # vor der Prüfung, eine spätere fremde Änderung findet dann aktualisieren()
+        if not geladen.aktuell(self.__speicher.quelldateien()):
+            geladen.schliessen()
+            return False
+        ids = geladen.ids()
+        self.__snapshot = geladen
+        self.__event_liste = EventListe(geladen, self.__aus_snapshot_erzeugen)
+        self.__index = dict(zip(ids, range(len(ids))))
+        self.__planer = list(zip(geladen.sekunden(), ids))  # nach (Sekunden, ID) sortiert und damit bereits ein Heap
+        self.__geplant = dict(zip(ids, self.__planer))
+        self.__naechste_id = max(self.__naechste_id, geladen.naechste_id)
+        self.__speicher.naechste_id = max(self.__speicher.naechste_id, geladen.naechste_id)
+        return True
+
+    def __aus_snapshot_erzeugen(self, eintrag:tuple) -> Event:
+        """Erzeugt ein Event aus einem Datensatz des Snapshots, wird von der EventListe beim ersten Zugriff aufgerufen.
+        :param eintrag: (event_id, sekunden, aktion, name, taeglich, monatlich, jaehrlich, regel_text)
+        :return: Das Event.
+        """
+        event_id, sekunden, aktion, name, taeglich, monatlich, jaehrlich, regel = eintrag
+        return Event(
+            event_zeit=Zeitpunkt(sekunden),
+            event_liste=self.__event_liste,
+            event_akt=aktion,
+            event_name=name,
+            taeglich=taeglich,
+            monatlich=monatlich,
+            jaehrlich=jaehrlich,
+            event_id=event_id,
+            regel=regel_parsen(regel))
+
+    def __snapshot_schreiben(self) -> None:
+        """Schreibt den binären Snapshot, wenn das Backend einen hat und der geladene Snapshot nicht mehr aktuell ist.
+        Noch nicht erzeugte Events werden direkt aus dem alten Snapshot übernommen, danach ist der alte Snapshot geschlossen.
+        Hat ein anderer Prozess Änderungen gespeichert, die hier fehlen, wird kein Snapshot geschrieben.
+        """
+        pfad = self.__speicher.snapshot_pfad
+        if pfad is None:
+            return
+        quellen = self.__speicher.quelldateien()
+        try:
+            stempel = snapshot.quellen_stempel(quellen)  # vor der Prüfung auf fremde Änderungen, eine spätere macht den Snapshot ungültig
+            if self.__speicher.fremd_geaendert():
+                return
+            if self.__snapshot is None or not self.__snapshot.aktuell(quellen):
+                if isinstance(self.__event_liste, EventListe):
+                    datensaetze = list(self.__event_liste.datensaetze())
+                    self.__snapshot.schliessen()  # Eine eingeblendete Datei kann unter Windows nicht ersetzt werden
+                else:
+                    datensaetze = map(snapshot.datensatz, self.__event_liste)
+                snapshot.schreiben(pfad, datensaetze, self.__naechste_id, stempel)
+        except OSError as e:
+            print(f"Snapshot konnte nicht geschrieben werden: {str(e).strip()}\n")
+
+    @messung.gemessen("eventman.events_speichern")
+    def __events_speichern(self, *aenderungen:tuple) -> None:
+        """Speichert Änderungen über das Speicher-Backend.
+        Im Journal- oder SQLite-Modus kostet jede Änderung O(1) I/O, im CSV-Modus wird die Datei einmal neu geschrieben.
+        Innerhalb von batch() werden die Änderungen nur gesammelt und beim Verlassen gemeinsam gespeichert.
+        Danach werden Änderungen anderer Prozesse übernommen, die das Backend beim Speichern gefunden hat.
+        :param aenderungen: (Art, Event)- bzw. (Speicher.ENTFERNT, Event-ID)-Tupel.
+        """
+        if self.__batch_tiefe:
+            self.__batch_aenderungen.extend(aenderungen)
+            return
+        self.__speicher.anwenden(list(aenderungen), self.__event_liste)
+        self.__benachrichtigen(list(aenderungen))
+        self.aktualisieren()
+
+    @contextmanager
+    def batch(self):
+        """Transaktion für viele Änderungen, z.B. beim Import eines Feiertagssatzes.
+        Innerhalb des Blocks ändern Erstellen, Entfernen und Verschieben nur Arbeitsspeicher und Indizes.
+        Beim Verlassen wird einmal gespeichert. Bei einer Exception werden alle Änderungen des Blocks zurückgenommen.
+        Blöcke können verschachtelt werden, gespeichert wird erst beim äußersten.
+
+            with eventman.batch():
+                eventman.event_erstellen(...)
+                eventman.event_entfernen(...)
+
+        :return: Der Eventmanager selbst.
+        """
+        sicherung = (len(self.__batch_aenderungen), len(self.__batch_rueckgaengig))
+        self.__batch_tiefe += 1
+        try:
+            yield self
+        except BaseException:
+            self.__batch_tiefe -= 1
+            self.__zuruecksetzen(*sicherung)
+            raise
+        self.__batch_tiefe -= 1
+        if self.__batch_tiefe:
+            return
+        aenderungen = self.__batch_aenderungen
+        try:
+            if aenderungen:
+                self.__speicher.anwenden(aenderungen, self.__event_liste)
+        except Exception as e:
+            self.__zuruecksetzen(0, 0)
+            raise Exception(f"Fehler beim Speichern der Transaktion, Änderungen wurden zurückgenommen: {str(e)}\n")
+        self.__batch_aenderungen = []
+        self.__batch_rueckgaengig = []
+        if aenderungen:
+            self.__benachrichtigen(aenderungen)
+            self.aktualisieren()
+        self.__neu_planen()
 
-    def __events_speichern(self) -> None:
-        """Speichert die aktuelle Event-Liste in der CSV-Datei.\
+    def __zuruecksetzen(self, anzahl_aenderungen:int, anzahl_schritte:int) -> None:
+        """Nimmt die Änderungen einer Transaktion bis zu einem Sicherungspunkt in umgekehrter Reihenfolge zurück.
+        :param anzahl_aenderungen: Anzahl der gesammelten Änderungen am Sicherungspunkt.
+        :param anzahl_schritte: Anzahl der Rückgängig-Schritte am Sicherungspunkt.
         """
-        with open(self.EVENTS_CSV, 'w', newline='', encoding='utf-8') as f:
-            csv_writer = writer(f)
-            csv_writer.writerow(['EventID', 'Zeitstempel', 'Aktion', 'Name', 'Täglich ?', 'Monatlich ?', 'Jährlich ?'])
-            for ev in self.__event_liste:
-                csv_writer.writerow([ev.id, str(ev.zeit), ev.akt, ev.name, str(ev.taeglich), str(ev.monatlich), str(ev.jaehrlich)])
+        while len(self.__batch_rueckgaengig) > anzahl_schritte:
+            self.__batch_rueckgaengig.pop()()
+        del self.__batch_aenderungen[anzahl_aenderungen:]
+
+    def __merken(self, rueckgaengig) -> None:
+        """Merkt sich innerhalb einer Transaktion, wie eine Änderung im Arbeitsspeicher zurückgenommen wird.
+        :param rueckgaengig: Funktion ohne Parameter, die die Änderung zurücknimmt.
+        """
+        if self.__batch_tiefe:
+            self.__batch_rueckgaengig.append(rueckgaengig)
+
+    def beobachter_anmelden(self, callback) -> None:
+        """Meldet eine Funktion an, die nach jeder gespeicherten Änderung aufgerufen wird.
+        Innerhalb von batch() wird erst nach dem Speichern am Ende einmal mit allen Änderungen benachrichtigt,
+        zurückgerollte Änderungen werden nicht gemeldet.
+        :param callback: Erhält eine Liste von (Art, Event)- bzw. (Speicher.ENTFERNT, Event-ID)-Tupeln.
+        :raises TypeError: Wenn callback nicht aufrufbar ist.
+        """
+        if not callable(callback):
+            raise TypeError("callback muss aufrufbar sein.")
+        self.__beobachter.append(callback)
+
+    def beobachter_abmelden(self, callback) -> None:
+        """Meldet eine mit beobachter_anmelden() angemeldete Funktion wieder ab.
+        :param callback: Die angemeldete Funktion.
+        """
+        if callback in self.__beobachter:
+            self.__beobachter.remove(callback)
+
+    def __benachrichtigen(self, aenderungen:list[tuple]) -> None:
+        """Teilt allen Beobachtern die gespeicherten Änderungen mit.
+        :param aenderungen: Liste von (Art, Event)- bzw. (Speicher.ENTFERNT, Event-ID)-Tupeln.
+        """
+        for callback in self.__beobachter:
+            callback(aenderungen)
+
+    def aktualisieren(self) -> int:
+        """Übernimmt Änderungen, die andere Prozesse (z.B. ein Import über die Kommandozeile) seit dem letzten Abgleich gespeichert haben.
+        Ohne fremde Änderungen kostet das ein stat() der Stand-Datei. Im Journal-Modus werden nur die neuen Journal-Datensätze gelesen.
+        Die Beobachter werden wie bei eigenen Änderungen benachrichtigt, gespeichert wird nichts. Innerhalb von batch() wird nichts getan.
+        Nach jedem eigenen Speichern geschieht das automatisch, die App ruft es zusätzlich regelmäßig auf.
+        :return: Anzahl der übernommenen Änderungen.
+        """
+        if self.__batch_tiefe:
+            return 0
+        fremde = self.__speicher.fremde_aenderungen(self.__event_liste)
+        if not fremde:
+            return 0
+        aenderungen: list[tuple] = []
+        for art, wert in fremde:
+            if art == Speicher.ENTFERNT:
+                if wert in self.__index:
+                    self.__aus_liste_nehmen(wert)
+                    aenderungen.append((Speicher.ENTFERNT, wert))
+                continue
+            if art == Speicher.VERSCHOBEN:
+                event_id, zeitstempel = wert
+                if event_id in self.__index:
+                    ev = self.event_aufrufen(event_id)
+                    ev.zeit = Zeitpunkt.aus_datum(*zeitstempel)
+                    self.__einplanen(ev)
+                    aenderungen.append((Speicher.VERSCHOBEN, ev))
+                continue
+            event_id, zeitstempel, aktion, name, taeglich, monatlich, jaehrlich, regel = wert
+            if event_id in self.__index:  # von einem anderen Prozess verändert, wird ersetzt
+                self.__aus_liste_nehmen(event_id)
+                aenderungen.append((Speicher.ENTFERNT, event_id))
+            try:
+                ev = self.__event_anlegen(Zeitpunkt.aus_datum(*zeitstempel), aktion, name, taeglich, monatlich, jaehrlich, event_id, regel)
+            except Exception as e:
+                self.__ladefehler.append(f"Event-ID {event_id}: {str(e).strip()}")
+                continue
+            aenderungen.append((Speicher.ERSTELLT, ev))
+        if aenderungen:
+            self.__benachrichtigen(aenderungen)
+        self.__neu_planen()
+        return len(aenderungen)
+
+    def sichern(self) -> None:
+        """Schreibt bei verzögertem Schreiben (nachlauf) alle ausstehenden Änderungen sofort und wartet darauf.
+        :raises exception: Wenn das Schreiben fehlschlägt.
+        """
+        self.__speicher.sichern()
+
+    def schliessen(self) -> None:
+        """Schließt den Eventmanager sauber, z.B. beim Beenden der App.
+        Schreibt ausstehende Änderungen, wartet z.B. auf eine laufende Journal-Kompaktierung und schließt Dateien und Datenbankverbindungen.
+        Schreibt danach den binären Snapshot für einen schnellen nächsten Start.
+        """
+        self.__speicher.schliessen()
+        self.__snapshot_schreiben()
+
+    @staticmethod
+    def __als_zeitpunkt(zeit: Datumzeit | Zeitpunkt) -> Zeitpunkt:
+        """Wandelt eine Datumzeit in einen Zeitpunkt um, Zeitpunkte werden unverändert übernommen.
+        :param zeit: Datumzeit- oder Zeitpunkt-Objekt.
+        :return: Zeitpunkt
+        """
+        return zeit if isinstance(zeit, Zeitpunkt) else zeit.zeitpunkt()
+
+    def __einplanen(self, ev: Event) -> None:
+        """Legt die Fälligkeit eines Events im Planer ab. Ein älterer Eintrag desselben Events wird dadurch ungültig.
+        Während des Ladens wird nur angehängt, der Heap wird danach einmal mit heapify() aufgebaut.
+        :param ev: Einzuplanendes Event.
+        """
+        eintrag = (ev.zeitpunkt.sekunden, ev.id)
+        self.__geplant[ev.id] = eintrag
+        if self.__massenladen:
+            self.__planer.append(eintrag)
+            return
+        heapq.heappush(self.__planer, eintrag)
+        if len(self.__planer) > 2 * len(self.__geplant) + 64:
+            # Zu viele veraltete Einträge: Heap aus den gültigen Einträgen neu aufbauen
+            self.__planer = list(self.__geplant.values())
+            heapq.heapify(self.__planer)
+
+    def __ausplanen(self, event_id: int) -> None:
+        """Entfernt ein Event aus dem Planer. Der Heap-Eintrag wird erst beim Herausnehmen verworfen.
+        :param event_id: ID-Nummer des Events.
+        """
+        self.__geplant.pop(event_id, None)
+
+    def __naechster_eintrag(self) -> tuple | None:
+        """Gibt den frühesten gültigen Heap-Eintrag zurück und verwirft dabei veraltete Einträge.
+        :return: (Zeitschlüssel, Event-ID) oder None, wenn kein Event geplant ist.
+        """
+        while self.__planer:
+            eintrag = self.__planer[0]
+            if self.__geplant.get(eintrag[1]) is eintrag:
+                return eintrag
+            heapq.heappop(self.__planer)
+        return None
+
+    def naechste_faelligkeit(self) -> float | None:
+        """Berechnet die Zeit bis zum nächsten fälligen Event.
+        :return: Verzögerung in Sekunden (mindestens 0), oder None, wenn kein Event geplant ist.
+        """
+        eintrag = self.__naechster_eintrag()
+        if eintrag is None:
+            return None
+        jetzt = time()
+        return max(0.0, eintrag[0] - Zeitpunkt.jetzt(jetzt).sekunden - (jetzt % 1))
+
+    def __neu_planen(self) -> None:
+        """Teilt dem Planer-Callback mit, wann event_trigger() das nächste Mal aufgerufen werden soll."""
+        if self.__planer_callback is None or self.__batch_tiefe:
+            return
+        verzoegerung = self.naechste_faelligkeit()
+        if verzoegerung is not None:
+            verzoegerung = min(verzoegerung, self.MAX_SCHLAFZEIT)
+        self.__planer_callback(verzoegerung)
 
+    @messung.gemessen("eventman.event_trigger")
     def event_trigger(self, *args) -> list[str] | None:
         """Geht durch die Event-Liste, prüft, ob Events abgelaufen sind und löst sie aus.
-        Entfernt das Event aus der Liste, wenn es nicht täglich, monatlich oder jährlich ist.
-        Verschiebt das Event auf den nächsten Tag, Monat oder Jahr, wenn es täglich, monatlich oder jährlich ist.
-        :param args: Wird hier gebraucht für die Timeout-Zeit von schedule_interval() in der App.
+        Entfernt das Event aus der Liste, wenn es keine Wiederholungsregel hat oder die Regel abgelaufen ist.
+        Verschiebt ein wiederholtes Event direkt auf das erste Vorkommen nach jetzt. Verpasste Vorkommen
+        (z.B. bei geschlossener App) werden in einem Schritt übersprungen und das Event nur einmal ausgelöst.
+        Es werden nur die fälligen Events aus dem Planer-Heap genommen, ein Aufruf ohne fällige Events kostet O(1).
+        Mit Dispatcher wird jedes ausgelöste Event an ihn übergeben, die Handler laufen dann außerhalb des aufrufenden Threads.
+        Alle Änderungen eines Aufrufs werden in einer Transaktion mit einem einzigen Schreibvorgang gespeichert.
+        :param args: Wird hier gebraucht für die Timeout-Zeit von schedule_once() in der App.
         :return: list[str] | None # Gibt die Aktion des ausgelösten Events als String zurück, wenn eines gefunden wurde, sonst None.
         """
+        self.__zeit = Datumzeit()  # Neues Objekt, da die alte Zeit als Event-Zeit verwendet worden sein kann
+        self.__zeit.jetzt()
+        jetzt_zeitpunkt = self.__zeit.zeitpunkt()
+        jetzt = jetzt_zeitpunkt.sekunden
         aktionen_temp:list[str] = []
-        for ev in self.__event_liste:
-            if ev.abgelaufen(self.__zeit):
+        with self.batch():  # alle Entfernungen und Verschiebungen werden gemeinsam in einem Schreibvorgang gespeichert
+            while (eintrag := self.__naechster_eintrag()) is not None and eintrag[0] <= jetzt:
+                heapq.heappop(self.__planer)
+                ev = self.__event_liste[self.__index[eintrag[1]]]
                 try:
                     print(f"Event-Backlog - Abgelaufene Events:\nID: '{ev.id}'\nName: {ev.akt}\nZeit: {ev.zeit}\n")
                     aktionen_temp.append(ev.akt)
-                    # Verschiebt das Event auf den nächsten Tag, Monat oder Jahr, wenn es täglich, monatlich oder jährlich ist.
-                    if ev.taeglich or ev.monatlich or ev.jaehrlich:
-                        neue_zeit = Datumzeit(
-                            ev.zeit[0],
-                            ev.zeit[1],
-                            ev.zeit[2],
-                            ev.zeit[3],
-                            ev.zeit[4],
-                            ev.zeit[5])
-                        if ev.jaehrlich: neue_zeit.jahr += 1
-                        elif ev.monatlich:
-                            if not neue_zeit.monat >= 12: neue_zeit.monat += 1
-                            else:
-                                neue_zeit.monat = 1
-                                neue_zeit.jahr += 1
-                        elif ev.taeglich:
-                            if not neue_zeit.tag >= neue_zeit.max_tage(neue_zeit.monat, neue_zeit.jahr): neue_zeit.tag += 1
-                            else:
-                                neue_zeit.tag = 1
-                                if not neue_zeit.monat >= 12: neue_zeit.monat += 1
-                                else:
-                                    neue_zeit.monat = 1
-                                    neue_zeit.jahr += 1
-                        ev.zeit = neue_zeit
-                    else: self.event_entfernen(ev.id)
-                    self.__events_speichern()
+                    if self.__dispatcher is not None:
+                        self.__dispatcher.ausloesen(ev)  # kehrt sofort zurück, der Handler läuft im Thread-Pool
+                    # Verschiebt ein wiederholtes Event auf das erste Vorkommen nach jetzt, verpasste Vorkommen entfallen.
+                    naechste = ev.regel.naechstes_nach(max(jetzt_zeitpunkt, ev.zeitpunkt)) if ev.regel is not None else None
+                    if naechste is None:
+                        self.event_entfernen(ev.id)
+                        continue
+                    self.__zeit_setzen(ev, naechste)
+                    self.__events_speichern((Speicher.VERSCHOBEN, ev))
                 except Exception as e:
                     raise Exception(f"Fehler beim Triggern des Events: {str(e)}\n")
+        messung.zaehlen("eventman.ausgeloest", len(aktionen_temp))
+        self.__neu_planen()
         return set(aktionen_temp) if aktionen_temp else []
 
-    def event_erstellen(
+    def __event_anlegen(
             self,
-            event_zeit:Datumzeit,
+            event_zeit:Datumzeit | Zeitpunkt,
             event_akt: str,
             event_name: str,
             taeglich:bool = False,
             monatlich:bool = False,
-            jaehrlich:bool = False,) -> None:
-        """Fügt ein Event der Liste hinzu und speichert es in der CSV-Datei.
-        :param event_zeit: Zeitstempel des Events.
-        :param event_akt: Aktion, die mit dem Event verknüpft werden soll, aus vordefinierter Liste.
-        :param event_name: Name des Events zur Darstellung im UI.
-        :param taeglich: Bei True wird das Event auf den Nächsten Tag verschoben, wenn es getriggert wird. Default False.
-        :param monatlich: Bei True wird das Event auf den Nächsten Monat verschoben, wenn es getriggert wird. Default False.
-        :param jaehrlich: Bei True wird das Event auf das Nächste Jahr verschoben, wenn es getriggert wird. Default False.
+            jaehrlich:bool = False,
+            event_id:int | None = None,
+            regel:Regel | None = None) -> Event:
+        """Prüft die Angaben, erzeugt das Event, fügt es der Liste hinzu und plant es ein. Speichert nicht.
+        :param event_id: Feste ID beim Laden, sonst wird die nächste ID aus dem Zähler vergeben.
+        :param regel: Wiederholungsregel, hat Vorrang vor den Flags.
+        :return: Das neue Event.
         :raises exception: Bei ungültiger Event-Zeit, Aktion oder Name.
         """
-        if not isinstance(event_zeit, Datumzeit):
-            raise TypeError("Event-Zeit muss ein Datumzeit-Objekt sein.\n")
+        if not isinstance(event_zeit, (Datumzeit, Zeitpunkt)):
+            raise TypeError("Event-Zeit muss ein Datumzeit- oder Zeitpunkt-Objekt sein.\n")
         if not isinstance(event_akt, str) or event_akt not in self.__event_aktionen:
             raise TypeError(f"Ungültige Event-Aktion.\nGültige Aktionen: {self.__event_aktionen}\n")
         if not isinstance(event_name, str):
             raise TypeError("Event-Name muss ein String sein.\n")
+        if event_id is None:
+            event_id = self.__id_vergeben()
+        self.__naechste_id = max(self.__naechste_id, event_id + 1)
         neues_event:Event = Event(
                 event_zeit=event_zeit,
                 event_liste=self.__event_liste,
@@ -181,14 +559,77 @@ class Eventman:
                 event_name=event_name,
                 taeglich=taeglich,
                 monatlich=monatlich,
-                jaehrlich=jaehrlich)
-        self.__event_liste.append(neues_event)
+                jaehrlich=jaehrlich,
+                event_id=event_id,
+                regel=regel)
+        self.__in_liste_aufnehmen(neues_event)
+        if self.__batch_tiefe:
+            self.__merken(lambda: self.__aus_liste_nehmen(neues_event.id))
+        return neues_event
+
+    def __id_vergeben(self) -> int:
+        """Gibt die nächste freie Event-ID zurück. IDs werden beim Backend reserviert, damit kein anderer Prozess dieselbe vergibt,
+        innerhalb von batch() gleich ID_BLOCK Stück auf einmal. Nicht benutzte reservierte IDs bleiben frei.
+        :return: Event-ID.
+        """
+        if self.__naechste_id >= self.__reserviert_bis:
+            anzahl = self.ID_BLOCK if self.__batch_tiefe else 1
+            self.__naechste_id = self.__speicher.ids_reservieren(anzahl, self.__naechste_id)
+            self.__reserviert_bis = self.__naechste_id + anzahl
+        return self.__naechste_id
+
+    def __in_liste_aufnehmen(self, ev: Event) -> None:
+        """Fügt ein Event in Event-Liste und ID-Index ein und plant es ein.
+        :param ev: Aufzunehmendes Event.
+        """
+        self.__index[ev.id] = len(self.__event_liste)
+        self.__event_liste.append(ev)
+        self.__einplanen(ev)
+
+    def event_erstellen(
+            self,
+            event_zeit:Datumzeit | Zeitpunkt,
+            event_akt: str,
+            event_name: str,
+            taeglich:bool = False,
+            monatlich:bool = False,
+            jaehrlich:bool = False,
+            regel:Regel | None = None) -> None:
+        """Fügt ein Event der Liste hinzu und speichert es in der CSV-Datei.
+        :param event_zeit: Zeitstempel des Events.
+        :param event_akt: Aktion, die mit dem Event verknüpft werden soll, aus vordefinierter Liste.
+        :param event_name: Name des Events zur Darstellung im UI.
+        :param taeglich: Bei True wird das Event auf den Nächsten Tag verschoben, wenn es getriggert wird. Default False.
+        :param monatlich: Bei True wird das Event auf den Nächsten Monat verschoben, wenn es getriggert wird. Default False.
+        :param jaehrlich: Bei True wird das Event auf das Nächste Jahr verschoben, wenn es getriggert wird. Default False.
+        :param regel: Wiederholungsregel (Intervall, Anzahl, Enddatum, Wochentage). Hat Vorrang vor den Flags. Default None.
+        :raises exception: Bei ungültiger Event-Zeit, Aktion oder Name.
+        """
+        neues_event = self.__event_anlegen(event_zeit, event_akt, event_name, taeglich, monatlich, jaehrlich, regel=regel)
         print(f"Event '{neues_event.name}' wurde erstellt mit ID '{neues_event.id}'.\n")
         try:  # Speichert das neue Event in der CSV-Datei
-            self.__events_speichern()
+            self.__events_speichern((Speicher.ERSTELLT, neues_event))
         except Exception as e:
             self.event_entfernen(neues_event.id)
             raise Exception(f"Fehler beim Speichern des Events: {str(e)}\n")
+        self.__neu_planen()
+
+    def event_erstellen_viele(self, angaben) -> list[int]:
+        """Erstellt viele Events in einer Transaktion mit einem einzigen Speichervorgang, z.B. beim Import eines Kalenders.
+        Schlägt ein Event fehl, wird keines der Events übernommen.
+        :param angaben: Iterable aus Tupeln (event_zeit, event_akt, event_name[, taeglich, monatlich, jaehrlich])
+                        oder Dictionaries mit den Parametern von event_erstellen().
+        :return: IDs der erstellten Events in Reihenfolge.
+        :raises exception: Bei ungültigen Angaben oder Fehlern beim Speichern.
+        """
+        ids:list[int] = []
+        with self.batch():
+            for angabe in angaben:
+                neues_event = self.__event_anlegen(**angabe) if isinstance(angabe, dict) else self.__event_anlegen(*angabe)
+                self.__events_speichern((Speicher.ERSTELLT, neues_event))
+                ids.append(neues_event.id)
+        print(f"{len(ids)} Events wurden erstellt.\n")
+        return ids
 
     def event_aufrufen(self, event_id:int) -> Event:
         """Methode zum Aufrufen eines Events anhand der Event-ID.
@@ -197,26 +638,118 @@ class Eventman:
         :raises exception: Bei ungültiger Event-ID oder wenn das Event nicht gefunden wird.
         """
         try:
-            for ev in self.__event_liste:
-                if ev.id == event_id:
-                    return ev
-            raise ValueError(f"Es existiert kein Event mit der ID '{event_id}'.\n")
-        except Exception as e:
-            raise Exception(f"Event konnte nicht aufgerufen werden: {str(e)}\n")
+            return self.__event_liste[self.__index[event_id]]
+        except KeyError:
+            raise Exception(f"Event konnte nicht aufgerufen werden: Es existiert kein Event mit der ID '{event_id}'.\n")
+
+    def __aus_liste_nehmen(self, event_id: int) -> Event:
+        """Entfernt ein Event in O(1) aus Event-Liste, ID-Index und Planer, indem das letzte Event an seine Position rückt.
+        Die Reihenfolge der Event-Liste ändert sich dadurch, siehe event_liste.
+        :param event_id: ID-Nummer des Events.
+        :return: Das entfernte Event.
+        """
+        position = self.__index.pop(event_id)
+        ev = self.__event_liste[position]
+        letztes = self.__event_liste.pop()
+        if letztes is not ev:
+            self.__event_liste[position] = letztes
+            self.__index[letztes.id] = position
+        self.__ausplanen(event_id)
+        return ev
 
     def event_entfernen(self, event_id: int) -> None:
         """Entfernt ein Event anhand der Event-ID aus der Event-Liste und CSV-Datei.
         :param event_id: ID-Nummer des Events.
         :raises exception: Bei ungültiger Event-ID oder wenn das Event nicht gefunden wird.
         """
-        try:
-            for ev in self.__event_liste:
-                if ev.id == event_id:
-                    self.__event_liste.remove(ev)
-                    print(f"Event mit ID {ev.id} wurde entfernt.\n")
-        except Exception as e:
+        if event_id not in self.__index:
             raise Exception(f"Kein Event mit der ID '{event_id}'.\n")
-        self.__events_speichern()
+        ev = self.__aus_liste_nehmen(event_id)
+        self.__merken(lambda: self.__in_liste_aufnehmen(ev))
+        print(f"Event mit ID {event_id} wurde entfernt.\n")
+        self.__events_speichern((Speicher.ENTFERNT, event_id))
+
+    def events_im_bereich(self, start: Datumzeit | Zeitpunkt, ende: Datumzeit | Zeitpunkt) -> list[Event]:
+        """Gibt alle Events mit Fälligkeit im Bereich [start, ende[ nach Zeit sortiert zurück.
+        Hat das Speicher-Backend einen Zeitindex (z.B. SQLite), wird dieser abgefragt, sonst die Event-Liste durchsucht.
+        Liefert der Zeitindex eine hier unbekannte ID (z.B. von einem anderen Prozess, noch nicht über aktualisieren() übernommen),
+        ist er nicht auf dem Stand der Event-Liste und es wird ebenfalls die Event-Liste durchsucht.
+        :param start: Beginn des Bereichs.
+        :param ende: Ende des Bereichs (exklusiv).
+        :return: Liste der Events im Bereich.
+        """
+        von, bis = self.__als_zeitpunkt(start), self.__als_zeitpunkt(ende)
+        ids = self.__speicher.ids_im_bereich(von.als_liste(), bis.als_liste())
+        if ids is not None and all(event_id in self.__index for event_id in ids):
+            return [self.__event_liste[self.__index[event_id]] for event_id in ids]
+        von, bis = von.sekunden, bis.sekunden
+        return sorted((ev for ev in self.__event_liste if von <= ev.zeitpunkt.sekunden < bis), key=lambda ev: (ev.zeitpunkt.sekunden, ev.id))
+
+    def events_im_monat(self, jahr: int, monat: int) -> list[Event]:
+        """Gibt alle Events eines Monats nach Zeit sortiert zurück.
+        :param jahr: Jahr, z.B. 2025.
+        :param monat: Monat 1–12.
+        :return: Liste der Events im Monat.
+        """
+        folge_jahr, folge_monat = km.monat_plus(jahr, monat, 1)
+        return self.events_im_bereich(Zeitpunkt.aus_datum(jahr, monat, 1), Zeitpunkt.aus_datum(folge_jahr, folge_monat, 1))
+
+    def vorkommen_im_bereich(self, start: Datumzeit | Zeitpunkt, ende: Datumzeit | Zeitpunkt):
+        """Liefert alle Vorkommen im Bereich [start, ende[ nach Zeit sortiert, Wiederholungen eingeschlossen.
+        Wiederholungen werden erst beim Iterieren erzeugt, eine Monats- oder Jahresansicht kostet nur so viel wie ihre Vorkommen.
+        Das erste Vorkommen eines Events ist seine aktuelle Fälligkeit, frühere Vorkommen der Regel gelten als erledigt.
+        :param start: Beginn des Bereichs.
+        :param ende: Ende des Bereichs (exklusiv).
+        :return: Generator über (Zeitpunkt, Event)-Tupel.
+        """
+        von, bis = self.__als_zeitpunkt(start), self.__als_zeitpunkt(ende)
+        schluessel = lambda vorkommen: (vorkommen[0].sekunden, vorkommen[1].id)
+        einmalig = []
+        folgen = []
+        for ev in self.__event_liste:
+            if ev.regel is None:
+                if von.sekunden <= ev.zeitpunkt.sekunden < bis.sekunden:
+                    einmalig.append((ev.zeitpunkt, ev))
+            elif ev.zeitpunkt.sekunden < bis.sekunden:
+                folgen.append(zip(ev.vorkommen(von, bis), repeat(ev)))
+        einmalig.sort(key=schluessel)
+        yield from heapq.merge(einmalig, *folgen, key=schluessel)
+
+    def naechstes_event(self) -> Event | None:
+        """Gibt das Event mit der frühesten Fälligkeit zurück, über den Index des Backends oder den Planer-Heap.
+        :return: Event oder None, wenn keine Events vorhanden sind.
+        """
+        event_id = self.__speicher.frueheste_id()
+        if event_id is not None and event_id in self.__index:  # unbekannte IDs anderer Prozesse: Planer fragen
+            return self.__event_liste[self.__index[event_id]]
+        eintrag = self.__naechster_eintrag()
+        return self.event_aufrufen(eintrag[1]) if eintrag is not None else None
+
+    def __zeit_setzen(self, ev: Event, neue_zeit: Datumzeit | Zeitpunkt) -> None:
+        """Setzt die Zeit eines Events und plant es neu ein. Speichert nicht.
+        :param ev: Zu verschiebendes Event.
+        :param neue_zeit: Neuer Zeitstempel.
+        """
+        alte_zeit = ev.zeitpunkt
+        ev.zeit = neue_zeit
+        self.__einplanen(ev)
+        def rueckgaengig():
+            ev.zeit = alte_zeit
+            self.__einplanen(ev)
+        self.__merken(rueckgaengig)
+
+    def event_verschieben(self, event_id: int, neue_zeit: Datumzeit | Zeitpunkt) -> None:
+        """Verschiebt ein Event auf eine neue Zeit, plant es neu ein und speichert die Änderung.
+        :param event_id: ID-Nummer des Events.
+        :param neue_zeit: Neuer Zeitstempel des Events.
+        :raises exception: Bei ungültiger Zeit oder wenn das Event nicht gefunden wird.
+        """
+        if not isinstance(neue_zeit, (Datumzeit, Zeitpunkt)):
+            raise TypeError("Neue Event-Zeit muss ein Datumzeit- oder Zeitpunkt-Objekt sein.\n")
+        ev = self.event_aufrufen(event_id)
+        self.__zeit_setzen(ev, neue_zeit)
+        self.__events_speichern((Speicher.VERSCHOBEN, ev))
+        self.__neu_planen()
 
 
 
@@ -224,7 +757,7 @@ if __name__ == "__main__":
     """Testcode für die Eventman-Klasse."""
     EM: Eventman = Eventman()
     EM.event_erstellen(EM.zeit, "test", "Test-Event")
-    letztes_event_id = EM.event_liste[-1].id
+    letztes_event_id = max(event.id for event in EM)  # IDs steigen, die Event-Liste hat keine feste Reihenfolge
     letztes_event = EM.event_aufrufen(letztes_event_id)
     print(f"Event-Objekt aufgerufen mit Event-ID '{letztes_event_id}':\n\n{letztes_event}\n")
     print(f"Eventliste vor dem Entfernen eines Events:\n")
@@ -0,0 +1,152 @@
+"""
+Modul: m_feiertage
+
+Gesetzliche Feiertage in Deutschland, bundesweit und je Bundesland.
+Bewegliche Feiertage hängen am Ostersonntag (gregorianische Osterformel), feste am Datum, der Buß- und Bettag am 23. November.
+Die Feiertage eines Jahres werden je (Jahr, Region) einmal als Tagesordinalzahl → Name berechnet und gespeichert,
+ist_feiertag() ist danach ein Nachschlagen in einem dict, feiertage_im_monat() gibt eine fertige Tabelle zurück.
+Regionale Feiertage, die nur in Teilen eines Landes gelten (z.B. Mariä Himmelfahrt in Bayern), werden dem ganzen Land zugeordnet.
+
+"""
+
+from scripts import m_kalendermathe as km
+
+REGIONEN = {  # Kürzel → Bundesland, None steht für nur bundesweite Feiertage
+    "BW": "Baden-Württemberg",
+    "BY": "Bayern",
+    "BE": "Berlin",
+    "BB": "Brandenburg",
+    "HB": "Bremen",
+    "HH": "Hamburg",
+    "HE": "Hessen",
+    "MV": "Mecklenburg-Vorpommern",
+    "NI": "Niedersachsen",
+    "NW": "Nordrhein-Westfalen",
+    "RP": "Rheinland-Pfalz",
+    "SL": "Saarland",
+    "SN": "Sachsen",
+    "ST": "Sachsen-Anhalt",
+    "SH": "Schleswig-Holstein",
+    "TH": "Thüringen",
+}
+_ALLE = None  # Regionen-Angabe für bundesweite Feiertage
+_OHNE_GRENZE = (1, 9999)
+
+# (Name, Monat, Tag, Regionen, (ab Jahr, bis Jahr))
+_FESTE = (
+    ("Neujahr", 1, 1, _ALLE, _OHNE_GRENZE),
+    ("Heilige Drei Könige", 1, 6, {"BW", "BY", "ST"}, _OHNE_GRENZE),
+    ("Internationaler Frauentag", 3, 8, {"BE"}, (2019, 9999)),
+    ("Internationaler Frauentag", 3, 8, {"MV"}, (2023, 9999)),
+    ("Tag der Arbeit", 5, 1, _ALLE, _OHNE_GRENZE),
+    ("Mariä Himmelfahrt", 8, 15, {"BY", "SL"}, _OHNE_GRENZE),
+    ("Weltkindertag", 9, 20, {"TH"}, (2019, 9999)),
+    ("Tag der Deutschen Einheit", 10, 3, _ALLE, (1990, 9999)),
+    ("Reformationstag", 10, 31, {"BB", "MV", "SN", "ST", "TH"}, _OHNE_GRENZE),
+    ("Reformationstag", 10, 31, {"HB", "HH", "NI", "SH"}, (2018, 9999)),
+    ("Reformationstag", 10, 31, _ALLE, (2017, 2017)),  # 500 Jahre Reformation
+    ("Allerheiligen", 11, 1, {"BW", "BY", "NW", "RP", "SL"}, _OHNE_GRENZE),
+    ("1. Weihnachtstag", 12, 25, _ALLE, _OHNE_GRENZE),
+    ("2. Weihnachtstag", 12, 26, _ALLE, _OHNE_GRENZE),
+)
+# (Name, Tage ab Ostersonntag, Regionen, (ab Jahr, bis Jahr))
+_BEWEGLICHE = (
+    ("Karfreitag", -2, _ALLE, _OHNE_GRENZE),
+    ("Ostersonntag", 0, {"BB"}, _OHNE_GRENZE),
+    ("Ostermontag", 1, _ALLE, _OHNE_GRENZE),
+    ("Christi Himmelfahrt", 39, _ALLE, _OHNE_GRENZE),
+    ("Pfingstsonntag", 49, {"BB"}, _OHNE_GRENZE),
+    ("Pfingstmontag", 50, _ALLE, _OHNE_GRENZE),
+    ("Fronleichnam", 60, {"BW", "BY", "HE", "NW", "RP", "SL"}, _OHNE_GRENZE),
+)
+# Buß- und Bettag: Mittwoch vor dem 23. November, bis 1994 bundesweit, seitdem nur in Sachsen
+_BUSS_UND_BETTAG = (("Buß- und Bettag", _ALLE, (1, 1994)), ("Buß- und Bettag", {"SN"}, (1995, 9999)))
+
+_JAHRE: dict[tuple[int, str | None], dict[int, str]] = {}  # (Jahr, Region) → {Tagesordinalzahl: Name}
+_MONATE: dict[tuple[int, str | None], tuple[dict[int, str], ...]] = {}  # (Jahr, Region) → je Monat (Index 1–12) {Tag: Name}
+
+
+def ostersonntag(jahr:int) -> int:
+    """Berechnet den Ostersonntag nach der gregorianischen Osterformel (anonymer Algorithmus nach Meeus/Jones/Butcher).
+    :param jahr: Jahr
+    :return: Tagesordinalzahl des Ostersonntags.
+    """
+    a = jahr % 19
+    b, c = divmod(jahr, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    monat, tag = divmod(h + l - 7 * m + 114, 31)
+    return km.ordinal(jahr, monat, tag + 1)
+
+
+def _gilt(regionen:set | None, grenzen:tuple[int, int], jahr:int, region:str | None) -> bool:
+    """Prüft, ob ein Feiertag im Jahr in der Region gilt."""
+    return grenzen[0] <= jahr <= grenzen[1] and (regionen is _ALLE or region in regionen)
+
+
+def feiertage(jahr:int, region:str | None = None) -> dict[int, str]:
+    """Gibt die gesetzlichen Feiertage eines Jahres zurück, berechnet wird je (Jahr, Region) nur beim ersten Aufruf.
+    Das zurückgegebene dict wird geteilt und darf nicht verändert werden.
+    :param jahr: Jahr
+    :param region: Kürzel des Bundeslands aus REGIONEN, None für nur bundesweite Feiertage.
+    :return: {Tagesordinalzahl: Name}, nach Datum sortiert.
+    :raises ValueError: Bei unbekannter Region.
+    """
+    schluessel = (jahr, region)
+    ergebnis = _JAHRE.get(schluessel)
+    if ergebnis is not None:
+        return ergebnis
+    if region is not None and region not in REGIONEN:
+        raise ValueError(f"Unbekannte Region '{region}'. Gültige Regionen: {', '.join(REGIONEN)}")
+    tage: dict[int, str] = {}
+    for name, monat, tag, regionen, grenzen in _FESTE:
+        if _gilt(regionen, grenzen, jahr, region):
+            tage[km.ordinal(jahr, monat, tag)] = name
+    ostern = ostersonntag(jahr)
+    for name, abstand, regionen, grenzen in _BEWEGLICHE:
+        if _gilt(regionen, grenzen, jahr, region):
+            tage[ostern + abstand] = name
+    for name, regionen, grenzen in _BUSS_UND_BETTAG:
+        if _gilt(regionen, grenzen, jahr, region):
+            vortag = km.ordinal(jahr, 11, 22)
+            tage[vortag - (km.wochentag_aus_ordinal(vortag) - 2) % 7] = name  # 2 = Mittwoch
+    ergebnis = _JAHRE[schluessel] = dict(sorted(tage.items()))
+    monate = tuple({} for _ in range(13))
+    for ordinalzahl, name in ergebnis.items():
+        _, monat, tag = km.aus_ordinal(ordinalzahl)
+        monate[monat][tag] = name
+    _MONATE[schluessel] = monate
+    return ergebnis
+
+
+def ist_feiertag(jahr:int, monat:int, tag:int, region:str | None = None) -> bool:
+    """Prüft, ob ein Datum ein gesetzlicher Feiertag ist. Kostet nach dem ersten Aufruf für das Jahr O(1).
+    :param region: Kürzel des Bundeslands, None für nur bundesweite Feiertage.
+    :return: True bei Feiertag.
+    """
+    return km.ordinal(jahr, monat, tag) in feiertage(jahr, region)
+
+
+def feiertag_name(jahr:int, monat:int, tag:int, region:str | None = None) -> str | None:
+    """Gibt den Namen des Feiertags an einem Datum zurück.
+    :param region: Kürzel des Bundeslands, None für nur bundesweite Feiertage.
+    :return: Name, oder None wenn das Datum kein Feiertag ist.
+    """
+    return feiertage(jahr, region).get(km.ordinal(jahr, monat, tag))
+
+
+def feiertage_im_monat(jahr:int, monat:int, region:str | None = None) -> dict[int, str]:
+    """Gibt die Feiertage eines Monats zurück, z.B. zum Einfärben des Monatsrasters. Das dict wird geteilt und darf nicht verändert werden.
+    :param jahr: Jahr
+    :param monat: Monat 1–12
+    :param region: Kürzel des Bundeslands, None für nur bundesweite Feiertage.
+    :return: {Tag des Monats: Name}
+    """
+    if (jahr, region) not in _MONATE:
+        feiertage(jahr, region)
+    return _MONATE[(jahr, region)][monat]
@@ -1,19 +1,30 @@
 """
 Hauptmodul des GUIs. Hier wird die App gestartet und das Layout des Home-Bildschirms definiert.
+Die Events werden erst nach dem ersten Frame in einem Hintergrund-Thread geladen,
+Importieren dieses Moduls lädt noch nichts.
 """
 
+from threading import Thread
+from time import perf_counter
 import kivy
 from kivy.core.text import LabelBase
 from kivy.clock import Clock
 from kivy.properties import StringProperty
 from kivymd.app import MDApp
 from kivymd.uix.dialog import MDDialog
+from kivymd.uix.label import MDLabel
 from kivymd.uix.screenmanager import MDScreenManager
 from kivymd.uix.screen import MDScreen
 from scripts.m_eventman import Eventman
+from scripts.m_aktionen import Dispatcher, standard_dispatcher
 from scripts.m_datumzeit import Datumzeit
 from scripts.m_gui_TagFeld import TagFeld
+from scripts.m_gui_MonatsRaster import MonatsRaster
 from scripts.m_kalender import Kalender
+from scripts.m_monatsansicht import Monatsansicht, Monatsraster
+from scripts import m_feiertage
+from scripts import m_kalendermathe as km
+from scripts import m_messung as messung
 
 kivy.require("2.3.1")
 
@@ -25,19 +36,38 @@ class CalendrumApp(MDApp):
     """
 
     _uhrzeit: str = StringProperty() # Uhrzeit wird als StringProperty definiert, um sie im KV-Layout zu verwenden.
-    _zeit: Datumzeit = Datumzeit()
-    try: _zeit.jetzt()  # Setzt die aktuelle Zeit, wenn die App gestartet wird
-    except Exception as e: print(f"Error initializing time: {e}")
-    _monat: int = _zeit.monat  # Kopie des Monats zum schutz gegen das Update für die Uhrzeit
-    _jahr: int = _zeit.jahr  # Kopie des Jahres zum schutz gegen das Update für die Uhrzeit
-    eventman: Eventman = Eventman()  # Instanz der Eventman-Klasse, um Ereignisse zu verwalten
-    kalender: Kalender = Kalender(eventman.event_liste)
-    kalender.termine_anzeigen()
+    eventman: Eventman | None = None  # Instanz der Eventman-Klasse, wird nach dem ersten Frame im Hintergrund geladen
+    kalender: Kalender | None = None
+    monatsansicht: Monatsansicht | None = None  # Zwischenspeicher der berechneten Monate
+    dispatcher: Dispatcher | None = None  # Führt die Aktionen ausgelöster Events im Thread-Pool aus, nicht im Kivy-Thread
+    POSTAUSGANG:str = "../postausgang.txt"  # Lokaler Ersatz für den Versand von E-Mails und SMS
+    SPEICHER_NACHLAUF:float = 0.5  # Sekunden Ruhe, nach denen gesammelte Änderungen im Hintergrund geschrieben werden
+    ABGLEICH_INTERVALL:float = 2  # Sekunden zwischen zwei Prüfungen auf Änderungen anderer Prozesse (z.B. Import über die Kommandozeile)
     dialog:MDDialog = None
+    FEIERTAGE_REGION:str|None = None  # Bundesland für gesetzliche Feiertage (z.B. "BY", siehe m_feiertage.REGIONEN), None: nur bundesweite
+    EINFACHES_RASTER:bool = False  # True: Monatsraster als ein einziges Canvas-Widget statt 49 TagFeldern
+    TASTE_MESSUNG:int = 293  # F12: Messung und Debug-Overlay ein-/ausschalten
+    TASTE_PROFIL:int = 292  # F11: Profiling-Fenster aufnehmen
+    PROFIL_DAUER:float = 10  # Sekunden eines über die Taste gestarteten Profiling-Fensters
+    PROFIL_DATEI:str = "calendrum.prof"  # Rohdaten des letzten Profiling-Fensters (pstats/snakeviz)
 
     def __init__(self, **kwargs):
+        self.__startzeit:float = perf_counter() # Bezugspunkt der Startzeit-Messung
+        self.startzeiten:dict[str, float] = {} # Sekunden ab App-Erzeugung bis "erster_frame" und "daten_geladen"
         super().__init__(**kwargs)
+        self._zeit: Datumzeit = Datumzeit()
+        try: self._zeit.jetzt()  # Setzt die aktuelle Zeit, wenn die App gestartet wird
+        except Exception as e: print(f"Error initializing time: {e}")
+        self._monat: int = self._zeit.monat  # Kopie des Monats zum schutz gegen das Update für die Uhrzeit
+        self._jahr: int = self._zeit.jahr  # Kopie des Jahres zum schutz gegen das Update für die Uhrzeit
+        self.__lade_thread:Thread|None = None
+        self.__geladener_eventman:Eventman|None = None # vom Lade-Thread gesetzt, bevor die Übergabe geplant wird, on_stop schließt ihn auch ohne Übergabe
         self._uhrzeit:str = f"{self._zeit.stunde:02d}:{self._zeit.minute:02d}:{self._zeit.sekunde:02d} Uhr"
+        self.__trigger_ereignis = None # ClockEvent für den nächsten gemeinsamen Takt von Eventmanager und Weckerplaner
+        self.__faelligkeiten:dict[str, float] = {} # nächste Fälligkeit je Planer ("events", "wecker") als perf_counter()-Zeit
+        self.__tagfelder:list[TagFeld] = [] # die 42 Tagesfelder des Monatsrasters, werden einmal erzeugt und neu belegt
+        self.__monatsraster:MonatsRaster|None = None # Canvas-Raster bei EINFACHES_RASTER
+        self.__messung_overlay:MDLabel|None = None # Debug-Overlay mit den Messwerten, nur bei eingeschalteter Messung
         self.__button_namen:list[str] = ["jahr_plus", "jahr_minus", "monat_plus", "monat_minus"] # für _handle_button_input()
         self._monate_deutsch:list[str] = ["Jan.", "Feb.", "März", "Apr.", "Mai", "Juni",
                                         "Juli", "Aug.", "Sep.", "Okt.", "Nov.", "Dez."]
@@ -61,17 +91,9 @@ class CalendrumApp(MDApp):
             raise ValueError(f"Invalid button_name: {button_name}")
         match button_name:
             case "monat_plus":
-                if self._monat < 12:
-                    self._monat += 1
-                else:
-                    self._monat = 1
-                    self._jahr += 1
+                self._jahr, self._monat = km.monat_plus(self._jahr, self._monat, 1)
             case "monat_minus":
-                if self._monat > 1:
-                    self._monat -= 1
-                else:
-                    self._monat = 12
-                    self._jahr -= 1
+                self._jahr, self._monat = km.monat_plus(self._jahr, self._monat, -1)
             case "jahr_plus":
                 self._jahr += 1
             case "jahr_minus":
@@ -86,10 +108,99 @@ class CalendrumApp(MDApp):
 
         self.gen_tagegrid()
 
+    @messung.gemessen("gui.update_uhrzeit")
     def _update_uhrzeit(self, *args) -> None:  # *args ist notwendig, für Clock.schedule_interval
-        """Aktualisiert die Uhrzeit im HomeScreen jede Sekunde."""
+        """Aktualisiert die Uhrzeit im HomeScreen jede Sekunde, bei eingeschalteter Messung auch das Debug-Overlay."""
         self._zeit.jetzt()
         self._uhrzeit = f"{self._zeit.stunde:02d}:{self._zeit.minute:02d}:{self._zeit.sekunde:02d} Uhr"
+        if self.__messung_overlay is not None:
+            self.__messung_overlay.text = messung.bericht()
+
+    def _messung_umschalten(self) -> None:
+        """Schaltet Messung und Debug-Overlay auf dem HomeScreen ein bzw. aus."""
+        if self.__messung_overlay is None:
+            messung.einschalten()
+            self.__messung_overlay = MDLabel(
+                text=messung.bericht(),
+                font_style="Caption",
+                theme_text_color="Custom",
+                text_color=[0.6, 1, 0.6, 1],
+                halign="left",
+                valign="top",
+                size_hint=(0.7, 0.5),
+                pos_hint={"right": 1, "top": 1},
+            )
+            self.home_screen.add_widget(self.__messung_overlay)
+        else:
+            messung.ausschalten()
+            self.home_screen.remove_widget(self.__messung_overlay)
+            self.__messung_overlay = None
+
+    def _profil_aufnehmen(self, dauer:float) -> None:
+        """Nimmt ein Profiling-Fenster im Haupt-Thread auf und gibt nach Ablauf die Zusammenfassung aus.
+        :param dauer: Länge des Fensters in Sekunden.
+        """
+        if messung.profil_laeuft():
+            return
+        messung.profil_starten()
+        print(f"Profiling für {dauer:g} s gestartet.")
+        Clock.schedule_once(lambda dt: print(messung.profil_beenden(self.PROFIL_DATEI)), dauer)
+
+    def __taste(self, window, taste, *args) -> bool:
+        """Tastenkürzel für Messung (F12) und Profiling (F11)."""
+        if taste == self.TASTE_MESSUNG:
+            self._messung_umschalten()
+            return True
+        if taste == self.TASTE_PROFIL:
+            self._profil_aufnehmen(self.PROFIL_DAUER)
+            return True
+        return False
+
+    def _plane_event_trigger(self, verzoegerung:float|None) -> None:
+        """Planer-Callback des Eventmanagers, meldet seine nächste Fälligkeit an den gemeinsamen Takt.
+        :param verzoegerung: Sekunden bis zum nächsten fälligen Event, None wenn keins geplant ist.
+        """
+        self.__takt_planen("events", verzoegerung)
+
+    def _plane_wecker(self, verzoegerung:float|None) -> None:
+        """Planer-Callback des Weckerplaners, meldet seine nächste Fälligkeit an den gemeinsamen Takt.
+        :param verzoegerung: Sekunden bis zum nächsten fälligen Wecker, None wenn keiner geplant ist.
+        """
+        self.__takt_planen("wecker", verzoegerung)
+
+    def __takt_planen(self, planer:str, verzoegerung:float|None) -> None:
+        """Plant einen einzigen Clock-Aufruf von _takt() zur frühesten Fälligkeit aller Planer.
+        Ein bereits geplanter Aufruf wird dabei ersetzt, es läuft nie mehr als ein ClockEvent.
+        :param planer: "events" oder "wecker"
+        :param verzoegerung: Sekunden bis zur nächsten Fälligkeit dieses Planers, None wenn nichts geplant ist.
+        """
+        jetzt = perf_counter()
+        if verzoegerung is None:
+            self.__faelligkeiten.pop(planer, None)
+        else:
+            self.__faelligkeiten[planer] = jetzt + verzoegerung
+        if self.__trigger_ereignis is not None:
+            self.__trigger_ereignis.cancel()
+            self.__trigger_ereignis = None
+        if self.__faelligkeiten:
+            self.__trigger_ereignis = Clock.schedule_once(self._takt, max(0.0, min(self.__faelligkeiten.values()) - jetzt))
+
+    def _takt(self, *args) -> None:  # *args ist notwendig, für Clock.schedule_once
+        """Gemeinsamer Clock-Callback: löst fällige Events und Wecker aus.
+        Beide Aufrufe kosten ohne Fälligkeiten O(1) und melden über ihre Planer-Callbacks die nächste Fälligkeit."""
+        self.__trigger_ereignis = None
+        self.eventman.event_trigger()
+        self.kalender.weckerplaner.ausloesen()
+
+    def _wecker_klingelt(self, wecker) -> None:
+        """Wird vom Weckerplaner für jeden fälligen Wecker aufgerufen."""
+        dz = wecker.get_datumzeit()
+        print(f"Wecker: {dz.stunde:02}:{dz.minute:02} Uhr")
+
+    def _abgleichen(self, *args) -> None:  # *args ist notwendig, für Clock.schedule_interval
+        """Übernimmt Änderungen anderer Prozesse und zeigt das Raster neu an, wenn es welche gab."""
+        if self.eventman.aktualisieren():
+            self.gen_tagegrid()
 
     def build(self) -> MDScreenManager:
         """Wird automatisch aufgerufen, wenn die App gestartet wird.
@@ -122,7 +233,6 @@ class CalendrumApp(MDApp):
         })
 
         Clock.schedule_interval(self._update_uhrzeit, 1)  # Aktualisiert die Zeit jede Sekunde
-        Clock.schedule_interval(self.eventman.event_trigger, 1) # Triggert abgelaufene Events jede Sekunde
 
         manager:Manager = Manager()
         return manager
@@ -130,40 +240,111 @@ class CalendrumApp(MDApp):
     def on_start(self):
         """Wird automatisch nach build() aufgerufen.
         Alle Prozesse und Parameter, die davon abhängen, dass build() fertig ist, können hier gestartet werden.
+        Das Raster wird zunächst ohne Termine angezeigt, die Events werden nach dem ersten Frame geladen.
         """
         self.gen_tagegrid()
+        self.root_window.bind(on_flip=self.__erster_frame)
+        self.root_window.bind(on_keyboard=self.__taste)
+        if messung.aktiv(): # per CALENDRUM_MESSUNG eingeschaltet
+            messung.ausschalten()
+            self._messung_umschalten()
+        profil_dauer = messung.profil_dauer_aus_umgebung()
+        if profil_dauer:
+            self._profil_aufnehmen(profil_dauer)
+
+    def __erster_frame(self, *args) -> None:
+        """Wird nach dem ersten gezeichneten Frame aufgerufen und startet das Laden der Events im Hintergrund."""
+        self.root_window.unbind(on_flip=self.__erster_frame)
+        self.startzeiten["erster_frame"] = perf_counter() - self.__startzeit
+        self.__lade_thread = Thread(target=self.__daten_laden, daemon=True)
+        self.__lade_thread.start()
+
+    def __daten_laden(self) -> None:
+        """Lädt Eventmanager, Kalender und Monatsansicht im Hintergrund-Thread.
+        Die App sieht die Objekte erst in __daten_bereit() im Haupt-Thread, vorher greift niemand darauf zu.
+        Der Eventmanager wird sofort nach dem Laden gemerkt, damit on_stop ihn auch schließt, wenn die Übergabe nicht mehr läuft.
+        Fehler werden im Haupt-Thread gemeldet, statt den Thread still zu beenden."""
+        try:
+            self.dispatcher = standard_dispatcher(self.POSTAUSGANG)  # sofort gesetzt, damit on_stop ihn auch bei frühem Beenden schließt
+            # Lädt die Events und löst bereits abgelaufene aus, geschrieben wird im Hintergrund statt im Kivy-Thread
+            eventman = self.__geladener_eventman = Eventman(dispatcher=self.dispatcher, nachlauf=self.SPEICHER_NACHLAUF)
+            kalender = Kalender(eventman.event_liste, eventman, self.FEIERTAGE_REGION)
+            monatsansicht = Monatsansicht(kalender, eventman)
+        except Exception as e:
+            Clock.schedule_once(lambda dt, fehler=e: self.__laden_fehlgeschlagen(fehler))
+            return
+        Clock.schedule_once(lambda dt: self.__daten_bereit(eventman, kalender, monatsansicht))
+
+    def __laden_fehlgeschlagen(self, fehler:Exception) -> None:
+        """Meldet im Haupt-Thread, dass die Events nicht geladen werden konnten. Das Raster bleibt ohne Termine."""
+        print(f"Events konnten nicht geladen werden: {str(fehler).strip()}")
+        self.dialog = MDDialog(title="Events konnten nicht geladen werden", text=str(fehler).strip())
+        self.dialog.open()
+
+    def __daten_bereit(self, eventman:Eventman, kalender:Kalender, monatsansicht:Monatsansicht) -> None:
+        """Übernimmt die geladenen Daten im Haupt-Thread, startet den Planer und zeigt die Termine an."""
+        self.eventman, self.kalender, self.monatsansicht = eventman, kalender, monatsansicht
+        # Eventmanager und Weckerplaner melden über ihre Callbacks, wann das Nächste fällig ist, und teilen sich einen Clock-Aufruf.
+        self.eventman.planer_callback = self._plane_event_trigger
+        self.kalender.weckerplaner.bei_alarm = self._wecker_klingelt
+        self.kalender.weckerplaner.planer_callback = self._plane_wecker
+        Clock.schedule_interval(self._abgleichen, self.ABGLEICH_INTERVALL)  # kostet ohne fremde Änderungen nur ein stat()
+        self.gen_tagegrid()
+        self.startzeiten["daten_geladen"] = perf_counter() - self.__startzeit
+        print(f"Start: erster Frame nach {self.startzeiten['erster_frame'] * 1000:.0f} ms, "
+              f"{len(eventman)} Events geladen nach {self.startzeiten['daten_geladen'] * 1000:.0f} ms")
+
+    def on_stop(self):
+        """Wird automatisch beim Beenden der App aufgerufen. Schließt den Eventmanager und den Dispatcher sauber.
+        Ausstehende verzögerte Schreibvorgänge (z.B. beim Laden ausgelöste Events) werden dabei geschrieben."""
+        if self.__lade_thread is not None:
+            self.__lade_thread.join()
+        if self.__geladener_eventman is not None:  # auch wenn __daten_bereit() nicht mehr gelaufen ist
+            self.__geladener_eventman.schliessen()
+        if self.dispatcher is not None:
+            self.dispatcher.schliessen()
 
+    def __aktuelles_raster(self) -> Monatsraster:
+        """Gibt das Raster des gewählten Monats zurück, solange die Events noch laden ohne Termine."""
+        if self.monatsansicht is None:
+            return Monatsraster(self._jahr, self._monat, [[] for _ in range(km.monatslaenge(self._jahr, self._monat))],
+                                m_feiertage.feiertage_im_monat(self._jahr, self._monat, self.FEIERTAGE_REGION))
+        return self.monatsansicht.raster(self._jahr, self._monat)
+
+    @messung.gemessen("gui.gen_tagegrid")
     def gen_tagegrid(self):
-        container = self.home_screen.ids.kalender_grid
-        container.clear_widgets()
-
-        # Headerzeile
-        for wd in ["Mo","Di","Mi","Do","Fr","Sa","So"]:
-            tag = TagFeld(wd)
-            container.add_widget(tag)
-        # Leertage setzen um den 1ten am richtigen Platz starten zu lassen
-        # nach Zeller-Formel
-        y,m = self._jahr, self._monat
-        # Monat anpassen: Januar und Februar als Monate 13 und 14 des Vorjahres
-        if m < 3:
-            m += 12
-            y -= 1
-        h = (-1 + ((13 * (m + 1)) // 5) + y + (y // 4) - (y // 100) + (y // 400)) % 7
-        # h: 0:Mo ... 6:So
-        for _ in range(h):
-            tag = TagFeld("")
-            container.add_widget(tag)
-
-        # Eigentliche Kalendertage auffüllen
-        tage = self._zeit.max_tage(self._monat, self._jahr)
-        for i in range(tage):
-            tag = TagFeld(str(i+1),[])
-            container.add_widget(tag)
-
-        # rest auffüllen mit Leertagen
-        for _ in range(42-h-tage):
-            tag = TagFeld("")
-            container.add_widget(tag)
+        """Zeigt den gewählten Monat im Monatsraster an.
+        Beim ersten Aufruf werden Kopfzeile und 42 Tagesfelder erzeugt, danach werden die Felder nur neu belegt.
+        Mit EINFACHES_RASTER wird stattdessen ein einziges MonatsRaster-Widget verwendet."""
+        if self.EINFACHES_RASTER:
+            if self.__monatsraster is None:
+                container = self.home_screen.ids.kalender_grid
+                container.clear_widgets()
+                container.cols, container.rows = 1, 1
+                self.__monatsraster = MonatsRaster()
+                container.add_widget(self.__monatsraster)
+            self.__monatsraster.anzeigen(self.__aktuelles_raster())
+            return
+        if not self.__tagfelder:
+            container = self.home_screen.ids.kalender_grid
+            container.clear_widgets()
+            # Headerzeile
+            for wd in ["Mo","Di","Mi","Do","Fr","Sa","So"]:
+                tag = TagFeld(wd)
+                container.add_widget(tag)
+            for _ in range(42):
+                tag = TagFeld("")
+                container.add_widget(tag)
+                self.__tagfelder.append(tag)
+
+        # Aufbau und Termine des Monats kommen aus dem Zwischenspeicher, berechnet wird nur beim ersten Aufruf
+        raster = self.__aktuelles_raster()
+        h, tage = raster.versatz, raster.anzahl_tage  # h: 0:Mo ... 6:So
+        for i, tag in enumerate(self.__tagfelder):
+            if h <= i < h + tage: # Eigentliche Kalendertage
+                tag.neu_belegen(str(i - h + 1), raster.balken[i - h], i - h + 1 in raster.feiertage)
+            else: # Leertage vor dem 1ten und nach dem Monatsende
+                tag.neu_belegen("")
 
 
 
@@ -0,0 +1,149 @@
+"""
+Modul: m_gui_MonatsRaster
+
+Leichtgewichtiges Monatsraster als einzelnes Widget.
+Kopfzeile, 42 Tagesfelder, Beschriftungen und Terminbalken werden in eine einzige Canvas-Gruppe gezeichnet,
+statt je Feld ein TagFeld mit Unter-Widgets und Bindings zu erzeugen.
+Berührungen werden über die Koordinaten direkt einem Feld zugeordnet.
+
+"""
+
+from kivy.clock import Clock
+from kivy.core.text import Label as CoreLabel
+from kivy.graphics import Color, InstructionGroup, Rectangle, RoundedRectangle
+from kivy.properties import ListProperty, NumericProperty
+from kivy.uix.widget import Widget
+from scripts.m_monatsansicht import Monatsraster
+
+
+class MonatsRaster(Widget):
+    """Zeichnet ein Monatsraster (7 Spalten, Kopfzeile + 6 Wochen) in eine Canvas-Gruppe.
+    Beim Größenwechsel (z.B. Drehen zwischen Telefon- und Tablet-Layout) wird nur neu gezeichnet, nicht neu aufgebaut.
+    ————————————Attribute: ————————————
+        back_color (list): Hintergrundfarbe der Tagesfelder.
+        feiertag_color (list): Hintergrundfarbe der Feiertage.
+        text_color (list): Textfarbe der Kalendertage.
+        leer_text_color (list): Textfarbe der Kopfzeile.
+        spacing (float): Abstand zwischen den Feldern.
+        raster (Monatsraster | None): Angezeigter Monat.
+    ————————————Methoden: ————————————
+        anzeigen(raster: Monatsraster) → None: Zeigt einen Monat an.
+        feld_an(x: float, y: float) → int | None: Index des Feldes unter einem Punkt (0–48, Kopfzeile 0–6).
+        tag_an(x: float, y: float) → int | None: Tag des Monats unter einem Punkt.
+    ————————————Events: ————————————
+        on_tag_gewaehlt(tag: int): Ein Kalendertag wurde angetippt.
+    """
+    SPALTEN = 7
+    ZEILEN = 7
+    WOCHENTAGE = ("Mo", "Di", "Mi", "Do", "Fr", "Sa", "So")
+    back_color = ListProperty([0, 0.2, 0.2, 1])
+    feiertag_color = ListProperty([0.3, 0.12, 0.12, 1])
+    text_color = ListProperty([0.8, 0.2, 0.2, 1])
+    leer_text_color = ListProperty([0.4, 0.4, 0.4, 1])
+    spacing = NumericProperty(2)
+    __texturen: dict = {}  # (Text, Farbe, Schriftgröße) → Textur, wird von allen Rastern geteilt
+
+    def __init__(self, **kwargs):
+        self.register_event_type("on_tag_gewaehlt")
+        super().__init__(**kwargs)
+        self.raster: Monatsraster | None = None
+        self.__gruppe = InstructionGroup()
+        self.canvas.add(self.__gruppe)
+        self.__zeichnen_ausloesen = Clock.create_trigger(self.__zeichnen)  # mehrere Änderungen pro Frame → ein Zeichnen
+        self.bind(pos=self.__zeichnen_ausloesen, size=self.__zeichnen_ausloesen,
+                  back_color=self.__zeichnen_ausloesen, feiertag_color=self.__zeichnen_ausloesen,
+                  text_color=self.__zeichnen_ausloesen)
+
+    def anzeigen(self, raster:Monatsraster) -> None:
+        """Zeigt einen Monat an, gezeichnet wird im nächsten Frame.
+        :param raster: Monatsraster aus der Monatsansicht.
+        """
+        self.raster = raster
+        self.__zeichnen_ausloesen()
+
+    def __feldgroesse(self) -> tuple[float, float]:
+        """Gibt Breite und Höhe eines Feldes zurück."""
+        return ((self.width - self.spacing * (self.SPALTEN - 1)) / self.SPALTEN,
+                (self.height - self.spacing * (self.ZEILEN - 1)) / self.ZEILEN)
+
+    @classmethod
+    def __textur(cls, text:str, farbe:list, groesse:int):
+        """Gibt die Textur eines Textes zurück, jede Kombination wird nur einmal gerendert."""
+        schluessel = (text, tuple(farbe), groesse)
+        textur = cls.__texturen.get(schluessel)
+        if textur is None:
+            label = CoreLabel(text=text, font_size=groesse, color=farbe)
+            label.refresh()
+            textur = cls.__texturen[schluessel] = label.texture
+        return textur
+
+    def __zeichnen(self, *args) -> None:
+        """Zeichnet alle Felder neu in die Canvas-Gruppe."""
+        gruppe = self.__gruppe
+        gruppe.clear()
+        breite, hoehe = self.__feldgroesse()
+        if breite <= 0 or hoehe <= 0:
+            return
+        schrift = max(int(hoehe * 0.35), 6)
+        versatz = self.raster.versatz if self.raster is not None else 0
+        anzahl_tage = self.raster.anzahl_tage if self.raster is not None else 0
+        feiertage = self.raster.feiertage if self.raster is not None else {}
+        for index in range(self.SPALTEN * self.ZEILEN):
+            zeile, spalte = divmod(index, self.SPALTEN)
+            x = self.x + spalte * (breite + self.spacing)
+            y = self.top - (zeile + 1) * hoehe - zeile * self.spacing
+            ist_feiertag = zeile > 0 and (index - self.SPALTEN - versatz + 1) in feiertage
+            gruppe.add(Color(rgba=self.feiertag_color if ist_feiertag else self.back_color))
+            gruppe.add(RoundedRectangle(pos=(x, y), size=(breite, hoehe), radius=[10]))
+            if zeile == 0:
+                text, farbe, balken = self.WOCHENTAGE[spalte], self.leer_text_color, ()
+            else:
+                tag = index - self.SPALTEN - versatz
+                if not 0 <= tag < anzahl_tage:
+                    continue
+                text, farbe, balken = str(tag + 1), self.text_color, self.raster.balken[tag]
+            # Text mittig im linken Teil, Balken im rechten Drittel von oben nach unten
+            textur = self.__textur(text, farbe, schrift)
+            text_breite = breite * 0.7
+            gruppe.add(Color(1, 1, 1, 1))
+            gruppe.add(Rectangle(texture=textur, size=textur.size,
+                                 pos=(x + (text_breite - textur.width) / 2, y + (hoehe - textur.height) / 2)))
+            oben = y + hoehe - 5
+            for anteil, balken_farbe in balken:
+                balken_hoehe = anteil * (hoehe - 10)
+                oben -= balken_hoehe
+                gruppe.add(Color(rgba=balken_farbe))
+                gruppe.add(RoundedRectangle(pos=(x + text_breite, oben), size=(breite * 0.3 - 5, balken_hoehe), radius=[3]))
+
+    def feld_an(self, x:float, y:float) -> int | None:
+        """Berechnet den Index des Feldes unter einem Punkt, ohne Widgets zu durchsuchen.
+        :return: 0–48 (0–6 = Kopfzeile), None außerhalb des Rasters.
+        """
+        if not self.collide_point(x, y):
+            return None
+        breite, hoehe = self.__feldgroesse()
+        spalte = min(int((x - self.x) / (breite + self.spacing)), self.SPALTEN - 1)
+        zeile = min(int((self.top - y) / (hoehe + self.spacing)), self.ZEILEN - 1)
+        return zeile * self.SPALTEN + spalte
+
+    def tag_an(self, x:float, y:float) -> int | None:
+        """Berechnet den Tag des Monats unter einem Punkt.
+        :return: 1–31, None für Kopfzeile, Leerfelder oder Punkte außerhalb.
+        """
+        index = self.feld_an(x, y)
+        if index is None or self.raster is None:
+            return None
+        tag = index - self.SPALTEN - self.raster.versatz + 1
+        return tag if 1 <= tag <= self.raster.anzahl_tage else None
+
+    def on_touch_down(self, touch):
+        if self.collide_point(*touch.pos):
+            if not touch.is_mouse_scrolling:
+                tag = self.tag_an(*touch.pos)
+                if tag is not None:
+                    self.dispatch("on_tag_gewaehlt", tag)
+            return True
+        return super().on_touch_down(touch)
+
+    def on_tag_gewaehlt(self, tag:int):
+        print(f"Tag {tag} wurde geklickt")
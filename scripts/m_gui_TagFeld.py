@@ -1,6 +1,3 @@
-from random import randint as rndi, random as rnd
-
-
 from kivy.uix.widget import Widget
 from kivy.properties import ListProperty, StringProperty, NumericProperty
 from kivymd.uix.boxlayout import MDBoxLayout
@@ -15,23 +12,31 @@ class RectWidget(Widget):
         super().__init__(**kwargs)
         self.size_hint_y = size_hint_y
         with self.canvas:
-            Color(*color)
+            self.rect_color = Color(*color)
             self.rect = RoundedRectangle(pos=self.pos, size=self.size, radius=[3])
         self.bind(pos=self.update_rect, size=self.update_rect)
 
+    def neu_belegen(self, size_hint_y, color):
+        """Setzt Höhe und Farbe eines wiederverwendeten Rechtecks, ohne neue Canvas-Anweisungen zu erzeugen."""
+        self.size_hint_y = size_hint_y
+        self.rect_color.rgba = color
+
     def update_rect(self, *args):
         self.rect.pos = self.pos
         self.rect.size = self.size
 
 
 class TagFeld(ButtonBehavior, MDBoxLayout):
+    LEER_TEXT_COLOR = [0.4, 0.4, 0.4, 1]  # Textfarbe für Felder ohne Kalendertag
     back_color = ListProperty([0, 0.2, 0.2, 1])
+    feiertag_color = ListProperty([0.3, 0.12, 0.12, 1])  # Hintergrund für Feiertage
     text = StringProperty("-")
     text_color = ListProperty([0.8, 0.2, 0.2, 1])
     termin_rect_anz = NumericProperty(10)
     kalendertag:bool = False
 
     def __init__(self, text, termin_rect_list=None, **kwargs):
+        """termin_rect_list: Farbbalken des Tages (siehe m_monatsansicht.termin_balken), None für Felder ohne Kalendertag."""
         super().__init__(**kwargs)
         self.text = str(text)
         self.orientation = 'horizontal'
@@ -41,11 +46,14 @@ class TagFeld(ButtonBehavior, MDBoxLayout):
 
         # Erscheinungsbild- & Verhaltensanpassung
         if termin_rect_list is None: # kein Kalendertag
-            text_color = [0.4, 0.4, 0.4, 1]
+            text_color = self.LEER_TEXT_COLOR
             self.kalendertag = False
         else:
             text_color = self.text_color
             self.kalendertag = True
+        self.rect_pool:list[RectWidget] = []  # einmal erzeugte Rechtecke, werden beim Monatswechsel wiederverwendet
+        self.rect_anzahl:int = 0  # Anzahl der aktuell angezeigten Rechtecke
+        self.platzhalter = Widget(size_hint_y=1)
 
         # Canvas für Rahmen
         with self.canvas:
@@ -75,33 +83,41 @@ class TagFeld(ButtonBehavior, MDBoxLayout):
 
         # Termin-Rechteck-Widgets hinzufügen
         if self.kalendertag:
-            self.setup_rectangles(self.gen_termin_rect_list())
+            self.setup_rectangles(termin_rect_list)
 
         # Bindings für Canvas-Update
         self.bind(pos=self.update_canvas, size=self.update_canvas)
 
 
-    def gen_termin_rect_list(self):
-        #test data-dummy
-        termin_rect_list = []
-        left_h = 24
-        for i in range(5):
-            r = rndi(2,6)
-            if r<left_h:
-                left_h-=r
-            else:
-                r = left_h
-                left_h = 0
-            termin_rect_list.append([r / 24, [rnd(), rnd(), rnd(), 1 * (i % 5)*rndi(0,1)]])
-            if left_h == 0: break # sollte hier nicht return sein ?
-        return termin_rect_list
+    def neu_belegen(self, text, termin_rect_list=None, feiertag=False):
+        """Belegt ein bestehendes Feld neu, z.B. beim Monatswechsel. Es werden keine Widgets neu erzeugt.
+        text: angezeigter Text, termin_rect_list: wie im Konstruktor, None für Felder ohne Kalendertag,
+        feiertag: True färbt den Hintergrund mit feiertag_color"""
+        self.text = str(text)
+        self.bg_color.rgba = self.feiertag_color if feiertag else self.back_color
+        self.central_text.text = self.text
+        self.kalendertag = termin_rect_list is not None
+        self.central_text.text_color = self.text_color if self.kalendertag else self.LEER_TEXT_COLOR
+        self.setup_rectangles(termin_rect_list or [])
 
     def setup_rectangles(self,termin_rect_list):
-        """termin_rect_list: [[h_r,color],...] für die Termine, h_r:Dauer in Stunden/24, color: falbliste[4*int]"""
-        self.right_box.clear_widgets()
-        for r in termin_rect_list:
-            rect = RectWidget(r[0],r[1])
-            self.right_box.add_widget(rect)
+        """termin_rect_list: [[h_r,color],...] für die Termine, h_r:Dauer in Stunden/24, color: falbliste[4*int]
+        Rechtecke aus früheren Aufrufen werden wiederverwendet, neue nur erzeugt, wenn ein Tag mehr Termine hat als je zuvor."""
+        rest = 1
+        for i, r in enumerate(termin_rect_list):
+            if i < len(self.rect_pool):
+                self.rect_pool[i].neu_belegen(r[0], r[1])
+            else:
+                self.rect_pool.append(RectWidget(r[0],r[1]))
+            rest -= r[0]
+        self.platzhalter.size_hint_y = max(rest, 0) # Platzhalter, damit die Rechtecke ihre Höhe behalten
+        if len(termin_rect_list) != self.rect_anzahl: # Kinder nur ändern, wenn sich die Anzahl ändert
+            self.rect_anzahl = len(termin_rect_list)
+            self.right_box.clear_widgets()
+            for rect in self.rect_pool[:self.rect_anzahl]:
+                self.right_box.add_widget(rect)
+            if self.rect_anzahl:
+                self.right_box.add_widget(self.platzhalter)
 
     def update_canvas(self, *args):
         self.bg_rect.pos = self.pos
@@ -0,0 +1,194 @@
+"""
+Modul: m_journal
+
+Append-only Journal für den Eventmanager.
+Änderungen (Erstellen, Entfernen, Verschieben) werden als einzelne CSV-Zeilen an das Journal angehängt,
+statt jedes Mal die ganze events.csv neu zu schreiben.
+Überschreitet das Journal eine Größe, wird es im Hintergrund mit dem Snapshot (events.csv) zusammengeführt.
+Schreiben mehrere Prozesse in dasselbe Journal, kompaktiert immer nur einer, die anderen lesen ab ihrer letzten Position nach.
+
+"""
+
+from scripts.m_mehrprozess import Dateisperre, datei_kennung
+from csv import writer, reader
+from threading import Lock, Thread
+import io
+import os
+
+
+class Journal:
+    """Append-only Journal mit Snapshot-Datei.
+    Der Zustand ergibt sich aus dem Snapshot plus allen Journal-Datensätzen in Reihenfolge.
+    Alle Datensätze sind idempotent, ein erneutes Abspielen nach einem Absturz während der Kompaktierung ist unschädlich.
+    ————————————Attribute: ————————————
+        snapshot_pfad (str): Pfad zur Snapshot-Datei (Format wie events.csv).
+        journal_pfad (str): Pfad zum aktuellen Journal.
+        max_groesse (int): Größe in Bytes, ab der das Journal kompaktiert werden soll.
+        sperre (Dateisperre | None): Sperre des Speichers, unter der Snapshot und rotiertes Journal ersetzt werden.
+    ————————————Methoden: ————————————
+        anhaengen(datensatz: list) → None: Hängt einen Datensatz an das Journal an.
+        datei_pruefen() → bool: Öffnet das Journal neu, wenn ein anderer Prozess es rotiert hat.
+        datensaetze() → Iterator[list]: Liefert alle Journal-Datensätze in Reihenfolge.
+        lesen_ab(pfad: str, position: int) → tuple[list[list], int]: Liest die Datensätze einer Journal-Datei ab einer Byte-Position.
+        kompaktieren(kopfzeile: list, zeilen: list[list], hintergrund: bool) → bool: Schreibt einen neuen Snapshot und leert das Journal.
+        schliessen() → None: Wartet auf eine laufende Kompaktierung und schließt das Journal.
+    """
+    ERSTELLT = "+"
+    ENTFERNT = "-"
+    VERSCHOBEN = "~"
+
+    def __init__(self, snapshot_pfad:str, journal_pfad:str, max_groesse:int = 256 * 1024, sperre:Dateisperre | None = None) -> None:
+        """Öffnet das Journal zum Anhängen.
+        :param snapshot_pfad: Pfad zur Snapshot-Datei.
+        :param journal_pfad: Pfad zur Journal-Datei.
+        :param max_groesse: Größe in Bytes, ab der kompaktiert werden soll.
+        :param sperre: Sperre des Speichers für mehrere Prozesse, None wenn nur ein Prozess die Dateien benutzt.
+        """
+        self.snapshot_pfad = snapshot_pfad
+        self.journal_pfad = journal_pfad
+        self.max_groesse = max_groesse
+        self.sperre = sperre
+        self.__kompaktierung_sperre = Dateisperre(journal_pfad + ".kompaktierung.lock")  # hält der Prozess, der gerade kompaktiert
+        self.__lock = Lock()
+        self.__kompaktierung: Thread | None = None
+        self.__datei = open(self.journal_pfad, 'a', newline='', encoding='utf-8')
+        self.__writer = writer(self.__datei)
+
+    @property
+    def alt_pfad(self) -> str:
+        """Gibt den Pfad des rotierten Journals zurück, das gerade kompaktiert wird.
+        :return: Pfad als String.
+        """
+        return self.journal_pfad + ".alt"
+
+    @property
+    def groesse(self) -> int:
+        """Gibt die aktuelle Größe des Journals in Bytes zurück."""
+        with self.__lock:
+            return self.__datei.tell()
+
+    @property
+    def kompaktierung_noetig(self) -> bool:
+        """Gibt zurück, ob das Journal die Maximalgröße überschritten hat und keine Kompaktierung läuft."""
+        laeuft = self.__kompaktierung is not None and self.__kompaktierung.is_alive()
+        return not laeuft and self.groesse > self.max_groesse
+
+    def anhaengen(self, datensatz:list) -> None:
+        """Hängt einen Datensatz an das Journal an. Kostet O(1) I/O unabhängig von der Anzahl der Events.
+        :param datensatz: CSV-Zeile, erstes Feld ist die Art der Änderung (ERSTELLT, ENTFERNT, VERSCHOBEN).
+        """
+        with self.__lock:
+            self.__writer.writerow(datensatz)
+            self.__datei.flush()
+
+    def datei_pruefen(self) -> bool:
+        """Öffnet das Journal neu, wenn ein anderer Prozess es beim Kompaktieren rotiert hat.
+        Die offene Datei wäre sonst das rotierte Journal, das nach der Kompaktierung gelöscht wird.
+        Muss unter der Sperre des Speichers aufgerufen werden.
+        :return: True, wenn neu geöffnet wurde.
+        """
+        with self.__lock:
+            info = os.fstat(self.__datei.fileno())
+            if datei_kennung(self.journal_pfad) == (info.st_dev, info.st_ino):
+                return False
+            self.__datei.close()
+            self.__datei = open(self.journal_pfad, 'a', newline='', encoding='utf-8')
+            self.__writer = writer(self.__datei)
+            return True
+
+    @staticmethod
+    def lesen_ab(pfad:str, position:int) -> tuple[list[list], int]:
+        """Liest die Datensätze einer Journal-Datei ab einer Byte-Position, z.B. die seit dem letzten Lesen angehängten.
+        :param pfad: Pfad zur Journal-Datei.
+        :param position: Byte-Position, ab der gelesen wird.
+        :return: (Datensätze, Byte-Position hinter dem letzten gelesenen Datensatz). Ohne Datei ([], 0).
+        """
+        try:
+            with open(pfad, 'rb') as f:
+                f.seek(position)
+                daten = f.read()
+        except FileNotFoundError:
+            return [], 0
+        text = io.StringIO(daten.decode('utf-8'), newline='')
+        return [datensatz for datensatz in reader(text) if datensatz], position + len(daten)
+
+    def datensaetze(self):
+        """Liefert alle Datensätze aus einem evtl. noch nicht kompaktierten alten Journal und dem aktuellen Journal.
+        :return: Iterator über die Datensätze als Listen.
+        """
+        for pfad in (self.alt_pfad, self.journal_pfad):
+            try:
+                with open(pfad, 'r', newline='', encoding='utf-8') as f:
+                    for datensatz in reader(f):
+                        if datensatz:
+                            yield datensatz
+            except FileNotFoundError:
+                continue
+
+    def kompaktieren(self, kopfzeile:list, zeilen:list[list], hintergrund:bool = True) -> bool:
+        """Schreibt die übergebenen Zeilen als neuen Snapshot und verwirft die darin enthaltenen Journal-Datensätze.
+        Das aktuelle Journal wird dafür rotiert, neue Datensätze landen sofort in einem frischen Journal.
+        Kompaktiert gerade ein anderer Prozess, wird nichts getan. Ein liegengebliebenes rotiertes Journal
+        stammt dann sicher aus einer abgebrochenen Kompaktierung und wird mit übernommen.
+        :param kopfzeile: Kopfzeile der Snapshot-Datei.
+        :param zeilen: Vollständiger Zustand als CSV-Zeilen, muss alle bisher angehängten Datensätze enthalten, auch die anderer Prozesse.
+        :param hintergrund: Bei True wird der Snapshot in einem Hintergrund-Thread geschrieben.
+        :return: True, wenn kompaktiert wurde, False wenn ein anderer Prozess gerade kompaktiert.
+        """
+        self.warten()
+        if not self.__kompaktierung_sperre.sperren(warten=False):
+            return False
+        with self.__lock:
+            self.__datei.close()
+            if os.path.exists(self.alt_pfad):  # Rest einer abgebrochenen Kompaktierung
+                with open(self.alt_pfad, 'a', encoding='utf-8') as alt, open(self.journal_pfad, 'r', encoding='utf-8') as neu:
+                    alt.write(neu.read())
+                os.remove(self.journal_pfad)
+            else:
+                os.replace(self.journal_pfad, self.alt_pfad)
+            self.__datei = open(self.journal_pfad, 'a', newline='', encoding='utf-8')
+            self.__writer = writer(self.__datei)
+        if hintergrund:
+            self.__kompaktierung = Thread(target=self.__snapshot_schreiben, args=(kopfzeile, zeilen), daemon=True)
+            self.__kompaktierung.start()
+        else:
+            self.__snapshot_schreiben(kopfzeile, zeilen)
+        return True
+
+    def __snapshot_schreiben(self, kopfzeile:list, zeilen:list[list]) -> None:
+        """Schreibt den Snapshot in eine temporäre Datei, ersetzt den alten atomar und löscht das rotierte Journal.
+        Ersetzen und Löschen geschehen unter der Sperre des Speichers, damit kein anderer Prozess dazwischen liest.
+        :param kopfzeile: Kopfzeile der Snapshot-Datei.
+        :param zeilen: Zeilen des Snapshots.
+        """
+        try:
+            temp_pfad = self.snapshot_pfad + ".tmp"
+            with open(temp_pfad, 'w', newline='', encoding='utf-8') as f:
+                csv_writer = writer(f)
+                csv_writer.writerow(kopfzeile)
+                csv_writer.writerows(zeilen)
+                f.flush()
+                os.fsync(f.fileno())
+            if self.sperre is not None:
+                self.sperre.sperren()
+            try:
+                os.replace(temp_pfad, self.snapshot_pfad)
+                os.remove(self.alt_pfad)
+            finally:
+                if self.sperre is not None:
+                    self.sperre.freigeben()
+        finally:
+            self.__kompaktierung_sperre.freigeben()
+
+    def warten(self) -> None:
+        """Wartet, bis eine laufende Kompaktierung abgeschlossen ist."""
+        if self.__kompaktierung is not None:
+            self.__kompaktierung.join()
+            self.__kompaktierung = None
+
+    def schliessen(self) -> None:
+        """Wartet auf eine laufende Kompaktierung und schließt die Journal-Datei."""
+        self.warten()
+        self.__kompaktierung_sperre.schliessen()
+        with self.__lock:
+            self.__datei.close()
@@ -3,16 +3,53 @@ Modul: m_kalender
 
 Zentrale Verwaltung von Terminen, Weckern und Feiertagen.
 Bietet Methoden zum Anlegen, Entfernen, Anzeigen und Sortieren,
-sowie zur Erzeugung eines Monatsrasters.
+sowie zur Erzeugung eines Monatsrasters und Bereichsabfragen über die Events.
 
 """
 
-from scripts.m_datumzeit import Datumzeit
+from scripts.m_datumzeit import Datumzeit, Zeitpunkt
+from scripts.m_event import Event
 from scripts.m_eventman import Eventman
-from scripts.m_wecker_termine import Wecker
+from scripts.m_speicher import Speicher
+from scripts.m_wecker_termine import Wecker, WeckerPlaner
+from scripts.m_zeitindex import Zeitindex
+from scripts.m_sortierteliste import SortierteListe
+from scripts import m_feiertage
+from scripts import m_kalendermathe as km
 
-from typing import List, Tuple, Union
-import calendar
+from typing import Iterator, List, Tuple, Union
+
+
+def _zeit_schluessel(dz: Datumzeit) -> Tuple[int, int, int, int, int, int]:
+    """Sortierschlüssel einer Datumzeit, direkt aus den Feldern ohne Umweg über Zeitpunkt."""
+    return dz.jahr, dz.monat, dz.tag, dz.stunde, dz.minute, dz.sekunde
+
+
+def _termin_schluessel(termin: Union[Tuple[Datumzeit, str], Event]) -> tuple:
+    """Sortierschlüssel eines Termins: (Jahr, Monat, Tag, Stunde, Minute, Sekunde, Name), für (Datumzeit, Name)-Tupel und Events.
+    Events erhalten zusätzlich ihre ID, damit gleichzeitige gleichnamige Events nicht von der Reihenfolge der Event-Liste abhängen."""
+    if isinstance(termin, Event):
+        return (*termin.zeitpunkt.als_liste(), termin.name, termin.id)
+    return (*_zeit_schluessel(termin[0]), termin[1])
+
+
+def _termin_kennung(termin: Union[Tuple[Datumzeit, str], Event], schluessel: tuple):
+    """Kennung eines Termins für die Duplikatprüfung: die ID bei Events, damit sie nach einer Verschiebung
+    über den alten Schlüssel entfernt werden können, sonst der Schlüssel (gleiche Zeit und gleicher Name gelten als Duplikat)."""
+    return termin.id if isinstance(termin, Event) else schluessel
+
+
+def _termin_text(termin: Union[Tuple[Datumzeit, str], Event]) -> str:
+    """Formatiert einen Termin für die Ausgabe."""
+    if isinstance(termin, Event):
+        return f"{termin.zeitpunkt} – {termin.name}"
+    dz, name = termin
+    return f"{str(dz)} – {name}"
+
+
+def _wecker_schluessel(wecker: Wecker) -> Tuple[int, int, int, int, int, int]:
+    """Sortierschlüssel und Kennung eines Weckers: Datum und Uhrzeit, je Zeitpunkt gibt es nur einen Wecker."""
+    return _zeit_schluessel(wecker.get_datumzeit())
 
 
 class Kalender:
@@ -22,76 +59,158 @@ class Kalender:
       - Wecker: Datumzeit + Event-Anbindung
       - Feiertage: Datumzeit (optional mit Name) oder String
 
+    Gesetzliche Feiertage der eingestellten Region kommen aus m_feiertage und müssen nicht eingetragen werden.
+    Eigene Feiertage mit Datum werden zusätzlich als Tagesordinalzahl gespeichert, ist_feiertag() ist damit ein Nachschlagen in O(1).
     Sie bietet Methoden zum Hinzufügen, Entfernen, Anzeigen,
     Sortieren und zur Monatsberechnung.
+    Termine und Wecker liegen sortiert in einer SortierteListe, Einfügen und Entfernen finden ihre Position per Binärsuche,
+    Duplikate werden über eine Menge erkannt. Ausgaben werden seitenweise und erst beim Iterieren formatiert.
+    Mit einem Eventmanager beantwortet sie Bereichsabfragen ("Events an diesem Tag / in diesem Monat")
+    über einen Zeitindex, der bei jeder Änderung im Eventmanager nachgeführt wird.
     """
 
-    def __init__(self, termin_liste:list):
+    def __init__(self, termin_liste:list, eventman: Eventman | None = None, region: str | None = None):
         """
         Initialisiert einen Kalender mit leeren Listen für Termine, Wecker und Feiertage.
+
+        :param termin_liste: Liste der Termine
+        :param eventman: Eventmanager, dessen Events für Bereichsabfragen indiziert werden (optional)
+        :param region: Kürzel des Bundeslands für gesetzliche Feiertage (siehe m_feiertage.REGIONEN), None für nur bundesweite
+        :raises ValueError: Bei unbekannter Region
         """
-        self.termine = termin_liste         # Liste von (Datumzeit, Name)-Tupeln
-        self.wecker_list = []     # Liste von Wecker-Objekten
-        self.feiertage = []       # Liste von Feiertagen (Datumzeit-Objekte oder Strings)
+        if region is not None and region not in m_feiertage.REGIONEN:
+            raise ValueError(f"Unbekannte Region '{region}'")
+        self.__termin_quelle = termin_liste  # wird erst beim ersten Zugriff auf termine sortiert übernommen
+        self.__termine: SortierteListe | None = None
+        self.wecker_list = SortierteListe(_wecker_schluessel)  # Wecker-Objekte, sortiert nach Zeit
+        self.weckerplaner = WeckerPlaner()  # löst die Wecker aus, in der App über einen gemeinsamen Clock-Callback geweckt
+        self.feiertage = []       # Liste eigener Feiertage (Datumzeit-Objekte, (Datumzeit, Name)-Tupel oder Strings)
+        self.region = region
+        self.__eigene_feiertage: dict[int, str] = {}  # Tagesordinalzahl → Name der eigenen Feiertage mit Datum
+        self.__feiertag_beobachter: list = []  # erhalten (Jahr, Monat) bei Änderungen der eigenen Feiertage, z.B. Monatsansicht.verwerfen
         self.kalender_array = []  # Monatsdarstellung (z.B. 2D-Array für Tage)
+        self.zeitindex = Zeitindex(eventman.event_liste if eventman is not None else ())
+        if eventman is not None:
+            eventman.beobachter_anmelden(self.zeitindex.aenderungen_anwenden)
+            if termin_liste is eventman.event_liste:  # Termine sind die Events: Änderungen im Eventmanager nachführen
+                eventman.beobachter_anmelden(self.__termine_nachfuehren)
+
+    @property
+    def termine(self) -> SortierteListe:
+        """
+        Termine sortiert nach Zeit. Die beim Erzeugen übergebene Liste wird beim ersten Zugriff einmal sortiert übernommen,
+        solange niemand auf Termine zugreift (z.B. in der GUI), kostet sie nichts.
+        Ist sie die Event-Liste des Eventmanagers, werden danach dessen Änderungen (Erstellen, Entfernen, Verschieben) nachgeführt.
+
+        :return: SortierteListe aus (Datumzeit, Name)-Tupeln oder Events
+        """
+        if self.__termine is None:
+            self.__termine = SortierteListe(_termin_schluessel, _termin_kennung, self.__termin_quelle)
+            self.__termin_quelle = None
+        return self.__termine
+
+    def __termine_nachfuehren(self, aenderungen: list) -> None:
+        """
+        Führt die Termine mit den Änderungen des Eventmanagers nach, passend für Eventman.beobachter_anmelden().
+        Verschobene Events werden über ihre ID mit dem alten Schlüssel entfernt und mit dem neuen einsortiert.
+        Solange termine noch nicht aufgebaut ist, gibt es nichts nachzuführen, der Aufbau liest die aktuelle Event-Liste.
+
+        :param aenderungen: Liste von (Art, Event)- bzw. (Speicher.ENTFERNT, Event-ID)-Tupeln
+        """
+        if self.__termine is None:
+            return
+        for art, wert in aenderungen:
+            if art == Speicher.ENTFERNT:
+                self.__termine.kennung_entfernen(wert)
+            else:
+                self.__termine.kennung_entfernen(wert.id)
+                self.__termine.einfuegen(wert)
 
     def create_termin(self, datumzeit: Datumzeit, name: str) -> None:
         """
-        Legt einen neuen Termin an.
-        Duplikate werden bei identischem Datum+Name nicht erneut hinzugefügt.
+        Legt einen neuen Termin an und sortiert ihn per Binärsuche ein.
+        Duplikate werden bei gleichem Zeitpunkt+Name nicht erneut hinzugefügt.
+        Die Datumzeit darf danach nicht mehr verändert werden, zum Verschieben entfernen und neu anlegen.
 
         :param datumzeit: Datum und Uhrzeit des Termins
         :param name: Bezeichnung des Termins
         """
-        eintrag = (datumzeit, name)
-        if eintrag not in self.termine:
-            self.termine.append(eintrag)
+        self.termine.einfuegen((datumzeit, name))
 
     def remove_termin(self, index: int) -> bool:
         """
-        Entfernt einen Termin nach Listenindex.
+        Entfernt einen Termin nach Position in der sortierten Reihenfolge (wie in termine_anzeigen()).
 
         :param index: Position in der Termine-Liste
         :return: True wenn entfernt, False bei fehlerhaftem Index
         """
         if 0 <= index < len(self.termine):
-            del self.termine[index]
+            self.termine.entfernen_an(index)
             return True
         return False
 
     def create_wecker(self, datumzeit: Datumzeit, eventman: Eventman) -> None:
         """
-        Erstellt einen neuen Wecker mit Eventbindung.
+        Erstellt einen neuen Wecker mit Eventbindung, sortiert ihn per Binärsuche ein und plant ihn im Weckerplaner ein.
+        Je Zeitpunkt gibt es nur einen Wecker.
 
         :param datumzeit: Zeitpunkt des Alarms
         :param eventman: Eventmanager zur Auslösung
         """
         wecker = Wecker(datumzeit, eventman)
-        if all(w.get_datumzeit() != datumzeit for w in self.wecker_list):
-            self.wecker_list.append(wecker)
+        if self.wecker_list.einfuegen(wecker):
+            self.weckerplaner.planen(wecker)
 
     def remove_wecker(self, index: int) -> bool:
         """
-        Entfernt einen Wecker nach Listenindex.
+        Entfernt einen Wecker nach Position in der sortierten Reihenfolge (wie in wecker_anzeigen()).
 
         :param index: Position in der Wecker-Liste
         :return: True bei Erfolg, False sonst
         """
         if 0 <= index < len(self.wecker_list):
-            del self.wecker_list[index]
+            self.weckerplaner.entfernen(self.wecker_list.entfernen_an(index))
             return True
         return False
 
+    def wecker_schlummern(self, wecker: Wecker, minuten: int, stunden: int = 0) -> bool:
+        """
+        Verschiebt einen Wecker per Schlummermodus, sortiert ihn neu ein und plant ihn neu, jeweils in O(log n).
+        Gibt es zur neuen Zeit schon einen Wecker, wird der verschobene verworfen.
+
+        :param wecker: Wecker aus wecker_list
+        :param minuten: Minuten bis zum erneuten Wecken
+        :param stunden: Stunden bis zum erneuten Wecken
+        :return: True wenn verschoben, False wenn der Wecker nicht im Kalender ist oder verworfen wurde
+        """
+        if not self.wecker_list.entfernen(wecker):
+            return False
+        wecker.schlummermodus(minuten, stunden)
+        if not self.wecker_list.einfuegen(wecker):
+            self.weckerplaner.entfernen(wecker)
+            return False
+        self.weckerplaner.planen(wecker)
+        return True
+
     def add_feiertag(self, feiertag: Union[Datumzeit, Tuple[Datumzeit, str], str]) -> None:
         """
-        Fügt einen Feiertag hinzu. 
+        Fügt einen eigenen Feiertag hinzu.
         Akzeptiert Datumzeit, Tupel(Datumzeit, Name) oder String.
-        Doppelte Einträge werden ignoriert.
+        Doppelte Einträge (gleicher Tag bzw. gleicher Name) werden ignoriert.
+        Ein reiner String hat kein Datum und wird von ist_feiertag() nicht berücksichtigt.
 
         :param feiertag: Datumzeit oder (Datumzeit, Name) oder Name
         """
-        if feiertag not in self.feiertage:
+        if isinstance(feiertag, str):
+            if feiertag not in self.feiertage:
+                self.feiertage.append(feiertag)
+            return
+        dz, name = feiertag if isinstance(feiertag, tuple) else (feiertag, "")
+        tag = km.ordinal(dz.jahr, dz.monat, dz.tag)
+        if tag not in self.__eigene_feiertage:
+            self.__eigene_feiertage[tag] = name
             self.feiertage.append(feiertag)
+            self.__feiertag_melden(dz)
 
     def remove_feiertag(self, index: int) -> bool:
         """
@@ -101,52 +220,120 @@ class Kalender:
         :return: True wenn entfernt, False bei ungültigem Index
         """
         if 0 <= index < len(self.feiertage):
-            del self.feiertage[index]
+            ft = self.feiertage.pop(index)
+            if not isinstance(ft, str):
+                dz = ft[0] if isinstance(ft, tuple) else ft
+                del self.__eigene_feiertage[km.ordinal(dz.jahr, dz.monat, dz.tag)]
+                self.__feiertag_melden(dz)
             return True
         return False
 
+    def feiertag_beobachter_anmelden(self, callback) -> None:
+        """
+        Meldet eine Funktion an, die nach jeder Änderung der eigenen Feiertage mit dem betroffenen Monat aufgerufen wird,
+        z.B. Monatsansicht.verwerfen, damit zwischengespeicherte Monatsraster die Feiertage neu lesen.
+
+        :param callback: Erhält (Jahr, Monat)
+        """
+        self.__feiertag_beobachter.append(callback)
+
+    def __feiertag_melden(self, dz: Datumzeit) -> None:
+        """Benachrichtigt die Feiertags-Beobachter über eine Änderung im Monat von dz."""
+        for callback in self.__feiertag_beobachter:
+            callback(dz.jahr, dz.monat)
+
     def ist_feiertag(self, datum: Datumzeit) -> bool:
         """
-        Prüft, ob ein Datum als Feiertag gespeichert ist.
+        Prüft, ob ein Datum ein gesetzlicher Feiertag der Region oder ein eigener Feiertag ist.
+        Verglichen wird nur der Tag, die Uhrzeit spielt keine Rolle.
 
         :param datum: zu prüfendes Datum
-        :return: True wenn ein passender Eintrag existiert
+        :return: True wenn das Datum ein Feiertag ist
         """
-        for ft in self.feiertage:
-            if isinstance(ft, Datumzeit) and ft == datum:
-                return True
-            if isinstance(ft, tuple) and ft[0] == datum:
-                return True
-        return False
+        tag = km.ordinal(datum.jahr, datum.monat, datum.tag)
+        return tag in self.__eigene_feiertage or tag in m_feiertage.feiertage(datum.jahr, self.region)
 
-    def termine_anzeigen(self) -> List[str]:
+    def feiertage_im_monat(self, monat: int, jahr: int) -> dict[int, str]:
         """
-        Gibt alle Termine sortiert (nach Datumzeit) aus.
+        Gibt die gesetzlichen und eigenen Feiertage eines Monats zurück, z.B. zum Einfärben des Monatsrasters.
 
+        :param monat: 1–12
+        :param jahr: z. B. 2025
+        :return: {Tag des Monats: Name}
+        """
+        gesetzlich = m_feiertage.feiertage_im_monat(jahr, monat, self.region)
+        if not self.__eigene_feiertage:
+            return dict(gesetzlich)
+        erster = km.ordinal(jahr, monat, 1)
+        ergebnis = dict(gesetzlich)
+        for tag in range(erster, erster + km.monatslaenge(jahr, monat)):
+            name = self.__eigene_feiertage.get(tag)
+            if name is not None:
+                ergebnis.setdefault(tag - erster + 1, name)
+        return ergebnis
+
+    def termine_seite(self, start: int = 0, anzahl: int | None = 50) -> Iterator[str]:
+        """
+        Liefert eine Seite der Termine, sortiert nach Zeit und erst beim Iterieren formatiert.
+
+        :param start: Position des ersten Termins
+        :param anzahl: Höchstzahl der Termine, None für alle ab start
+        :return: Generator formatierter Termin-Strings
+        """
+        return (_termin_text(termin) for termin in self.termine.seite(start, anzahl))
+
+    def termine_ab(self, datumzeit: Datumzeit, anzahl: int | None = 50) -> Iterator[str]:
+        """
+        Liefert die nächsten Termine ab einem Zeitpunkt (Agenda), der Anfang wird per Binärsuche gefunden.
+
+        :param datumzeit: frühester Zeitpunkt
+        :param anzahl: Höchstzahl der Termine, None für alle folgenden
+        :return: Generator formatierter Termin-Strings
+        """
+        return (_termin_text(termin) for termin in self.termine.ab(_zeit_schluessel(datumzeit), anzahl))
+
+    def termine_anzeigen(self, start: int = 0, anzahl: int | None = None) -> List[str]:
+        """
+        Gibt die Termine sortiert (nach Datumzeit) aus, ohne neu zu sortieren.
+
+        :param start: Position des ersten Termins
+        :param anzahl: Höchstzahl der Termine, None für alle
         :return: Formatierte Termin-Strings
         """
-        self.termine.sort(key=lambda x: (
-            x[0].jahr, x[0].monat, x[0].tag, x[0].stunde, x[0].minute
-        ))
-        ausgabe = [f"{str(dz)} – {name}" for dz, name in self.termine]
+        ausgabe = list(self.termine_seite(start, anzahl))
         for zeile in ausgabe:
             print(zeile)
         return ausgabe
 
-    def wecker_anzeigen(self) -> List[str]:
+    def wecker_seite(self, start: int = 0, anzahl: int | None = 50) -> Iterator[str]:
+        """
+        Liefert eine Seite der Wecker, sortiert nach Zeit und erst beim Iterieren formatiert.
+
+        :param start: Position des ersten Weckers
+        :param anzahl: Höchstzahl der Wecker, None für alle ab start
+        :return: Generator formatierter Wecker-Strings
         """
-        Gibt alle Wecker sortiert (nach Datumzeit) aus.
+        return (f"Wecker: {str(w.get_datumzeit())}" for w in self.wecker_list.seite(start, anzahl))
 
+    def wecker_ab(self, datumzeit: Datumzeit, anzahl: int | None = 50) -> Iterator[str]:
+        """
+        Liefert die nächsten Wecker ab einem Zeitpunkt, der Anfang wird per Binärsuche gefunden.
+
+        :param datumzeit: frühester Zeitpunkt
+        :param anzahl: Höchstzahl der Wecker, None für alle folgenden
+        :return: Generator formatierter Wecker-Strings
+        """
+        return (f"Wecker: {str(w.get_datumzeit())}" for w in self.wecker_list.ab(_zeit_schluessel(datumzeit), anzahl))
+
+    def wecker_anzeigen(self, start: int = 0, anzahl: int | None = None) -> List[str]:
+        """
+        Gibt die Wecker sortiert (nach Datumzeit) aus, ohne neu zu sortieren.
+
+        :param start: Position des ersten Weckers
+        :param anzahl: Höchstzahl der Wecker, None für alle
         :return: Formatierte Wecker-Strings
         """
-        self.wecker_list.sort(key=lambda w: (
-            w.get_datumzeit().jahr,
-            w.get_datumzeit().monat,
-            w.get_datumzeit().tag,
-            w.get_datumzeit().stunde,
-            w.get_datumzeit().minute
-        ))
-        ausgabe = [f"Wecker: {str(w.get_datumzeit())}" for w in self.wecker_list]
+        ausgabe = list(self.wecker_seite(start, anzahl))
         for zeile in ausgabe:
             print(zeile)
         return ausgabe
@@ -185,23 +372,56 @@ class Kalender:
         :param jahr: ganzzahliges Jahr
         :return: Liste der Tageszahlen (1…letzter Tag)
         """
-        tage = calendar.monthrange(jahr, monat)[1]
-        return list(range(1, tage + 1))
+        return list(range(1, km.monatslaenge(jahr, monat) + 1))
 
-    def clear_all(self) -> None:
+    def events_im_bereich(
+            self,
+            start: Union[Datumzeit, Zeitpunkt],
+            ende: Union[Datumzeit, Zeitpunkt]) -> List[Tuple[Zeitpunkt, Event]]:
         """
-        Entfernt alle Termine, Wecker und Feiertage.
+        Gibt alle Vorkommen von Events im Bereich [start, ende[ nach Zeit sortiert zurück.
+        Wiederholte Events erscheinen mit jedem Vorkommen im Bereich.
+        Kostet O(log n + k) über den Zeitindex statt eines Durchlaufs über alle Events.
+
+        :param start: Beginn des Bereichs
+        :param ende: Ende des Bereichs (exklusiv)
+        :return: Liste von (Zeitpunkt, Event)-Tupeln
         """
-        for event in self.termine:
-            print(f"{event.zeit[0]}-{event.zeit[1]}-{event.zeit[2]} {event.zeit[3]}:{event.zeit[4]} - {event.name}")
+        von = start if isinstance(start, Zeitpunkt) else start.zeitpunkt()
+        bis = ende if isinstance(ende, Zeitpunkt) else ende.zeitpunkt()
+        return list(self.zeitindex.vorkommen_im_bereich(von, bis))
 
-    def wecker_anzeigen(self):
+    def events_nach_tag(self, monat: int, jahr: int) -> List[List[Tuple[Zeitpunkt, Event]]]:
+        """
+        Verteilt die Vorkommen eines Monats auf seine Tage, z.B. für das Monatsraster.
+        Der ganze Monat wird mit einer einzigen Bereichsabfrage gelesen.
+
+        :param monat: 1–12
+        :param jahr: z. B. 2025
+        :return: Liste mit einer Liste von (Zeitpunkt, Event)-Tupeln je Tag, Index 0 = 1. des Monats
+        """
+        erster = km.ordinal(jahr, monat, 1)
+        folge_jahr, folge_monat = km.monat_plus(jahr, monat, 1)
+        tage: List[List[Tuple[Zeitpunkt, Event]]] = [[] for _ in range(km.monatslaenge(jahr, monat))]
+        for zeitpunkt, ev in self.zeitindex.vorkommen_im_bereich(
+                Zeitpunkt.aus_datum(jahr, monat, 1), Zeitpunkt.aus_datum(folge_jahr, folge_monat, 1)):
+            tage[zeitpunkt.sekunden // km.SEKUNDEN_PRO_TAG + 1 - erster].append((zeitpunkt, ev))
+        return tage
+
+    def clear_all(self) -> None:
         """
-        Gibt alle Wecker im Kalender aus.
+        Entfernt alle Termine, Wecker und eigenen Feiertage.
         """
+        self.termine.leeren()
         for wecker in self.wecker_list:
-            dz = wecker.get_datumzeit()
-            print(f"Wecker: {dz.jahr}-{dz.monat:02}-{dz.tag:02} {dz.stunde:02}:{dz.minute:02}")
+            self.weckerplaner.entfernen(wecker)
+        self.wecker_list.leeren()
+        self.feiertage.clear()
+        tage = list(self.__eigene_feiertage)
+        self.__eigene_feiertage.clear()
+        for jahr, monat in {km.aus_ordinal(tag)[:2] for tag in tage}:
+            for callback in self.__feiertag_beobachter:
+                callback(jahr, monat)
 
 if __name__ == "__main__":
     # Kleiner Funktionstest
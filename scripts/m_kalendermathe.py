@@ -0,0 +1,170 @@
+"""
+Modul: m_kalendermathe
+
+Zentrale Kalenderarithmetik auf Basis proleptischer Tagesordinalzahlen (0001-01-01 = Tag 1).
+Alle Funktionen arbeiten mit Ganzzahlen und kosten O(1), es gibt keine Schleifen über Tage oder Monate.
+Monatslängen und kumulierte Tage liegen als Tabellen für Gemein- und Schaltjahre vor.
+Wochentage werden aus dem Wochentag des 1. Januar und den kumulierten Tagen berechnet, Jahresanfang und
+Monatsaufbau eines Jahres werden je Jahr einmal berechnet und gespeichert.
+
+"""
+
+from bisect import bisect_right
+
+SEKUNDEN_PRO_TAG = 86400
+
+# Monatslängen, Index 1–12, für Gemeinjahre [0] und Schaltjahre [1]
+_MONATSLAENGEN = (
+    (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31),
+    (0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31),
+)
+# Tage vor dem Monatsersten, Index 0–11 für Januar–Dezember, Index 12 = Jahreslänge
+_KUMULIERT = tuple(
+    tuple(sum(laengen[1:monat]) for monat in range(1, 14))
+    for laengen in _MONATSLAENGEN
+)
+_TAGE_400_JAHRE = 146097
+_TAGE_100_JAHRE = 36524
+_TAGE_4_JAHRE = 1461
+WOCHENTAG_NAMEN = ("Montag", "Dienstag", "Mittwoch", "Donnerstag", "Freitag", "Samstag", "Sonntag")
+
+_JAHRESANFANG: dict[int, int] = {}  # Jahr → Tagesordinalzahl des 1. Januar
+_JAHRESAUFBAU: dict[int, tuple[tuple[int, int], ...]] = {}  # Jahr → (Wochentag des Monatsersten, Monatslänge) je Monat
+
+
+def ist_schaltjahr(jahr:int) -> bool:
+    """Prüft, ob ein Jahr ein Schaltjahr ist (gregorianisch)."""
+    return jahr % 4 == 0 and (jahr % 100 != 0 or jahr % 400 == 0)
+
+
+def monatslaenge(jahr:int, monat:int) -> int:
+    """Gibt die Anzahl der Tage eines Monats zurück.
+    :param jahr: Jahr
+    :param monat: Monat 1–12
+    :return: 28–31
+    """
+    return _MONATSLAENGEN[ist_schaltjahr(jahr)][monat]
+
+
+def ordinal(jahr:int, monat:int, tag:int) -> int:
+    """Wandelt ein Datum in die proleptische Tagesordinalzahl um (0001-01-01 = 1).
+    :raises ValueError: bei ungültigem Datum
+    """
+    if not 1 <= monat <= 12:
+        raise ValueError(f"Monat {monat} außerhalb des Geltungsbereichs [1,12]")
+    schalt = ist_schaltjahr(jahr)
+    if not 1 <= tag <= _MONATSLAENGEN[schalt][monat]:
+        raise ValueError(f"Tag {tag} außerhalb des Geltungsbereichs für {monat:02d}.{jahr}")
+    vorjahr = jahr - 1
+    return vorjahr * 365 + vorjahr // 4 - vorjahr // 100 + vorjahr // 400 + _KUMULIERT[schalt][monat - 1] + tag
+
+
+def aus_ordinal(tage:int) -> tuple[int, int, int]:
+    """Wandelt eine Tagesordinalzahl zurück in (Jahr, Monat, Tag).
+    Das Jahr wird über 400-, 100-, 4- und 1-Jahres-Zyklen bestimmt, der Monat per Binärsuche in der Tabelle.
+    """
+    tage -= 1
+    n400, tage = divmod(tage, _TAGE_400_JAHRE)
+    n100, tage = divmod(tage, _TAGE_100_JAHRE)
+    n4, tage = divmod(tage, _TAGE_4_JAHRE)
+    n1, tage = divmod(tage, 365)
+    jahr = n400 * 400 + n100 * 100 + n4 * 4 + n1 + 1
+    if n1 == 4 or n100 == 4:  # letzter Tag eines Schaltjahres am Zyklusende
+        return jahr - 1, 12, 31
+    kumuliert = _KUMULIERT[ist_schaltjahr(jahr)]
+    monat = bisect_right(kumuliert, tage)
+    return jahr, monat, tage - kumuliert[monat - 1] + 1
+
+
+def monat_plus(jahr:int, monat:int, anzahl:int) -> tuple[int, int]:
+    """Verschiebt (Jahr, Monat) um anzahl Monate, auch negativ.
+    :return: (Jahr, Monat)
+    """
+    jahre, monat_index = divmod(monat - 1 + anzahl, 12)
+    return jahr + jahre, monat_index + 1
+
+
+def plus_tage(sekunden:int, anzahl:int) -> int:
+    """Verschiebt einen Zeitpunkt (Sekunden seit 0001-01-01) um anzahl Tage."""
+    return sekunden + anzahl * SEKUNDEN_PRO_TAG
+
+
+def plus_sekunden(sekunden:int, anzahl:int) -> int:
+    """Verschiebt einen Zeitpunkt (Sekunden seit 0001-01-01) um anzahl Sekunden."""
+    return sekunden + anzahl
+
+
+def plus_monate(sekunden:int, anzahl:int, monatstag:int | None = None) -> int:
+    """Verschiebt einen Zeitpunkt (Sekunden seit 0001-01-01) um anzahl Monate.
+    Existiert der Tag im Zielmonat nicht, wird auf das Monatsende begrenzt (31.01. + 1 Monat = 28./29.02.).
+    :param monatstag: Gewünschter Tag im Zielmonat, Standard ist der Tag des Ausgangszeitpunkts.
+    """
+    tage, uhrzeit = divmod(sekunden, SEKUNDEN_PRO_TAG)
+    jahr, monat, tag = aus_ordinal(tage + 1)
+    jahr, monat = monat_plus(jahr, monat, anzahl)
+    tag = min(monatstag if monatstag is not None else tag, monatslaenge(jahr, monat))
+    return (ordinal(jahr, monat, tag) - 1) * SEKUNDEN_PRO_TAG + uhrzeit
+
+
+def differenz(sekunden_a:int, sekunden_b:int) -> int:
+    """Gibt den Abstand a - b in Sekunden zurück."""
+    return sekunden_a - sekunden_b
+
+
+def monatsdifferenz(jahr_a:int, monat_a:int, jahr_b:int, monat_b:int) -> int:
+    """Gibt die Anzahl der Monate von (jahr_b, monat_b) bis (jahr_a, monat_a) zurück."""
+    return (jahr_a - jahr_b) * 12 + monat_a - monat_b
+
+
+def wochentag_aus_ordinal(tage:int) -> int:
+    """Gibt den Wochentag einer Tagesordinalzahl zurück (0 = Montag … 6 = Sonntag), 0001-01-01 war ein Montag."""
+    return (tage - 1) % 7
+
+
+def jahresanfang(jahr:int) -> int:
+    """Gibt die Tagesordinalzahl des 1. Januar zurück, je Jahr nur einmal berechnet."""
+    tage = _JAHRESANFANG.get(jahr)
+    if tage is None:
+        vorjahr = jahr - 1
+        tage = _JAHRESANFANG[jahr] = vorjahr * 365 + vorjahr // 4 - vorjahr // 100 + vorjahr // 400 + 1
+    return tage
+
+
+def wochentag(jahr:int, monat:int, tag:int) -> int:
+    """Gibt den Wochentag eines Datums zurück (0 = Montag … 6 = Sonntag), über Jahresanfang und Monatstabelle.
+    Das Datum wird nicht geprüft, dafür ordinal() verwenden.
+    """
+    return (jahresanfang(jahr) + _KUMULIERT[ist_schaltjahr(jahr)][monat - 1] + tag - 2) % 7
+
+
+def jahresaufbau(jahr:int) -> tuple[tuple[int, int], ...]:
+    """Berechnet den Aufbau aller Monate eines Jahres in einem Durchlauf über die Monatstabellen, je Jahr nur einmal.
+    :param jahr: Jahr
+    :return: (Wochentag des Monatsersten 0 = Montag … 6 = Sonntag, Monatslänge) je Monat, Index 0 = Januar.
+    """
+    aufbau = _JAHRESAUFBAU.get(jahr)
+    if aufbau is None:
+        schalt = ist_schaltjahr(jahr)
+        neujahr = wochentag_aus_ordinal(jahresanfang(jahr))
+        aufbau = _JAHRESAUFBAU[jahr] = tuple(
+            ((neujahr + vorher) % 7, laenge) for vorher, laenge in zip(_KUMULIERT[schalt], _MONATSLAENGEN[schalt][1:]))
+    return aufbau
+
+
+def erster_wochentag(jahr:int, monat:int) -> int:
+    """Gibt den Wochentag des Monatsersten zurück (0 = Montag … 6 = Sonntag), z.B. als Versatz im Monatsraster."""
+    return jahresaufbau(jahr)[monat - 1][0]
+
+
+def iso_woche(jahr:int, monat:int, tag:int) -> tuple[int, int]:
+    """Gibt die Kalenderwoche nach ISO 8601 zurück. Woche 1 ist die Woche mit dem ersten Donnerstag des Jahres.
+    :return: (ISO-Jahr, Woche 1–53), das ISO-Jahr weicht um den Jahreswechsel vom Kalenderjahr ab.
+    """
+    tage = jahresanfang(jahr) + _KUMULIERT[ist_schaltjahr(jahr)][monat - 1] + tag - 1
+    donnerstag = tage - wochentag_aus_ordinal(tage) + 3
+    iso_jahr = jahr
+    if donnerstag < jahresanfang(jahr):
+        iso_jahr -= 1
+    elif donnerstag >= jahresanfang(jahr + 1):
+        iso_jahr += 1
+    return iso_jahr, (donnerstag - jahresanfang(iso_jahr)) // 7 + 1
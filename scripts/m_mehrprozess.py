@@ -0,0 +1,194 @@
+"""
+Modul: m_mehrprozess
+
+Hilfen, damit mehrere Calendrum-Prozesse (z.B. GUI und ein Import über die Kommandozeile) dieselben Dateien benutzen können.
+Dateisperre ist eine beratende Sperre über fcntl.flock auf einer eigenen .lock-Datei, exklusiv zum Schreiben, geteilt zum Lesen.
+Stand ist eine kleine Datei mit Generationszähler und nächster freier Event-ID. Jeder Schreibvorgang erhöht die Generation,
+über die Änderungszeit der Datei erkennt ein Prozess ohne Sperre und ohne Lesen, ob sich seit seinem letzten Blick etwas geändert hat.
+Ohne fcntl (Windows) sperrt die Dateisperre nur zwischen den Threads eines Prozesses.
+
+"""
+
+from contextlib import contextmanager
+from threading import Lock
+import os
+
+try:
+    import fcntl
+except ImportError:  # fcntl gibt es nur auf POSIX-Systemen
+    fcntl = None
+
+FCNTL_VERFUEGBAR: bool = fcntl is not None
+
+
+def datei_kennung(pfad:str) -> tuple[int, int] | None:
+    """Gibt Gerät und Inode einer Datei zurück, um ein Ersetzen der Datei (z.B. Rotieren des Journals) zu erkennen.
+    :param pfad: Pfad zur Datei.
+    :return: (st_dev, st_ino), oder None wenn die Datei nicht existiert.
+    """
+    try:
+        info = os.stat(pfad)
+    except FileNotFoundError:
+        return None
+    return info.st_dev, info.st_ino
+
+
+class Dateisperre:
+    """Beratende Sperre über eine Sperrdatei, gilt zwischen Prozessen (fcntl.flock) und zwischen Threads eines Prozesses.
+    Die Sperre ist nicht wiedereintrittsfähig. Sie darf in einem anderen Thread freigegeben werden als gesperrt wurde.
+
+        with sperre:              # exklusiv, zum Schreiben
+            ...
+        with sperre.geteilt():    # geteilt, zum Lesen
+            ...
+
+    ————————————Attribute: ————————————
+        pfad (str): Pfad zur Sperrdatei, wird bei Bedarf angelegt und nie gelöscht.
+    ————————————Methoden: ————————————
+        sperren(geteilt: bool, warten: bool) → bool: Sperrt, ohne warten nur wenn die Sperre frei ist.
+        freigeben() → None: Gibt die Sperre frei.
+        geteilt() → ContextManager: Geteilte Sperre für die Dauer eines with-Blocks.
+        schliessen() → None: Schließt die Sperrdatei.
+    """
+
+    def __init__(self, pfad:str) -> None:
+        """
+        :param pfad: Pfad zur Sperrdatei.
+        """
+        self.pfad = pfad
+        self.__thread_sperre = Lock()
+        self.__datei = None
+
+    def sperren(self, geteilt:bool = False, warten:bool = True) -> bool:
+        """Sperrt zuerst innerhalb des Prozesses, dann über die Sperrdatei für andere Prozesse.
+        :param geteilt: Bei True geteilte Sperre, mehrere Prozesse dürfen gleichzeitig lesen.
+        :param warten: Bei False wird nicht gewartet, wenn ein anderer Thread oder Prozess die Sperre hält.
+        :return: True, wenn gesperrt wurde.
+        """
+        if not self.__thread_sperre.acquire(warten):
+            return False
+        if fcntl is None:
+            return True
+        try:
+            if self.__datei is None:
+                self.__datei = open(self.pfad, 'a')
+            art = fcntl.LOCK_SH if geteilt else fcntl.LOCK_EX
+            fcntl.flock(self.__datei.fileno(), art if warten else art | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self.__thread_sperre.release()
+            return False
+        except BaseException:
+            self.__thread_sperre.release()
+            raise
+        return True
+
+    def freigeben(self) -> None:
+        """Gibt die Sperre frei."""
+        if self.__datei is not None:
+            fcntl.flock(self.__datei.fileno(), fcntl.LOCK_UN)
+        self.__thread_sperre.release()
+
+    def __enter__(self):
+        self.sperren()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.freigeben()
+
+    @contextmanager
+    def geteilt(self):
+        """Hält eine geteilte Sperre für die Dauer eines with-Blocks."""
+        self.sperren(geteilt=True)
+        try:
+            yield self
+        finally:
+            self.freigeben()
+
+    def schliessen(self) -> None:
+        """Schließt die Sperrdatei. Eine spätere Sperre öffnet sie neu."""
+        with self.__thread_sperre:
+            if self.__datei is not None:
+                self.__datei.close()
+                self.__datei = None
+
+
+class Stand:
+    """Generationszähler und nächste freie Event-ID in einer Datei "<generation> <naechste_id>".
+    Gelesen und geschrieben wird nur unter der Dateisperre des Speichers. geaendert() braucht keine Sperre,
+    es vergleicht nur Änderungszeit und Größe der Datei mit dem zuletzt gelesenen oder geschriebenen Stand.
+    Die Datei bleibt geöffnet und wird über den Dateideskriptor gelesen und überschrieben, ohne bei jedem Zugriff neu zu öffnen.
+    ————————————Attribute: ————————————
+        pfad (str): Pfad zur Stand-Datei.
+        generation (int): Zuletzt gelesene oder geschriebene Generation.
+        naechste_id (int): Zuletzt gelesene oder geschriebene nächste freie Event-ID.
+    ————————————Methoden: ————————————
+        geaendert() → bool: Prüft mit einem stat(), ob die Datei seit dem letzten Lesen oder Schreiben verändert wurde.
+        lesen() → tuple[int, int]: Liest (generation, naechste_id).
+        schreiben(generation: int, naechste_id: int) → None: Schreibt einen neuen Stand.
+        schliessen() → None: Schließt die Datei.
+    """
+
+    def __init__(self, pfad:str) -> None:
+        """
+        :param pfad: Pfad zur Stand-Datei.
+        """
+        self.pfad = pfad
+        self.generation = 0
+        self.naechste_id = 1
+        self.__gesehen: tuple | None = None  # Änderungszeit und Größe beim letzten Lesen oder Schreiben
+        self.__gelesen = False
+        self.__fd: int | None = None
+
+    def __datei(self) -> int:
+        """Öffnet die Datei beim ersten Zugriff und legt sie dabei an."""
+        if self.__fd is None:
+            self.__fd = os.open(self.pfad, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+        return self.__fd
+
+    def __merkmal(self) -> tuple | None:
+        """Gibt Änderungszeit und Größe der Datei zurück, None wenn sie nicht existiert."""
+        try:
+            info = os.stat(self.pfad)
+        except FileNotFoundError:
+            return None
+        return info.st_mtime_ns, info.st_size
+
+    def geaendert(self) -> bool:
+        """Prüft, ob die Datei seit dem letzten lesen() oder schreiben() dieses Objekts verändert wurde.
+        :return: True bei Änderung oder wenn noch nie gelesen wurde.
+        """
+        return not self.__gelesen or self.__merkmal() != self.__gesehen
+
+    def lesen(self) -> tuple[int, int]:
+        """Liest den Stand. Eine leere oder unlesbare Datei gilt als Generation 0.
+        :return: (generation, naechste_id)
+        """
+        fd = self.__datei()
+        info = os.fstat(fd)
+        self.__gesehen, self.__gelesen = (info.st_mtime_ns, info.st_size), True
+        os.lseek(fd, 0, os.SEEK_SET)
+        try:
+            self.generation, self.naechste_id = map(int, os.read(fd, 64).split())
+        except ValueError:
+            self.generation, self.naechste_id = 0, 1
+        return self.generation, self.naechste_id
+
+    def schreiben(self, generation:int, naechste_id:int) -> None:
+        """Schreibt den Stand.
+        :param generation: Neue Generation.
+        :param naechste_id: Nächste freie Event-ID über alle Prozesse.
+        """
+        fd = self.__datei()
+        daten = f"{generation} {naechste_id}\n".encode()
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.write(fd, daten)
+        os.ftruncate(fd, len(daten))
+        info = os.fstat(fd)
+        self.generation, self.naechste_id = generation, naechste_id
+        self.__gesehen, self.__gelesen = (info.st_mtime_ns, info.st_size), True
+
+    def schliessen(self) -> None:
+        """Schließt die Datei. Ein späterer Zugriff öffnet sie neu."""
+        if self.__fd is not None:
+            os.close(self.__fd)
+            self.__fd = None
@@ -0,0 +1,228 @@
+"""
+Modul: m_messung
+
+Leichtgewichtige Messpunkte für die heißen Pfade (Zähler und Latenz-Histogramme) und Profiling-Fenster mit cProfile.
+Die Messung ist zur Laufzeit schaltbar. Ausgeschaltet kostet ein Messpunkt nur die Abfrage eines Flags.
+Unabhängig von Kivy, die App zeigt die Werte optional als Overlay an.
+
+Umgebungsvariablen:
+    CALENDRUM_MESSUNG=1          Messung beim Import einschalten
+    CALENDRUM_PROFIL=<sekunden>  Beim Start der App ein Profiling-Fenster dieser Länge aufnehmen
+
+    from scripts import m_messung as messung
+
+    @messung.gemessen("eventman.event_trigger")
+    def event_trigger(self, *args): ...
+
+    messung.einschalten()
+    print(messung.bericht())
+
+"""
+
+from functools import wraps
+from time import perf_counter
+import cProfile
+import io
+import os
+import pstats
+
+PROFIL_VARIABLE = "CALENDRUM_PROFIL"
+MESSUNG_VARIABLE = "CALENDRUM_MESSUNG"
+_aktiv: bool = os.environ.get(MESSUNG_VARIABLE, "") not in ("", "0")
+_zaehler: dict[str, int] = {}
+_histogramme: dict[str, "Histogramm"] = {}
+_profil: cProfile.Profile | None = None
+
+
+class Histogramm:
+    """Latenz-Histogramm mit Zweierpotenz-Klassen in Mikrosekunden (<1 µs, <2 µs, <4 µs, …).
+    Einfügen kostet O(1), Quantile werden aus den Klassen geschätzt (Obergrenze der Klasse).
+    ————————————Attribute: ————————————
+        anzahl (int): Anzahl der Messwerte.
+        summe (float): Summe der Messwerte in Sekunden.
+        minimum (float): Kleinster Messwert in Sekunden.
+        maximum (float): Größter Messwert in Sekunden.
+        klassen (list[int]): Anzahl je Klasse, Klasse i umfasst [2^(i-1), 2^i[ µs.
+    ————————————Methoden: ————————————
+        hinzufuegen(sekunden: float) → None: Nimmt einen Messwert auf.
+        quantil(q: float) → float: Geschätztes Quantil in Sekunden.
+        als_dict() → dict: Kennzahlen für die Ausgabe.
+    """
+    __slots__ = ("anzahl", "summe", "minimum", "maximum", "klassen")
+    KLASSEN = 40  # bis ca. 6 Tage, größere Werte landen in der letzten Klasse
+
+    def __init__(self) -> None:
+        self.anzahl = 0
+        self.summe = 0.0
+        self.minimum = float("inf")
+        self.maximum = 0.0
+        self.klassen = [0] * self.KLASSEN
+
+    def hinzufuegen(self, sekunden:float) -> None:
+        """Nimmt einen Messwert auf.
+        :param sekunden: Dauer in Sekunden.
+        """
+        self.anzahl += 1
+        self.summe += sekunden
+        if sekunden < self.minimum:
+            self.minimum = sekunden
+        if sekunden > self.maximum:
+            self.maximum = sekunden
+        self.klassen[min(int(sekunden * 1e6).bit_length(), self.KLASSEN - 1)] += 1
+
+    def quantil(self, q:float) -> float:
+        """Schätzt ein Quantil über die Obergrenze der Klasse, in die es fällt.
+        :param q: Quantil zwischen 0 und 1, z.B. 0.95.
+        :return: Dauer in Sekunden, 0 ohne Messwerte.
+        """
+        if not self.anzahl:
+            return 0.0
+        grenze = q * self.anzahl
+        summe = 0
+        for klasse, anzahl in enumerate(self.klassen):
+            summe += anzahl
+            if summe >= grenze:
+                return min((1 << klasse) / 1e6, self.maximum)
+        return self.maximum
+
+    def als_dict(self) -> dict:
+        """Gibt die Kennzahlen zurück, Zeiten in Sekunden."""
+        return {
+            "anzahl": self.anzahl,
+            "mittel": self.summe / self.anzahl if self.anzahl else 0.0,
+            "min": self.minimum if self.anzahl else 0.0,
+            "max": self.maximum,
+            "p50": self.quantil(0.5),
+            "p95": self.quantil(0.95),
+            "p99": self.quantil(0.99),
+        }
+
+
+def aktiv() -> bool:
+    """Gibt zurück, ob die Messung eingeschaltet ist."""
+    return _aktiv
+
+
+def einschalten() -> None:
+    """Schaltet die Messung ein."""
+    global _aktiv
+    _aktiv = True
+
+
+def ausschalten() -> None:
+    """Schaltet die Messung aus, bisherige Werte bleiben erhalten."""
+    global _aktiv
+    _aktiv = False
+
+
+def zaehlen(name:str, anzahl:int = 1) -> None:
+    """Erhöht einen Zähler, ausgeschaltet passiert nichts.
+    :param name: Name des Zählers, z.B. "eventman.ausgeloest".
+    :param anzahl: Betrag der Erhöhung.
+    """
+    if _aktiv:
+        _zaehler[name] = _zaehler.get(name, 0) + anzahl
+
+
+def dauer_eintragen(name:str, sekunden:float) -> None:
+    """Trägt eine gemessene Dauer in das Histogramm eines Messpunkts ein.
+    :param name: Name des Messpunkts.
+    :param sekunden: Dauer in Sekunden.
+    """
+    histogramm = _histogramme.get(name)
+    if histogramm is None:
+        histogramm = _histogramme[name] = Histogramm()
+    histogramm.hinzufuegen(sekunden)
+
+
+def gemessen(name:str):
+    """Decorator: misst Aufrufe und Dauer einer Funktion, wenn die Messung eingeschaltet ist.
+    :param name: Name des Messpunkts, z.B. "eventman.event_trigger".
+    """
+    def dekorieren(funktion):
+        @wraps(funktion)
+        def messpunkt(*args, **kwargs):
+            if not _aktiv:
+                return funktion(*args, **kwargs)
+            start = perf_counter()
+            try:
+                return funktion(*args, **kwargs)
+            finally:
+                dauer_eintragen(name, perf_counter() - start)
+        return messpunkt
+    return dekorieren
+
+
+def statistik() -> dict:
+    """Gibt alle Zähler und Histogramme zurück.
+    :return: {"zaehler": {name: int}, "latenzen": {name: Kennzahlen in Sekunden}}
+    """
+    return {
+        "zaehler": dict(_zaehler),
+        "latenzen": {name: histogramm.als_dict() for name, histogramm in _histogramme.items()},
+    }
+
+
+def zuruecksetzen() -> None:
+    """Löscht alle Zähler und Histogramme."""
+    _zaehler.clear()
+    _histogramme.clear()
+
+
+def bericht() -> str:
+    """Gibt die Messwerte als lesbare Tabelle zurück, z.B. für das Overlay."""
+    zeilen = [f"{'Messpunkt':<28} {'n':>7} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}"]
+    for name, histogramm in sorted(_histogramme.items()):
+        werte = histogramm.als_dict()
+        zeilen.append(f"{name:<28} {werte['anzahl']:>7} {werte['p50'] * 1000:>8.2f} "
+                      f"{werte['p95'] * 1000:>8.2f} {werte['max'] * 1000:>8.2f}")
+    for name, anzahl in sorted(_zaehler.items()):
+        zeilen.append(f"{name:<28} {anzahl:>7}")
+    return "\n".join(zeilen)
+
+
+def profil_laeuft() -> bool:
+    """Gibt zurück, ob gerade ein Profiling-Fenster aufgenommen wird."""
+    return _profil is not None
+
+
+def profil_starten() -> None:
+    """Startet ein Profiling-Fenster mit cProfile im aufrufenden Thread.
+    :raises RuntimeError: Wenn bereits ein Profiling-Fenster läuft.
+    """
+    global _profil
+    if _profil is not None:
+        raise RuntimeError("Es läuft bereits ein Profiling-Fenster.")
+    _profil = cProfile.Profile()
+    _profil.enable()
+
+
+def profil_beenden(pfad:str | None = None, zeilen:int = 30) -> str:
+    """Beendet das Profiling-Fenster.
+    :param pfad: Optionaler Pfad, unter dem die Rohdaten für pstats/snakeviz gespeichert werden.
+    :param zeilen: Anzahl der Funktionen in der Zusammenfassung.
+    :return: Zusammenfassung nach kumulierter Zeit sortiert.
+    :raises RuntimeError: Wenn kein Profiling-Fenster läuft.
+    """
+    global _profil
+    if _profil is None:
+        raise RuntimeError("Es läuft kein Profiling-Fenster.")
+    profil, _profil = _profil, None
+    profil.disable()
+    if pfad is not None:
+        profil.dump_stats(pfad)
+    ausgabe = io.StringIO()
+    pstats.Stats(profil, stream=ausgabe).sort_stats("cumulative").print_stats(zeilen)
+    return ausgabe.getvalue()
+
+
+def profil_dauer_aus_umgebung() -> float | None:
+    """Liest die Länge eines beim Start gewünschten Profiling-Fensters aus CALENDRUM_PROFIL.
+    :return: Sekunden oder None, wenn die Variable fehlt oder ungültig ist.
+    """
+    wert = os.environ.get(PROFIL_VARIABLE)
+    try:
+        return float(wert) if wert else None
+    except ValueError:
+        print(f"{PROFIL_VARIABLE}='{wert}' ist keine Zahl, Profiling wird nicht gestartet.")
+        return None
@@ -0,0 +1,172 @@
+"""
+Modul: m_monatsansicht
+
+Zwischenspeicher für die Monatsansicht, unabhängig von Kivy.
+Je (Jahr, Monat) werden Aufbau des Rasters (Versatz des Monatsersten, Anzahl der Tage),
+die Termine je Tag, die daraus berechneten Farbbalken und die Feiertage einmal berechnet und wiederverwendet.
+Der Speicher hält die zuletzt benutzten Monate (LRU) und verwirft bei Änderungen im Eventmanager
+oder an den eigenen Feiertagen des Kalenders nur die betroffenen Monate.
+
+"""
+
+from collections import OrderedDict
+from scripts.m_kalender import Kalender
+from scripts.m_speicher import Speicher
+from scripts import m_kalendermathe as km
+
+AKTION_FARBEN = {  # Farbe der Termin-Balken je Event-Aktion
+    "klingeln": [0.3, 0.6, 0.9, 1],
+    "email": [0.4, 0.8, 0.4, 1],
+    "sms": [0.9, 0.8, 0.3, 1],
+    "anruf": [0.9, 0.5, 0.2, 1],
+    "alarm": [0.9, 0.2, 0.2, 1],
+    "test": [0.6, 0.6, 0.6, 1],
+}
+STANDARD_FARBE = [0.3, 0.6, 0.9, 1]  # für Aktionen ohne eigene Farbe
+TERMIN_HOEHE = 2 / 24  # Anteil der Feldhöhe je Termin, Events haben keine Dauer
+
+
+def termin_balken(termine:list) -> list[list]:
+    """Wandelt die Termine eines Tages in Farbbalken [[h_r, color], ...] um.
+    Passen nicht alle in das Feld, werden die ersten gezeigt.
+    :param termine: Liste von (Zeitpunkt, Event)-Tupeln, nach Zeit sortiert.
+    :return: Liste von [Höhenanteil, RGBA-Farbe]-Paaren.
+    """
+    balken = []
+    rest = 1
+    for _, ev in termine:
+        hoehe = min(TERMIN_HOEHE, rest)
+        rest -= hoehe
+        balken.append([hoehe, AKTION_FARBEN.get(ev.akt, STANDARD_FARBE)])
+        if rest <= 0:
+            break
+    return balken
+
+
+class Monatsraster:
+    """Berechneter Inhalt eines Monats für das Monatsraster.
+    ————————————Attribute: ————————————
+        jahr (int): Jahr
+        monat (int): Monat 1–12
+        versatz (int): Leerfelder vor dem Monatsersten (0 = Montag … 6 = Sonntag).
+        termine (list[list[tuple]]): (Zeitpunkt, Event)-Tupel je Tag, Index 0 = 1. des Monats.
+        belegung (list[int]): Anzahl der Termine je Tag.
+        balken (list[list[list]]): Farbbalken je Tag, siehe termin_balken().
+        event_ids (set[int]): IDs aller Events, die in diesem Monat vorkommen.
+        feiertage (dict[int, str]): Feiertage des Monats, Tag → Name.
+    """
+    __slots__ = ("jahr", "monat", "versatz", "termine", "belegung", "balken", "event_ids", "feiertage")
+
+    def __init__(self, jahr:int, monat:int, termine:list[list[tuple]], feiertage:dict[int, str] | None = None) -> None:
+        self.jahr = jahr
+        self.monat = monat
+        self.versatz = km.erster_wochentag(jahr, monat)
+        self.termine = termine
+        self.belegung = [len(tag) for tag in termine]
+        self.balken = [termin_balken(tag) for tag in termine]
+        self.event_ids = {ev.id for tag in termine for _, ev in tag}
+        self.feiertage = feiertage if feiertage is not None else {}
+
+    @property
+    def anzahl_tage(self) -> int:
+        """Gibt die Anzahl der Tage des Monats zurück."""
+        return len(self.termine)
+
+
+class Monatsansicht:
+    """LRU-Zwischenspeicher für Monatsraster.
+    Beim Hin- und Herblättern zwischen bereits gesehenen Monaten wird nichts neu berechnet.
+    ————————————Attribute: ————————————
+        kalender (Kalender): Liefert die Termine über seinen Zeitindex.
+        max_monate (int): Anzahl der Monate, die höchstens gespeichert werden.
+        __raster (OrderedDict[tuple[int, int], Monatsraster]): Gespeicherte Monate, zuletzt benutzter am Ende.
+        __monate_je_event (dict[int, set[tuple[int, int]]]): Gespeicherte Monate, in denen ein Event vorkommt.
+    ————————————Methoden: ————————————
+        raster(jahr: int, monat: int) → Monatsraster: Gibt den Monat aus dem Speicher zurück oder berechnet ihn.
+        verwerfen(jahr: int, monat: int) → None: Entfernt einen Monat aus dem Speicher.
+        leeren() → None: Entfernt alle Monate.
+        aenderungen_anwenden(aenderungen: list[tuple]) → None: Verwirft die von Änderungen des Eventmanagers betroffenen Monate.
+    """
+
+    def __init__(self, kalender:Kalender, eventman=None, max_monate:int = 24) -> None:
+        """
+        :param kalender: Kalender mit Zeitindex, bei Änderungen seiner eigenen Feiertage wird der betroffene Monat verworfen.
+        :param eventman: Eventmanager, bei dessen Änderungen betroffene Monate verworfen werden (optional).
+        :param max_monate: Anzahl der Monate, die höchstens gespeichert werden.
+        """
+        if max_monate < 1:
+            raise ValueError("max_monate muss >= 1 sein.")
+        self.kalender = kalender
+        self.max_monate = max_monate
+        self.__raster: OrderedDict[tuple[int, int], Monatsraster] = OrderedDict()
+        self.__monate_je_event: dict[int, set[tuple[int, int]]] = {}
+        kalender.feiertag_beobachter_anmelden(self.verwerfen)
+        if eventman is not None:
+            eventman.beobachter_anmelden(self.aenderungen_anwenden)
+
+    def __len__(self) -> int:
+        """Gibt die Anzahl der gespeicherten Monate zurück."""
+        return len(self.__raster)
+
+    def __contains__(self, schluessel:tuple[int, int]) -> bool:
+        """Prüft, ob (jahr, monat) gespeichert ist, ohne die LRU-Reihenfolge zu ändern."""
+        return schluessel in self.__raster
+
+    def raster(self, jahr:int, monat:int) -> Monatsraster:
+        """Gibt das Raster eines Monats zurück, berechnet wird nur, wenn der Monat nicht gespeichert ist.
+        :param jahr: z. B. 2025
+        :param monat: 1–12
+        :return: Monatsraster
+        """
+        schluessel = (jahr, monat)
+        raster = self.__raster.get(schluessel)
+        if raster is not None:
+            self.__raster.move_to_end(schluessel)
+            return raster
+        raster = Monatsraster(jahr, monat, self.kalender.events_nach_tag(monat, jahr), self.kalender.feiertage_im_monat(monat, jahr))
+        self.__raster[schluessel] = raster
+        for event_id in raster.event_ids:
+            self.__monate_je_event.setdefault(event_id, set()).add(schluessel)
+        while len(self.__raster) > self.max_monate:
+            self.verwerfen(*next(iter(self.__raster)))
+        return raster
+
+    def verwerfen(self, jahr:int, monat:int) -> None:
+        """Entfernt einen Monat aus dem Speicher, nicht gespeicherte Monate werden ignoriert.
+        :param jahr: z. B. 2025
+        :param monat: 1–12
+        """
+        schluessel = (jahr, monat)
+        raster = self.__raster.pop(schluessel, None)
+        if raster is None:
+            return
+        for event_id in raster.event_ids:
+            monate = self.__monate_je_event.get(event_id)
+            if monate is not None:
+                monate.discard(schluessel)
+                if not monate:
+                    del self.__monate_je_event[event_id]
+
+    def leeren(self) -> None:
+        """Entfernt alle gespeicherten Monate."""
+        self.__raster.clear()
+        self.__monate_je_event.clear()
+
+    def aenderungen_anwenden(self, aenderungen:list[tuple]) -> None:
+        """Verwirft nur die Monate, die von Änderungen des Eventmanagers betroffen sind, passend für Eventman.beobachter_anmelden().
+        Betroffen sind die Monate, in denen das Event bisher vorkam, und der Monat seiner neuen Fälligkeit.
+        Bei wiederholten Events zusätzlich alle gespeicherten Monate ab der neuen Fälligkeit.
+        :param aenderungen: Liste von (Art, Event)- bzw. (Speicher.ENTFERNT, Event-ID)-Tupeln.
+        """
+        betroffen: set[tuple[int, int]] = set()
+        for art, wert in aenderungen:
+            if art == Speicher.ENTFERNT:
+                betroffen.update(self.__monate_je_event.get(wert, ()))
+                continue
+            betroffen.update(self.__monate_je_event.get(wert.id, ()))
+            jahr, monat = wert.zeitpunkt.jahr, wert.zeitpunkt.monat
+            betroffen.add((jahr, monat))
+            if wert.regel is not None:
+                betroffen.update(schluessel for schluessel in self.__raster if schluessel >= (jahr, monat))
+        for schluessel in betroffen:
+            self.verwerfen(*schluessel)
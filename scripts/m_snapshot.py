@@ -0,0 +1,297 @@
+"""
+Modul: m_snapshot
+
+Binärer Snapshot des Eventspeichers für einen schnellen Start bei vielen Events.
+Die Events liegen als Spalten fester Breite (Sekunden, ID, Flags, Aktionscode) plus einer Stringtabelle
+für Namen und Wiederholungsregeln in einer Datei, die beim Start nur per mmap eingeblendet wird.
+Event-Objekte werden erst beim ersten Zugriff aus ihrem Datensatz erzeugt (EventListe).
+Der Snapshot merkt sich Änderungszeit und Größe seiner Quelldateien (events.csv, Journal)
+und gilt nur, solange diese unverändert sind.
+
+"""
+
+from scripts.m_event import Event
+from array import array
+from threading import RLock
+import mmap
+import os
+import struct
+
+MAGIC = b"CALSNAP1"
+VERSION = 1
+# Magic, Version, Anzahl Quellen, Anzahl Events, nächste ID, Offsets von Aktionen, Sekunden, IDs, Flags, Aktionscodes, Namen, Regeln, Strings
+_KOPF = struct.Struct("<8sIIqq8q")
+_QUELLE = struct.Struct("<qq")  # Änderungszeit in ns, Größe in Bytes
+TAEGLICH, MONATLICH, JAEHRLICH = 1, 2, 4
+
+
+def quellen_stempel(pfade:list[str]) -> list[tuple[int, int]]:
+    """Ermittelt Änderungszeit und Größe der Quelldateien, fehlende Dateien ergeben (0, -1).
+    :param pfade: Pfade der Quelldateien.
+    :return: Liste von (mtime_ns, groesse)-Tupeln in Reihenfolge der Pfade.
+    """
+    stempel = []
+    for pfad in pfade:
+        try:
+            status = os.stat(pfad)
+            stempel.append((status.st_mtime_ns, status.st_size))
+        except FileNotFoundError:
+            stempel.append((0, -1))
+    return stempel
+
+
+def _ausrichten(position:int) -> int:
+    """Rundet eine Dateiposition auf ein Vielfaches von 8 auf."""
+    return (position + 7) & ~7
+
+
+def datensatz(ev:Event) -> tuple:
+    """Wandelt ein Event in einen Datensatz des Snapshots um.
+    :param ev: Event.
+    :return: (event_id, sekunden, aktion, name, flags, regel_text)
+    """
+    flags = (TAEGLICH if ev.taeglich else 0) | (MONATLICH if ev.monatlich else 0) | (JAEHRLICH if ev.jaehrlich else 0)
+    return ev.id, ev.zeitpunkt.sekunden, ev.akt, ev.name, flags, str(ev.regel) if ev.regel is not None else ""
+
+
+def schreiben(pfad:str, datensaetze, naechste_id:int, stempel:list[tuple[int, int]]) -> None:
+    """Schreibt einen Snapshot atomar (temporäre Datei und os.replace).
+    Die Datensätze werden nach (Sekunden, ID) sortiert abgelegt, die Spalte der Fälligkeiten ist damit bereits ein Heap.
+    :param pfad: Zieldatei.
+    :param datensaetze: Iterable aus (event_id, sekunden, aktion, name, flags, regel_text)-Tupeln, siehe datensatz().
+    :param naechste_id: Hochwassermarke der Event-IDs.
+    :param stempel: Stempel der Quelldateien zum Zeitpunkt des Schreibens, siehe quellen_stempel().
+    """
+    datensaetze = sorted(datensaetze, key=lambda d: (d[1], d[0]))
+    anzahl = len(datensaetze)
+    aktionen: dict[str, int] = {}
+    sekunden, ids, flags, codes = array("q"), array("q"), bytearray(), array("H")
+    namen_offsets, regel_offsets = array("q", [0]), array("q", [0])
+    namen, regeln = bytearray(), bytearray()
+    for event_id, sek, aktion, name, flag, regel in datensaetze:
+        sekunden.append(sek)
+        ids.append(event_id)
+        flags.append(flag)
+        codes.append(aktionen.setdefault(aktion, len(aktionen)))
+        namen += name.encode("utf-8")
+        namen_offsets.append(len(namen))
+        regeln += regel.encode("utf-8")
+        regel_offsets.append(len(regeln))
+    if len(aktionen) > 0xFFFF:
+        raise ValueError("Zu viele verschiedene Aktionen für den Snapshot.")
+    aktionen_text = "\0".join(aktionen).encode("utf-8")
+    # Namen und Regeln teilen sich die Stringtabelle, die Regel-Offsets werden hinter die Namen verschoben
+    regel_offsets = array("q", (offset + len(namen) for offset in regel_offsets))
+    abschnitte = [aktionen_text, sekunden.tobytes(), ids.tobytes(), bytes(flags), codes.tobytes(),
+                  namen_offsets.tobytes(), regel_offsets.tobytes(), bytes(namen + regeln)]
+    position = _KOPF.size + _QUELLE.size * len(stempel)
+    offsets = []
+    for abschnitt in abschnitte:
+        position = _ausrichten(position)
+        offsets.append(position)
+        position += len(abschnitt)
+    temp_pfad = pfad + ".tmp"
+    with open(temp_pfad, "wb") as f:
+        f.write(_KOPF.pack(MAGIC, VERSION, len(stempel), anzahl, naechste_id, len(aktionen_text), *offsets[1:]))
+        for quelle in stempel:
+            f.write(_QUELLE.pack(*quelle))
+        for offset, abschnitt in zip(offsets, abschnitte):
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(abschnitt)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_pfad, pfad)
+
+
+class Snapshot:
+    """Per mmap eingeblendeter Snapshot. Öffnen kostet unabhängig von der Anzahl der Events nur das Einblenden der Datei,
+    die Spalten werden als memoryview gelesen, Namen und Regeln erst beim Abruf eines Datensatzes dekodiert.
+    ————————————Attribute: ————————————
+        anzahl (int): Anzahl der Events.
+        naechste_id (int): Hochwassermarke der Event-IDs beim Schreiben.
+        stempel (list[tuple[int, int]]): Stempel der Quelldateien beim Schreiben.
+        aktionen (list[str]): Aktionen, der Aktionscode eines Events ist die Position in dieser Liste.
+    ————————————Methoden: ————————————
+        aktuell(pfade: list[str]) → bool: Prüft, ob die Quelldateien seit dem Schreiben unverändert sind.
+        sekunden() → list[int]: Fälligkeiten aller Events in Sekunden, nach (Sekunden, ID) sortiert.
+        ids() → list[int]: Event-IDs in derselben Reihenfolge.
+        eintrag(position: int) → tuple: Datensatz als (event_id, sekunden, aktion, name, taeglich, monatlich, jaehrlich, regel_text).
+        roh(position: int) → tuple: Datensatz im Format von datensatz(), ohne Dekodieren der Regel.
+        schliessen() → None: Gibt das mmap frei.
+    """
+
+    def __init__(self, pfad:str) -> None:
+        """Blendet einen Snapshot ein.
+        :param pfad: Pfad zur Snapshot-Datei.
+        :raises FileNotFoundError: Wenn die Datei nicht existiert.
+        :raises ValueError: Wenn die Datei kein gültiger Snapshot ist.
+        """
+        self.__ansichten: list[memoryview] = []
+        with open(pfad, "rb") as f:
+            try:
+                self.__mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # leere Datei
+                raise ValueError(f"Snapshot '{pfad}' ist leer.")
+        try:
+            self.__einlesen(pfad)
+        except (ValueError, struct.error, TypeError):
+            self.schliessen()
+            raise
+
+    def __einlesen(self, pfad:str) -> None:
+        """Liest den Kopf und legt die Spaltenansichten an."""
+        if len(self.__mm) < _KOPF.size:
+            raise ValueError(f"Snapshot '{pfad}' ist abgeschnitten.")
+        magic, version, quellen, self.anzahl, self.naechste_id, aktionen_laenge, *offsets = _KOPF.unpack_from(self.__mm)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"'{pfad}' ist kein Snapshot der Version {VERSION}.")
+        self.stempel = [_QUELLE.unpack_from(self.__mm, _KOPF.size + i * _QUELLE.size) for i in range(quellen)]
+        aktionen_offset = _ausrichten(_KOPF.size + quellen * _QUELLE.size)
+        aktionen_text = bytes(self.__mm[aktionen_offset:aktionen_offset + aktionen_laenge]).decode("utf-8")
+        self.aktionen = aktionen_text.split("\0") if aktionen_text else []
+        n = self.anzahl
+        sek_offset, id_offset, flag_offset, code_offset, namen_offset, regel_offset, text_offset = offsets
+        ansicht = memoryview(self.__mm)
+        self.__sekunden = ansicht[sek_offset:sek_offset + 8 * n].cast("q")
+        self.__ids = ansicht[id_offset:id_offset + 8 * n].cast("q")
+        self.__flags = ansicht[flag_offset:flag_offset + n]
+        self.__codes = ansicht[code_offset:code_offset + 2 * n].cast("H")
+        self.__namen = ansicht[namen_offset:namen_offset + 8 * (n + 1)].cast("q")
+        self.__regeln = ansicht[regel_offset:regel_offset + 8 * (n + 1)].cast("q")
+        self.__ansichten = [self.__sekunden, self.__ids, self.__flags, self.__codes, self.__namen, self.__regeln, ansicht]
+        self.__text_offset = text_offset
+        if len(self.__regeln) != n + 1 or text_offset + self.__regeln[n] > len(self.__mm):
+            raise ValueError(f"Snapshot '{pfad}' ist abgeschnitten.")
+
+    def __len__(self) -> int:
+        """Gibt die Anzahl der Events zurück."""
+        return self.anzahl
+
+    def aktuell(self, pfade:list[str]) -> bool:
+        """Prüft, ob die Quelldateien seit dem Schreiben des Snapshots unverändert sind.
+        :param pfade: Pfade der Quelldateien in derselben Reihenfolge wie beim Schreiben.
+        :return: True, wenn der Snapshot den Stand der Quelldateien wiedergibt.
+        """
+        return self.stempel == quellen_stempel(pfade)
+
+    def sekunden(self) -> list[int]:
+        """Gibt die Fälligkeiten aller Events in Sekunden zurück, nach (Sekunden, ID) sortiert."""
+        return self.__sekunden.tolist()
+
+    def ids(self) -> list[int]:
+        """Gibt die Event-IDs in derselben Reihenfolge wie sekunden() zurück."""
+        return self.__ids.tolist()
+
+    def __text(self, offsets:memoryview, position:int) -> str:
+        """Dekodiert einen Eintrag der Stringtabelle."""
+        anfang, ende = self.__text_offset + offsets[position], self.__text_offset + offsets[position + 1]
+        return str(self.__mm[anfang:ende], "utf-8")
+
+    def roh(self, position:int) -> tuple:
+        """Gibt einen Datensatz im Format von datensatz() zurück, z.B. zum Umschreiben ohne Event-Objekt.
+        :param position: Position des Datensatzes.
+        :return: (event_id, sekunden, aktion, name, flags, regel_text)
+        """
+        return (self.__ids[position], self.__sekunden[position], self.aktionen[self.__codes[position]],
+                self.__text(self.__namen, position), self.__flags[position], self.__text(self.__regeln, position))
+
+    def eintrag(self, position:int) -> tuple:
+        """Gibt einen Datensatz im Format der Speicher-Backends zurück, die Zeit jedoch in Sekunden.
+        :param position: Position des Datensatzes.
+        :return: (event_id, sekunden, aktion, name, taeglich, monatlich, jaehrlich, regel_text)
+        """
+        event_id, sek, aktion, name, flags, regel = self.roh(position)
+        return event_id, sek, aktion, name, bool(flags & TAEGLICH), bool(flags & MONATLICH), bool(flags & JAEHRLICH), regel
+
+    def schliessen(self) -> None:
+        """Gibt die Spaltenansichten und das mmap frei."""
+        for ansicht in self.__ansichten:
+            ansicht.release()
+        self.__ansichten = []
+        self.__mm.close()
+
+
+class EventListe:
+    """Event-Liste über einem Snapshot, deren Events erst beim ersten Zugriff erzeugt werden.
+    Verhält sich für den Eventmanager wie eine Liste (Index, Slice, Iteration, append, pop, Zuweisung).
+    Noch nicht erzeugte Positionen werden nie verschoben, da Verschieben immer über einen Zugriff läuft.
+    Erzeugen und Ändern laufen unter einer Sperre, damit kopie() auch aus einem Hintergrund-Thread einen
+    konsistenten Stand liefert. Lesen bereits erzeugter Events kommt ohne Sperre aus.
+    ————————————Attribute: ————————————
+        __snapshot (Snapshot): Eingeblendeter Snapshot.
+        __events (list[Event | None]): Bereits erzeugte Events, None für noch nicht erzeugte Snapshot-Positionen.
+        __erzeugen (callable): Erzeugt ein Event aus Snapshot.eintrag().
+        __sperre (RLock): Schützt Erzeugen, Ändern und kopie().
+    ————————————Methoden: ————————————
+        kopie() → list[Event]: Alle Events als gewöhnliche Liste, threadsicher.
+        datensaetze() → Iterator[tuple]: Alle Events als Snapshot-Datensätze, ohne noch nicht erzeugte Events zu erzeugen.
+    """
+    __slots__ = ("__snapshot", "__events", "__erzeugen", "__sperre")
+
+    def __init__(self, snapshot:Snapshot, erzeugen) -> None:
+        """
+        :param snapshot: Eingeblendeter Snapshot, Position i der Liste ist anfangs Datensatz i.
+        :param erzeugen: Funktion, die aus einem Datensatz von Snapshot.eintrag() ein Event erzeugt.
+        """
+        self.__snapshot = snapshot
+        self.__events: list[Event | None] = [None] * len(snapshot)
+        self.__erzeugen = erzeugen
+        self.__sperre = RLock()
+
+    def __len__(self) -> int:
+        return len(self.__events)
+
+    def __holen(self, position:int) -> Event:
+        """Gibt das Event an einer Position zurück und erzeugt es beim ersten Zugriff."""
+        ev = self.__events[position]
+        if ev is None:
+            with self.__sperre:
+                ev = self.__events[position]
+                if ev is None:
+                    ev = self.__events[position] = self.__erzeugen(self.__snapshot.eintrag(position))
+        return ev
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self.__holen(i) for i in range(*position.indices(len(self.__events)))]
+        if position < 0:
+            position += len(self.__events)
+        if not 0 <= position < len(self.__events):
+            raise IndexError("EventListe-Index außerhalb des Bereichs")
+        return self.__holen(position)
+
+    def __setitem__(self, position:int, ev:Event) -> None:
+        with self.__sperre:
+            self.__events[position] = ev
+
+    def __iter__(self):
+        for position in range(len(self.__events)):
+            yield self.__holen(position)
+
+    def append(self, ev:Event) -> None:
+        """Hängt ein Event an."""
+        with self.__sperre:
+            self.__events.append(ev)
+
+    def pop(self) -> Event:
+        """Entfernt das letzte Event und gibt es zurück."""
+        with self.__sperre:
+            ev = self.__holen(len(self.__events) - 1)
+            self.__events.pop()
+        return ev
+
+    def kopie(self) -> list[Event]:
+        """Gibt alle Events als gewöhnliche Liste zurück, noch nicht erzeugte Events werden dabei erzeugt.
+        Sind alle Events erzeugt, kostet das nur das Kopieren der Liste.
+        """
+        with self.__sperre:
+            if None in self.__events:
+                return [self.__holen(position) for position in range(len(self.__events))]
+            return self.__events[:]
+
+    def datensaetze(self):
+        """Liefert alle Events als Snapshot-Datensätze. Noch nicht erzeugte Events werden direkt aus dem Snapshot kopiert.
+        :return: Iterator über (event_id, sekunden, aktion, name, flags, regel_text)-Tupel.
+        """
+        for position, ev in enumerate(self.__events):
+            yield self.__snapshot.roh(position) if ev is None else datensatz(ev)
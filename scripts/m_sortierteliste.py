@@ -0,0 +1,160 @@
+"""
+Modul: m_sortierteliste
+
+Sortierter Behälter für Termine und Wecker des Kalenders.
+Einträge liegen in einem nach Schlüssel sortierten Array und werden per Binärsuche eingefügt und gefunden,
+eine Menge der Kennungen verhindert Duplikate ohne die Liste zu durchsuchen.
+Ausgaben wie "die nächsten 50 Termine" laufen über Generatoren ab einer per Binärsuche gefundenen Position
+und berühren nur die ausgegebenen Einträge.
+
+"""
+
+from bisect import bisect_left
+from itertools import count
+from typing import Callable, Hashable, Iterator
+
+
+class SortierteListe:
+    """Nach einem Schlüssel sortierte Einträge mit Duplikatprüfung über eine Kennung.
+    Der Schlüssel eines Eintrags wird beim Einfügen einmal berechnet und gespeichert, die Einträge dürfen danach nicht so
+    verändert werden, dass sich Schlüssel oder Kennung ändern. Zum Verschieben entfernen und neu einfügen.
+    Gleiche Schlüssel behalten die Reihenfolge des Einfügens.
+    ————————————Attribute: ————————————
+        __schluessel (list[tuple]): Sortierte (Schlüssel, laufende Nummer)-Paare, parallel zu __eintraege.
+        __eintraege (list): Einträge in sortierter Reihenfolge.
+        __kennungen (dict[Hashable, tuple]): Gespeicherter Sortierschlüssel je Kennung, zum Entfernen und für die Duplikatprüfung.
+    ————————————Methoden: ————————————
+        einfuegen(eintrag) → bool: Fügt einen Eintrag sortiert ein, Duplikate werden ignoriert.
+        entfernen(eintrag) → bool: Entfernt einen Eintrag über seine Kennung.
+        kennung_entfernen(kennung) → bool: Entfernt den Eintrag mit einer Kennung, ohne den Eintrag selbst zu kennen.
+        entfernen_an(index: int) → object | None: Entfernt den Eintrag an einer Position der Sortierung.
+        position(schluessel) → int: Position des ersten Eintrags mit Schlüssel >= schluessel.
+        seite(start: int, anzahl: int | None) → Iterator: Einträge einer Seite in sortierter Reihenfolge.
+        ab(schluessel, anzahl: int | None) → Iterator: Einträge ab einem Schlüssel.
+        leeren() → None: Entfernt alle Einträge.
+    """
+
+    def __init__(self, schluessel:Callable, kennung:Callable[..., Hashable] | None = None, eintraege=()) -> None:
+        """
+        :param schluessel: Berechnet den Sortierschlüssel eines Eintrags.
+        :param kennung: Berechnet die Kennung für die Duplikatprüfung aus Eintrag und Sortierschlüssel, ohne Angabe der Sortierschlüssel.
+        :param eintraege: Anfangseinträge, werden einmal sortiert statt einzeln eingefügt.
+        """
+        self.__schluessel_von = schluessel
+        self.__kennung_von = kennung if kennung is not None else schluessel
+        self.__kennungen: dict[Hashable, tuple] = {}
+        werte, neue = [], []
+        for eintrag in eintraege:
+            wert = schluessel(eintrag)
+            kennung_wert = wert if kennung is None else kennung(eintrag, wert)
+            if kennung_wert not in self.__kennungen:
+                self.__kennungen[kennung_wert] = len(werte)
+                werte.append(wert)
+                neue.append(eintrag)
+        # stabil nach Schlüssel allein sortieren, die laufende Nummer entspricht der Reihenfolge der Übergabe
+        reihenfolge = sorted(range(len(werte)), key=werte.__getitem__)
+        self.__schluessel: list[tuple] = [(werte[index], index) for index in reihenfolge]
+        self.__eintraege: list = [neue[index] for index in reihenfolge]
+        self.__kennungen = {kennung_wert: (werte[index], index) for kennung_wert, index in self.__kennungen.items()}
+        self.__nummern = count(len(werte))
+
+    def __len__(self) -> int:
+        """Gibt die Anzahl der Einträge zurück."""
+        return len(self.__eintraege)
+
+    def __iter__(self) -> Iterator:
+        """Iteriert in sortierter Reihenfolge."""
+        return iter(self.__eintraege)
+
+    def __getitem__(self, index):
+        """Gibt den Eintrag (oder bei einem slice die Einträge) an einer Position der Sortierung zurück."""
+        return self.__eintraege[index]
+
+    def __kennung(self, eintrag, wert=None) -> Hashable:
+        """Berechnet die Kennung eines Eintrags, der Sortierschlüssel wird nur berechnet, wenn er nicht übergeben wird."""
+        if wert is None:
+            wert = self.__schluessel_von(eintrag)
+        return wert if self.__kennung_von is self.__schluessel_von else self.__kennung_von(eintrag, wert)
+
+    def __contains__(self, eintrag) -> bool:
+        """Prüft über die Kennung in O(1), ob ein gleicher Eintrag enthalten ist."""
+        return self.__kennung(eintrag) in self.__kennungen
+
+    def einfuegen(self, eintrag) -> bool:
+        """Fügt einen Eintrag per Binärsuche an seiner Position ein.
+        :param eintrag: Neuer Eintrag.
+        :return: True wenn eingefügt, False wenn ein Eintrag mit gleicher Kennung schon enthalten ist.
+        """
+        wert = self.__schluessel_von(eintrag)
+        kennung = self.__kennung(eintrag, wert)
+        if kennung in self.__kennungen:
+            return False
+        sortierung = (wert, next(self.__nummern))
+        self.__kennungen[kennung] = sortierung
+        index = bisect_left(self.__schluessel, sortierung)
+        self.__schluessel.insert(index, sortierung)
+        self.__eintraege.insert(index, eintrag)
+        return True
+
+    def entfernen(self, eintrag) -> bool:
+        """Entfernt den Eintrag mit gleicher Kennung, die Position wird per Binärsuche über den gespeicherten Schlüssel gefunden.
+        :param eintrag: Zu entfernender Eintrag (oder ein gleicher).
+        :return: True wenn entfernt, False wenn nicht enthalten.
+        """
+        return self.kennung_entfernen(self.__kennung(eintrag))
+
+    def kennung_entfernen(self, kennung:Hashable) -> bool:
+        """Entfernt den Eintrag mit einer Kennung, z.B. ein Event nach seiner ID, auch wenn sich sein Schlüssel seitdem geändert hat.
+        :param kennung: Kennung des Eintrags.
+        :return: True wenn entfernt, False wenn nicht enthalten.
+        """
+        sortierung = self.__kennungen.pop(kennung, None)
+        if sortierung is None:
+            return False
+        index = bisect_left(self.__schluessel, sortierung)
+        del self.__schluessel[index]
+        del self.__eintraege[index]
+        return True
+
+    def entfernen_an(self, index:int):
+        """Entfernt den Eintrag an einer Position der Sortierung.
+        :param index: Position, negative Werte zählen vom Ende.
+        :return: Den entfernten Eintrag, None bei ungültigem Index.
+        """
+        if not -len(self.__eintraege) <= index < len(self.__eintraege):
+            return None
+        eintrag = self.__eintraege.pop(index)
+        wert, _ = self.__schluessel.pop(index)
+        del self.__kennungen[self.__kennung(eintrag, wert)]
+        return eintrag
+
+    def position(self, schluessel) -> int:
+        """Sucht per Binärsuche die Position des ersten Eintrags, dessen Schlüssel nicht kleiner ist.
+        :param schluessel: Vergleichswert im Format der Sortierschlüssel.
+        :return: Index 0 … len(self).
+        """
+        return bisect_left(self.__schluessel, (schluessel,))
+
+    def seite(self, start:int = 0, anzahl:int | None = None) -> Iterator:
+        """Liefert die Einträge ab einer Position, ohne die übrigen anzufassen.
+        :param start: Position des ersten Eintrags.
+        :param anzahl: Höchstzahl der Einträge, None für alle bis zum Ende.
+        :return: Iterator über die Einträge.
+        """
+        eintraege = self.__eintraege
+        ende = len(eintraege) if anzahl is None else min(start + anzahl, len(eintraege))
+        return (eintraege[index] for index in range(start, ende))  # islice würde die ersten start Einträge durchlaufen
+
+    def ab(self, schluessel, anzahl:int | None = None) -> Iterator:
+        """Liefert die Einträge ab einem Schlüssel, z.B. die nächsten Termine ab jetzt.
+        :param schluessel: Vergleichswert im Format der Sortierschlüssel.
+        :param anzahl: Höchstzahl der Einträge, None für alle bis zum Ende.
+        :return: Iterator über die Einträge.
+        """
+        return self.seite(self.position(schluessel), anzahl)
+
+    def leeren(self) -> None:
+        """Entfernt alle Einträge."""
+        self.__schluessel.clear()
+        self.__eintraege.clear()
+        self.__kennungen.clear()
@@ -0,0 +1,324 @@
+"""
+Modul: m_spalten
+
+Optionaler spaltenorientierter Speicher der Events für Auswertungen über sehr viele Einträge.
+Fälligkeit, ID, Wiederholungs-Bitfeld und internierte Codes für Aktion und Name liegen in parallelen NumPy-Arrays,
+Abfragen wie "fällig bis t", "im Monat M" oder "Anzahl je Tag" laufen vektorisiert.
+Der Speicher wird wie der Zeitindex über die Änderungsmeldungen des Eventmanagers nachgeführt.
+Benötigt numpy, ohne numpy ist nur der Rest der App verfügbar.
+
+"""
+
+from scripts.m_datumzeit import Zeitpunkt
+from scripts.m_event import Event
+from scripts.m_speicher import Speicher
+from scripts.m_wiederholung import Regel
+from scripts import m_kalendermathe as km
+
+try:
+    import numpy as np
+except ImportError:  # numpy ist optional
+    np = None
+
+NUMPY_VERFUEGBAR: bool = np is not None
+# Bits des Wiederholungs-Bitfelds, TAEGLICH/MONATLICH/JAEHRLICH nur bei einfacher Regel wie Event.taeglich usw.
+TAEGLICH, MONATLICH, JAEHRLICH, REGEL = 1, 2, 4, 8
+
+
+def wiederholung_bits(ev:Event) -> int:
+    """Fasst die Wiederholung eines Events in einem Bitfeld zusammen.
+    :param ev: Event.
+    :return: Kombination aus TAEGLICH, MONATLICH, JAEHRLICH und REGEL (Event hat irgendeine Wiederholungsregel).
+    """
+    if ev.regel is None:
+        return 0
+    return REGEL | (TAEGLICH if ev.taeglich else 0) | (MONATLICH if ev.monatlich else 0) | (JAEHRLICH if ev.jaehrlich else 0)
+
+
+class Spaltenspeicher:
+    """Events als parallele Arrays, eine Zeile je Event. Entfernen rückt die letzte Zeile nach (O(1)),
+    die Arrays wachsen durch Verdoppeln der Kapazität. Namen und Aktionen werden interniert und nicht wieder freigegeben.
+    Abfragen berücksichtigen die aktuelle Fälligkeit jedes Events, Wiederholungen werden nicht aufgefaltet.
+    ————————————Attribute: ————————————
+        __anzahl (int): Anzahl der belegten Zeilen.
+        __faellig (np.ndarray[int64]): Fälligkeit in Sekunden seit 0001-01-01.
+        __ids (np.ndarray[int64]): Event-ID.
+        __wiederholung (np.ndarray[uint8]): Wiederholungs-Bitfeld, siehe wiederholung_bits().
+        __aktion (np.ndarray[uint16]): Code der Aktion, Position in __aktionen.
+        __name (np.ndarray[uint32]): Code des Namens, Position in __namen.
+        __zeile (dict[int, int]): Event-ID → Zeile.
+        __regeln (dict[int, Regel]): Wiederholungsregeln der wiederholten Events nach ID.
+    ————————————Methoden: ————————————
+        einfuegen(ev: Event) → None: Nimmt ein Event auf bzw. überschreibt seine Zeile.
+        entfernen(event_id: int) → None: Entfernt die Zeile eines Events.
+        aenderungen_anwenden(aenderungen: list[tuple]) → None: Führt die Spalten mit Änderungsmeldungen des Eventmanagers nach.
+        faellige(zeitpunkt: Zeitpunkt) → np.ndarray: IDs der bis zum Zeitpunkt fälligen Events.
+        im_bereich(von: Zeitpunkt, bis: Zeitpunkt) → np.ndarray: IDs mit Fälligkeit in [von, bis[, nach Zeit sortiert.
+        im_monat(jahr: int, monat: int) → np.ndarray: IDs mit Fälligkeit im Monat.
+        anzahl_je_tag(jahr: int, monat: int) → np.ndarray: Anzahl der Fälligkeiten je Tag des Monats, z.B. für eine Heatmap.
+        anzahl_je_aktion() → dict[str, int]: Anzahl der Events je Aktion.
+        ansicht(event_id: int) → EventAnsicht: Schreibgeschützte Sicht auf die Zeile eines Events.
+    """
+    START_KAPAZITAET = 1024
+
+    def __init__(self, events=()) -> None:
+        """Baut die Spalten einmal aus den übergebenen Events auf.
+        :param events: Iterable aus Event-Objekten, z.B. die Event-Liste des Eventmanagers.
+        :raises ImportError: Wenn numpy nicht installiert ist.
+        """
+        if np is None:
+            raise ImportError("Der Spaltenspeicher benötigt numpy (pip install numpy).")
+        self.__aktionen: list[str] = []
+        self.__aktion_codes: dict[str, int] = {}
+        self.__namen: list[str] = []
+        self.__namen_codes: dict[str, int] = {}
+        self.__regeln: dict[int, Regel] = {}
+        faellig, ids, wiederholung, aktion, name = [], [], [], [], []
+        for ev in events:
+            faellig.append(ev.zeitpunkt.sekunden)
+            ids.append(ev.id)
+            wiederholung.append(wiederholung_bits(ev))
+            aktion.append(self.__internieren(ev.akt, self.__aktionen, self.__aktion_codes))
+            name.append(self.__internieren(ev.name, self.__namen, self.__namen_codes))
+            if ev.regel is not None:
+                self.__regeln[ev.id] = ev.regel
+        self.__anzahl = len(ids)
+        kapazitaet = max(self.START_KAPAZITAET, 2 * self.__anzahl)
+        self.__faellig = self.__spalte(faellig, np.int64, kapazitaet)
+        self.__ids = self.__spalte(ids, np.int64, kapazitaet)
+        self.__wiederholung = self.__spalte(wiederholung, np.uint8, kapazitaet)
+        self.__aktion = self.__spalte(aktion, np.uint16, kapazitaet)
+        self.__name = self.__spalte(name, np.uint32, kapazitaet)
+        self.__zeile: dict[int, int] = dict(zip(ids, range(len(ids))))
+
+    @staticmethod
+    def __spalte(werte, typ, kapazitaet:int):
+        """Legt eine Spalte mit Reserve an und füllt den Anfang mit den Werten."""
+        spalte = np.zeros(kapazitaet, dtype=typ)
+        spalte[:len(werte)] = werte
+        return spalte
+
+    @staticmethod
+    def __internieren(text:str, tabelle:list[str], codes:dict[str, int]) -> int:
+        """Gibt den Code eines Textes zurück und trägt ihn bei Bedarf in die Tabelle ein."""
+        code = codes.get(text)
+        if code is None:
+            code = codes[text] = len(tabelle)
+            tabelle.append(text)
+        return code
+
+    def __len__(self) -> int:
+        """Gibt die Anzahl der Events zurück."""
+        return self.__anzahl
+
+    def __contains__(self, event_id:int) -> bool:
+        """Prüft, ob ein Event in den Spalten steht."""
+        return event_id in self.__zeile
+
+    @property
+    def faellig(self):
+        """Gibt die Fälligkeiten in Sekunden als Array-Sicht zurück (nicht verändern)."""
+        return self.__faellig[:self.__anzahl]
+
+    @property
+    def ids(self):
+        """Gibt die Event-IDs als Array-Sicht zurück (nicht verändern)."""
+        return self.__ids[:self.__anzahl]
+
+    @property
+    def wiederholung(self):
+        """Gibt das Wiederholungs-Bitfeld als Array-Sicht zurück (nicht verändern)."""
+        return self.__wiederholung[:self.__anzahl]
+
+    def zeile(self, event_id:int) -> int:
+        """Gibt die aktuelle Zeile eines Events zurück.
+        :raises KeyError: Wenn das Event nicht in den Spalten steht.
+        """
+        return self.__zeile[event_id]
+
+    def aktion(self, zeile:int) -> str:
+        """Gibt die Aktion einer Zeile zurück."""
+        return self.__aktionen[self.__aktion[zeile]]
+
+    def name(self, zeile:int) -> str:
+        """Gibt den Namen einer Zeile zurück."""
+        return self.__namen[self.__name[zeile]]
+
+    def regel(self, event_id:int) -> Regel | None:
+        """Gibt die Wiederholungsregel eines Events zurück, None ohne Regel."""
+        return self.__regeln.get(event_id)
+
+    def __vergroessern(self) -> None:
+        """Verdoppelt die Kapazität aller Spalten."""
+        kapazitaet = 2 * len(self.__ids)
+        self.__faellig, self.__ids, self.__wiederholung, self.__aktion, self.__name = (
+            self.__spalte(spalte[:self.__anzahl], spalte.dtype, kapazitaet)
+            for spalte in (self.__faellig, self.__ids, self.__wiederholung, self.__aktion, self.__name))
+
+    def einfuegen(self, ev:Event) -> None:
+        """Nimmt ein Event auf. Steht es schon in den Spalten (z.B. nach einer Verschiebung), wird seine Zeile überschrieben.
+        :param ev: Aufzunehmendes Event.
+        """
+        zeile = self.__zeile.get(ev.id)
+        if zeile is None:
+            if self.__anzahl == len(self.__ids):
+                self.__vergroessern()
+            zeile = self.__zeile[ev.id] = self.__anzahl
+            self.__anzahl += 1
+        self.__faellig[zeile] = ev.zeitpunkt.sekunden
+        self.__ids[zeile] = ev.id
+        self.__wiederholung[zeile] = wiederholung_bits(ev)
+        self.__aktion[zeile] = self.__internieren(ev.akt, self.__aktionen, self.__aktion_codes)
+        self.__name[zeile] = self.__internieren(ev.name, self.__namen, self.__namen_codes)
+        if ev.regel is not None:
+            self.__regeln[ev.id] = ev.regel
+        else:
+            self.__regeln.pop(ev.id, None)
+
+    def entfernen(self, event_id:int) -> None:
+        """Entfernt die Zeile eines Events in O(1), die letzte Zeile rückt nach. Unbekannte IDs werden ignoriert.
+        :param event_id: ID-Nummer des Events.
+        """
+        zeile = self.__zeile.pop(event_id, None)
+        if zeile is None:
+            return
+        self.__regeln.pop(event_id, None)
+        self.__anzahl -= 1
+        letzte = self.__anzahl
+        if zeile != letzte:
+            for spalte in (self.__faellig, self.__ids, self.__wiederholung, self.__aktion, self.__name):
+                spalte[zeile] = spalte[letzte]
+            self.__zeile[int(self.__ids[zeile])] = zeile
+
+    def aenderungen_anwenden(self, aenderungen:list[tuple]) -> None:
+        """Führt die Spalten mit den Änderungen des Eventmanagers nach, passend für Eventman.beobachter_anmelden().
+        :param aenderungen: Liste von (Art, Event)- bzw. (Speicher.ENTFERNT, Event-ID)-Tupeln.
+        """
+        for art, wert in aenderungen:
+            if art == Speicher.ENTFERNT:
+                self.entfernen(wert)
+            else:
+                self.einfuegen(wert)
+
+    def __sortiert(self, maske):
+        """Gibt die IDs der markierten Zeilen nach (Fälligkeit, ID) sortiert zurück."""
+        zeilen = np.flatnonzero(maske)
+        reihenfolge = np.lexsort((self.__ids[zeilen], self.__faellig[zeilen]))
+        return self.__ids[zeilen[reihenfolge]]
+
+    def faellige(self, zeitpunkt:Zeitpunkt):
+        """Sucht alle Events, die bis zu einem Zeitpunkt fällig sind.
+        :param zeitpunkt: Zeitpunkt, z.B. jetzt.
+        :return: Array der Event-IDs nach Fälligkeit sortiert.
+        """
+        return self.__sortiert(self.faellig <= zeitpunkt.sekunden)
+
+    def im_bereich(self, von:Zeitpunkt, bis:Zeitpunkt):
+        """Sucht alle Events mit Fälligkeit im Bereich [von, bis[.
+        :param von: Beginn des Bereichs.
+        :param bis: Ende des Bereichs (exklusiv).
+        :return: Array der Event-IDs nach Fälligkeit sortiert.
+        """
+        faellig = self.faellig
+        return self.__sortiert((faellig >= von.sekunden) & (faellig < bis.sekunden))
+
+    @staticmethod
+    def __monatsgrenzen(jahr:int, monat:int) -> tuple[int, int]:
+        """Gibt Beginn und Ende (exklusiv) eines Monats in Sekunden zurück."""
+        folge_jahr, folge_monat = km.monat_plus(jahr, monat, 1)
+        return (km.ordinal(jahr, monat, 1) - 1) * km.SEKUNDEN_PRO_TAG, (km.ordinal(folge_jahr, folge_monat, 1) - 1) * km.SEKUNDEN_PRO_TAG
+
+    def im_monat(self, jahr:int, monat:int):
+        """Sucht alle Events mit Fälligkeit in einem Monat.
+        :param jahr: Jahr, z.B. 2025.
+        :param monat: Monat 1–12.
+        :return: Array der Event-IDs nach Fälligkeit sortiert.
+        """
+        von, bis = self.__monatsgrenzen(jahr, monat)
+        return self.im_bereich(Zeitpunkt(von), Zeitpunkt(bis))
+
+    def anzahl_je_tag(self, jahr:int, monat:int):
+        """Zählt die Fälligkeiten je Tag eines Monats, z.B. für eine Heatmap.
+        :param jahr: Jahr, z.B. 2025.
+        :param monat: Monat 1–12.
+        :return: Array der Länge monatslaenge, Index 0 ist der 1. des Monats.
+        """
+        von, bis = self.__monatsgrenzen(jahr, monat)
+        faellig = self.faellig
+        tage = (faellig[(faellig >= von) & (faellig < bis)] - von) // km.SEKUNDEN_PRO_TAG
+        return np.bincount(tage, minlength=km.monatslaenge(jahr, monat))
+
+    def anzahl_je_aktion(self) -> dict[str, int]:
+        """Zählt die Events je Aktion.
+        :return: Aktion → Anzahl, nur Aktionen mit mindestens einem Event.
+        """
+        anzahl = np.bincount(self.__aktion[:self.__anzahl], minlength=len(self.__aktionen))
+        return {aktion: int(anzahl[code]) for code, aktion in enumerate(self.__aktionen) if anzahl[code]}
+
+    def ansicht(self, event_id:int) -> "EventAnsicht":
+        """Gibt eine schreibgeschützte Sicht auf die Zeile eines Events zurück.
+        :param event_id: ID-Nummer des Events.
+        :raises KeyError: Wenn das Event nicht in den Spalten steht.
+        """
+        if event_id not in self.__zeile:
+            raise KeyError(f"Kein Event mit der ID '{event_id}' im Spaltenspeicher.")
+        return EventAnsicht(self, event_id)
+
+
+class EventAnsicht:
+    """Schreibgeschützte, schlanke Sicht auf eine Zeile des Spaltenspeichers, z.B. für Berichte über viele Events.
+    Hält nur Speicher und ID, die Werte werden bei jedem Zugriff aus den Spalten gelesen und bleiben so aktuell.
+    Geändert wird weiterhin über den Eventmanager.
+    ————————————Attribute: ————————————
+        id (int): Event-ID.
+        zeitpunkt (Zeitpunkt): Aktuelle Fälligkeit.
+        akt (str): Aktion.
+        name (str): Name.
+        wiederholung (int): Wiederholungs-Bitfeld.
+        taeglich, monatlich, jaehrlich (bool): Einfache Wiederholung wie bei Event.
+        regel (Regel | None): Wiederholungsregel.
+    """
+    __slots__ = ("__spalten", "__id")
+
+    def __init__(self, spalten:Spaltenspeicher, event_id:int) -> None:
+        self.__spalten = spalten
+        self.__id = event_id
+
+    @property
+    def id(self) -> int:
+        return self.__id
+
+    @property
+    def zeitpunkt(self) -> Zeitpunkt:
+        return Zeitpunkt(int(self.__spalten.faellig[self.__spalten.zeile(self.__id)]))
+
+    @property
+    def akt(self) -> str:
+        return self.__spalten.aktion(self.__spalten.zeile(self.__id))
+
+    @property
+    def name(self) -> str:
+        return self.__spalten.name(self.__spalten.zeile(self.__id))
+
+    @property
+    def wiederholung(self) -> int:
+        return int(self.__spalten.wiederholung[self.__spalten.zeile(self.__id)])
+
+    @property
+    def taeglich(self) -> bool:
+        return bool(self.wiederholung & TAEGLICH)
+
+    @property
+    def monatlich(self) -> bool:
+        return bool(self.wiederholung & MONATLICH)
+
+    @property
+    def jaehrlich(self) -> bool:
+        return bool(self.wiederholung & JAEHRLICH)
+
+    @property
+    def regel(self) -> Regel | None:
+        return self.__spalten.regel(self.__id)
+
+    def __repr__(self) -> str:
+        return f"EventAnsicht(id={self.__id}, zeitpunkt={self.zeitpunkt!r}, akt={self.akt!r}, name={self.name!r})"
@@ -0,0 +1,858 @@
+"""
+Modul: m_speicher
+
+Austauschbare Speicher-Backends für den Eventmanager.
+Ein Backend lädt die gespeicherten Events und schreibt Änderungen (Erstellen, Entfernen, Verschieben).
+Enthalten sind das bisherige CSV-Format (optional mit Journal) und ein SQLite-Backend mit Zeitindex.
+Das CSV-Backend kann von mehreren Prozessen gleichzeitig benutzt werden, siehe m_mehrprozess.
+NachlaufSpeicher legt sich um ein Backend und schreibt dessen Änderungen gebündelt in einem Hintergrund-Thread.
+
+"""
+
+from scripts.m_datumzeit import Zeitpunkt
+from scripts.m_event import Event
+from scripts.m_journal import Journal
+from scripts.m_mehrprozess import Dateisperre, Stand, datei_kennung
+from scripts.m_wiederholung import Regel
+from csv import writer, reader
+from threading import Condition, Lock, Thread
+from time import monotonic
+from typing import NamedTuple
+import os
+import sqlite3
+
+
+def zeitstempel_parsen(text:str) -> list[int]:
+    """Liest einen Zeitstempel im Format "[J, M, T, h, m, s]" ohne ast.literal_eval.
+    :param text: Zeitstempel als Text.
+    :return: Liste [J, M, T, h, m, s].
+    :raises ValueError: Wenn der Text nicht aus sechs ganzen Zahlen besteht.
+    """
+    teile = text.strip().strip("[]").split(",")
+    if len(teile) != 6:
+        raise ValueError(f"Zeitstempel '{text}' hat nicht sechs Werte")
+    return list(map(int, teile))
+
+
+def regel_parsen(text:str) -> Regel | None:
+    """Liest eine Wiederholungsregel in der Textform von str(regel), eine leere Spalte bedeutet keine Regel.
+    :param text: Regel als Text.
+    :return: Regel oder None.
+    :raises ValueError: Bei ungültiger Regel.
+    """
+    return Regel.aus_text(text) if text else None
+
+
+def _nach_id(ev:Event) -> int:
+    """Sortierschlüssel beim Neuschreiben: Die Event-Liste hat keine feste Reihenfolge, Dateien werden nach ID geschrieben."""
+    return ev.id
+
+
+def bool_parsen(text:str) -> bool:
+    """Liest "True" oder "False".
+    :param text: Wahrheitswert als Text.
+    :return: bool
+    :raises ValueError: Bei anderen Werten.
+    """
+    if text == "True":
+        return True
+    if text == "False":
+        return False
+    raise ValueError(f"'{text}' ist kein Wahrheitswert")
+
+
+class Speicher:
+    """Schnittstelle für Speicher-Backends des Eventmanagers.
+    Ein geladenes Event wird als Tupel (event_id, [J, M, T, h, m, s], aktion, name, taeglich, monatlich, jaehrlich, regel) geliefert.
+    Eine Änderung ist ein Tupel (Art, Event) bzw. (ENTFERNT, Event-ID).
+    Änderungen anderer Prozesse werden als (ERSTELLT, geladenes Tupel), (VERSCHOBEN, (Event-ID, Zeit)) bzw. (ENTFERNT, Event-ID) geliefert,
+    ein ERSTELLT für eine bekannte ID ersetzt das Event.
+    ————————————Attribute: ————————————
+        naechste_id (int): Nächste freie Event-ID (Hochwassermarke), wird nach laden() gelesen und mit jedem erstellten Event fortgeschrieben.
+        ladefehler (list[str]): Beim letzten laden() übersprungene fehlerhafte Datensätze.
+        snapshot_pfad (str | None): Pfad für einen binären Snapshot (m_snapshot), None wenn das Backend keinen braucht.
+    ————————————Methoden: ————————————
+        laden() → Iterator[tuple]: Liefert alle gespeicherten Events.
+        quelldateien() → list[str]: Dateien, deren Stand ein Snapshot wiedergibt.
+        anwenden(aenderungen: list[tuple], events: list[Event]) → None: Speichert Änderungen.
+        ids_reservieren(anzahl: int, ab: int) → int: Reserviert freie Event-IDs, auch gegenüber anderen Prozessen.
+        stand_merken() → None: Merkt sich den aktuellen Stand der Dateien als bekannt, z.B. nach dem Laden eines Snapshots.
+        fremde_aenderungen(events: list[Event]) → list[tuple]: Änderungen anderer Prozesse seit dem zuletzt bekannten Stand.
+        fremd_geaendert() → bool: Ob andere Prozesse Änderungen gespeichert haben, die noch nicht abgeholt wurden.
+        ids_im_bereich(start: list[int], ende: list[int]) → list[int] | None: Event-IDs mit Fälligkeit in [start, ende[, None ohne Index.
+        frueheste_id() → int | None: ID des nächsten fälligen Events, None ohne Index.
+        sichern() → None: Schreibt ausstehende Änderungen sofort, bei Backends mit verzögertem Schreiben.
+        schliessen() → None: Gibt Dateien und Verbindungen frei.
+    """
+    ERSTELLT = Journal.ERSTELLT
+    ENTFERNT = Journal.ENTFERNT
+    VERSCHOBEN = Journal.VERSCHOBEN
+    naechste_id: int = 1
+    ladefehler: list[str] = []
+    snapshot_pfad: str | None = None
+
+    def laden(self):
+        """Liefert alle gespeicherten Events.
+        :return: Iterator über (event_id, zeit, aktion, name, taeglich, monatlich, jaehrlich, regel)-Tupel.
+        """
+        return iter(())
+
+    def anwenden(self, aenderungen:list[tuple], events:list[Event]) -> None:
+        """Speichert Änderungen.
+        :param aenderungen: Liste von (Art, Event)- bzw. (ENTFERNT, Event-ID)-Tupeln in Reihenfolge.
+        :param events: Aktueller vollständiger Zustand, für Backends, die alles neu schreiben.
+        """
+        self._id_stand_fortschreiben(aenderungen)
+
+    def _id_stand_fortschreiben(self, aenderungen:list[tuple]) -> bool:
+        """Erhöht naechste_id über die IDs neu erstellter Events.
+        :param aenderungen: Liste von Änderungs-Tupeln.
+        :return: True, wenn sich naechste_id geändert hat.
+        """
+        alt = self.naechste_id
+        for art, wert in aenderungen:
+            if art == self.ERSTELLT and wert.id >= self.naechste_id:
+                self.naechste_id = wert.id + 1
+        return self.naechste_id != alt
+
+    def quelldateien(self) -> list[str]:
+        """Gibt die Dateien zurück, aus denen laden() liest. Ein Snapshot gilt nur, solange diese unverändert sind.
+        :return: Liste der Pfade, leer ohne Dateien.
+        """
+        return []
+
+    def ids_reservieren(self, anzahl:int, ab:int) -> int:
+        """Reserviert anzahl aufeinanderfolgende Event-IDs, die kein anderer Prozess vergibt.
+        :param anzahl: Anzahl der benötigten IDs.
+        :param ab: Kleinste ID, die der Eventmanager vergeben würde.
+        :return: Erste reservierte ID, ohne andere Prozesse einfach ab.
+        """
+        return ab
+
+    def stand_merken(self) -> None:
+        """Merkt sich den aktuellen Stand der Dateien als bekannt, wenn der Zustand nicht über laden() kam (binärer Snapshot)."""
+        pass
+
+    def fremde_aenderungen(self, events:list[Event]) -> list[tuple]:
+        """Liefert die Änderungen, die andere Prozesse seit dem zuletzt bekannten Stand gespeichert haben, und merkt sich den neuen Stand.
+        :param events: Aktueller Zustand des Eventmanagers, falls nur ein Vergleich mit den Dateien möglich ist.
+        :return: Liste von Änderungs-Tupeln anderer Prozesse, leer ohne Änderungen.
+        """
+        return []
+
+    def fremd_geaendert(self) -> bool:
+        """Prüft ohne Sperre, ob andere Prozesse Änderungen gespeichert haben, die fremde_aenderungen() noch nicht geliefert hat.
+        :return: True, wenn der Zustand des Eventmanagers veraltet sein könnte.
+        """
+        return False
+
+    def ids_im_bereich(self, start:list[int], ende:list[int]) -> list[int] | None:
+        """Sucht die Event-IDs mit Fälligkeit im Bereich [start, ende[ über einen Index.
+        :param start: Beginn als [J, M, T, h, m, s].
+        :param ende: Ende (exklusiv) als [J, M, T, h, m, s].
+        :return: Sortierte Liste der Event-IDs, oder None wenn das Backend keinen Zeitindex hat.
+        """
+        return None
+
+    def frueheste_id(self) -> int | None:
+        """Sucht die ID des Events mit der frühesten Fälligkeit über einen Index.
+        :return: Event-ID, oder None wenn das Backend keinen Zeitindex hat oder leer ist.
+        """
+        return None
+
+    def sichern(self) -> None:
+        """Schreibt ausstehende Änderungen sofort. Backends, die in anwenden() direkt schreiben, tun nichts."""
+        pass
+
+    def schliessen(self) -> None:
+        """Gibt Dateien und Verbindungen frei."""
+        pass
+
+
+class CsvSpeicher(Speicher):
+    """Speichert die Events in der events.csv.
+    Ohne Journal wird die Datei bei jeder Änderung neu geschrieben,
+    mit Journal werden Änderungen angehängt und die CSV-Datei dient als Snapshot.
+    Die nächste freie Event-ID steht als zusätzliche Spalte "NaechsteID:<n>" in der Kopfzeile.
+    Die Spalte Regel enthält die Wiederholungsregel als Text, ältere Dateien ohne diese Spalte werden weiter gelesen.
+    Neben der CSV-Datei liegt der binäre Snapshot (events.snapshot), den der Eventmanager beim Beenden schreibt.
+    Mehrere Prozesse: Geschrieben wird unter einer exklusiven Dateisperre (events.lock), jeder Schreibvorgang erhöht
+    die Generation in events.stand. Hat ein anderer Prozess seit dem eigenen letzten Stand geschrieben, werden dessen
+    Änderungen vor dem Schreiben übernommen statt überschrieben: im Journal-Modus durch Nachlesen der neuen Journal-Datensätze
+    ab der zuletzt gelesenen Position, ohne Journal durch Einlesen der Datei und Vergleich mit der Event-Liste.
+    Die dabei gefundenen Änderungen holt der Eventmanager mit fremde_aenderungen() ab.
+    ————————————Attribute: ————————————
+        pfad (str): Pfad zur CSV-Datei.
+        journal (Journal | None): Journal für Änderungen, None für vollständiges Neuschreiben.
+        snapshot_pfad (str): Pfad zum binären Snapshot.
+        sperre (Dateisperre): Sperre für Lesen und Schreiben durch mehrere Prozesse.
+        stand (Stand): Generationszähler und nächste freie Event-ID über alle Prozesse.
+        generation (int): Generation, deren Zustand dieser Prozess kennt.
+    """
+    KOPF = ['EventID', 'Zeitstempel', 'Aktion', 'Name', 'Täglich ?', 'Monatlich ?', 'Jährlich ?', 'Regel']
+    ID_PRAEFIX = "NaechsteID:"
+
+    def __init__(self, pfad:str, journal_pfad:str | None = None) -> None:
+        """
+        :param pfad: Pfad zur CSV-Datei.
+        :param journal_pfad: Pfad zum Journal, None für den Modus ohne Journal.
+        """
+        basis = os.path.splitext(pfad)[0]
+        self.pfad = pfad
+        self.naechste_id = 1
+        self.sperre = Dateisperre(basis + ".lock")
+        self.stand = Stand(basis + ".stand")
+        self.generation = 0
+        self.journal: Journal | None = Journal(pfad, journal_pfad, sperre=self.sperre) if journal_pfad else None
+        self.snapshot_pfad = basis + ".snapshot"
+        self.__journal_position: tuple | None = None  # (Kennung der Journal-Datei, Byte-Position), bis zu der dieser Prozess gelesen hat
+        self.__fremd: list[tuple] = []  # gefundene, noch nicht abgeholte Änderungen anderer Prozesse
+
+    @staticmethod
+    def zeile(ev:Event) -> list:
+        """Wandelt ein Event in eine CSV-Zeile um.
+        :param ev: Event, das gespeichert werden soll.
+        :return: Liste mit den Spalten der CSV-Datei.
+        """
+        return [ev.id, str(ev.zeit), ev.akt, ev.name, str(ev.taeglich), str(ev.monatlich), str(ev.jaehrlich),
+                str(ev.regel) if ev.regel is not None else ""]
+
+    @staticmethod
+    def tupel_zeile(ergebnis:tuple) -> list:
+        """Wandelt ein geladenes Event-Tupel in eine CSV-Zeile um, wie zeile() für ein Event.
+        :param ergebnis: (event_id, zeit, aktion, name, taeglich, monatlich, jaehrlich, regel)
+        :return: Liste mit den Spalten der CSV-Datei.
+        """
+        event_id, zeit, aktion, name, taeglich, monatlich, jaehrlich, regel = ergebnis
+        return [event_id, str(zeit), aktion, name, str(taeglich), str(monatlich), str(jaehrlich), str(regel) if regel is not None else ""]
+
+    @staticmethod
+    def __tupel(ev:Event) -> tuple:
+        """Wandelt ein Event in ein Tupel wie von laden() um."""
+        return ev.id, ev.zeit, ev.akt, ev.name, ev.taeglich, ev.monatlich, ev.jaehrlich, ev.regel
+
+    @property
+    def kopf(self) -> list[str]:
+        """Gibt die Kopfzeile mit der aktuellen Hochwassermarke der Event-IDs zurück."""
+        return [*self.KOPF, f"{self.ID_PRAEFIX}{self.naechste_id}"]
+
+    def laden(self):
+        """Liest die CSV-Datei in einem Durchlauf und wendet im Journal-Modus die Journal-Datensätze an.
+        Das Journal wird vorab zu einem Endstand je Event-ID zusammengefasst, die CSV-Datei wird danach zeilenweise gestreamt.
+        Fehlerhafte Zeilen werden übersprungen und in ladefehler gesammelt.
+        Erstellt die Datei, falls sie nicht existiert, unter der exklusiven Sperre, damit nicht zwei Prozesse dieselbe temporäre Datei schreiben.
+        Liest unter der geteilten Sperre und merkt sich danach den geladenen Stand.
+        :return: Iterator über die geladenen Events als Tupel.
+        """
+        if not os.path.exists(self.pfad):
+            with self.sperre:
+                if not os.path.exists(self.pfad):
+                    self.__schreiben(())
+        with self.sperre.geteilt():
+            self.__fremd = []
+            yield from self.__laden()
+            self.__stand_merken()
+
+    def __laden(self):
+        """Liest CSV-Datei und Journal wie laden(), ohne Sperre. Eine fehlende CSV-Datei gilt als leer und wird nicht erstellt.
+        :return: Iterator über die geladenen Events als Tupel.
+        """
+        self.ladefehler = []
+        journal_stand, verschiebungen = self.__journal_zusammenfassen()
+        try:
+            with open(self.pfad, 'r', newline='', encoding='utf-8') as f:
+                csv_reader = reader(f)
+                kopf = next(csv_reader, [])
+                if kopf and kopf[-1].startswith(self.ID_PRAEFIX):
+                    self.naechste_id = max(self.naechste_id, int(kopf[-1][len(self.ID_PRAEFIX):]))
+                for row in csv_reader:
+                    if not row:
+                        continue
+                    ergebnis = self.__zeile_parsen(row, f"Zeile {csv_reader.line_num}")
+                    if ergebnis is None:
+                        continue
+                    event_id = ergebnis[0]
+                    self.naechste_id = max(self.naechste_id, event_id + 1)
+                    if event_id in journal_stand:  # Im Journal entfernt oder neu erstellt
+                        continue
+                    if event_id in verschiebungen:
+                        ergebnis = (event_id, verschiebungen[event_id], *ergebnis[2:])
+                    yield ergebnis
+        except FileNotFoundError:
+            pass
+        for ergebnis in journal_stand.values():
+            if ergebnis is not None:
+                yield ergebnis
+
+    def quelldateien(self) -> list[str]:
+        """Gibt die CSV-Datei und im Journal-Modus das aktuelle und ein evtl. rotiertes Journal zurück."""
+        if self.journal is None:
+            return [self.pfad]
+        return [self.pfad, self.journal.journal_pfad, self.journal.alt_pfad]
+
+    def __journal_zusammenfassen(self) -> tuple[dict, dict]:
+        """Fasst die Journal-Datensätze zu einem Endstand je Event-ID zusammen.
+        :return: (Endstand je im Journal erstellter oder entfernter ID (None = entfernt), Verschiebungen von Snapshot-Events).
+        """
+        journal_stand: dict[int, tuple | None] = {}
+        verschiebungen: dict[int, list[int]] = {}
+        if self.journal is None:
+            return journal_stand, verschiebungen
+        for nummer, datensatz in enumerate(self.journal.datensaetze(), start=1):
+            try:
+                art, event_id = datensatz[0], int(datensatz[1])
+                if art == Journal.ERSTELLT:
+                    ergebnis = self.__zeile_parsen(datensatz[1:], f"Journal-Datensatz {nummer}")
+                    if ergebnis is not None:
+                        journal_stand[event_id] = ergebnis
+                        verschiebungen.pop(event_id, None)
+                        self.naechste_id = max(self.naechste_id, event_id + 1)
+                elif art == Journal.ENTFERNT:
+                    journal_stand[event_id] = None
+                elif art == Journal.VERSCHOBEN:
+                    zeit = zeitstempel_parsen(datensatz[2])
+                    if journal_stand.get(event_id) is not None:
+                        journal_stand[event_id] = (event_id, zeit, *journal_stand[event_id][2:])
+                    elif event_id not in journal_stand:
+                        verschiebungen[event_id] = zeit
+                else:
+                    raise ValueError(f"unbekannte Art '{art}'")
+            except (ValueError, IndexError) as e:
+                self.ladefehler.append(f"Journal-Datensatz {nummer}: {e}")
+        return journal_stand, verschiebungen
+
+    def __zeile_parsen(self, row:list[str], ort:str) -> tuple | None:
+        """Wandelt eine CSV-Zeile in ein Event-Tupel um. Fehler werden in ladefehler gesammelt.
+        :param row: Spalten der Zeile.
+        :param ort: Beschreibung der Fundstelle für die Fehlermeldung.
+        :return: (event_id, zeit, aktion, name, taeglich, monatlich, jaehrlich, regel) oder None bei fehlerhafter Zeile.
+        """
+        try:
+            return (int(row[0]),
+                    zeitstempel_parsen(row[1]),
+                    row[2],
+                    row[3],
+                    bool_parsen(row[4]),
+                    bool_parsen(row[5]),
+                    bool_parsen(row[6]),
+                    regel_parsen(row[7] if len(row) > 7 else ""))
+        except (ValueError, IndexError) as e:
+            self.ladefehler.append(f"{ort}: {e}")
+            return None
+
+    def anwenden(self, aenderungen:list[tuple], events:list[Event]) -> None:
+        """Hängt die Änderungen unter der exklusiven Sperre an das Journal an oder schreibt ohne Journal die ganze CSV-Datei neu.
+        Hat ein anderer Prozess seit dem eigenen letzten Stand geschrieben, werden dessen Änderungen vorher gelesen und zum Abholen
+        gemerkt. Ohne Journal werden die eigenen Änderungen dann auf den Dateistand angewendet, statt die Datei mit der
+        eigenen Event-Liste zu überschreiben. Eine Verschiebung eines inzwischen entfernten Events entfällt, wie beim Journal.
+        Kompaktiert wird nur, solange keine fremden Änderungen ausstehen, sonst fehlten sie im neuen Snapshot.
+        :param aenderungen: Liste von (Art, Event)- bzw. (ENTFERNT, Event-ID)-Tupeln.
+        :param events: Aktueller vollständiger Zustand.
+        """
+        self._id_stand_fortschreiben(aenderungen)
+        with self.sperre:
+            generation, naechste_id = self.stand.lesen()
+            self.naechste_id = max(self.naechste_id, naechste_id)
+            fremd_geschrieben = generation != self.generation
+            if self.journal is None:
+                if fremd_geschrieben:
+                    zustand = {ergebnis[0]: ergebnis for ergebnis in self.__laden()}
+                    for art, wert in aenderungen:
+                        if art == self.ENTFERNT:
+                            zustand.pop(wert, None)
+                        elif art == self.ERSTELLT or wert.id in zustand:
+                            zustand[wert.id] = self.__tupel(wert)
+                    self.__schreiben((self.tupel_zeile(zustand[event_id]) for event_id in sorted(zustand)))
+                    self.__fremd.extend(self.__unterschiede(events, zustand))
+                else:
+                    self.__schreiben(map(self.zeile, sorted(events, key=_nach_id)))
+            else:
+                fremde = self.__journal_nachlesen() if fremd_geschrieben else []
+                self.journal.datei_pruefen()
+                for art, wert in aenderungen:
+                    if art == self.ERSTELLT:
+                        self.journal.anhaengen([art, *self.zeile(wert)])
+                    elif art == self.VERSCHOBEN:
+                        self.journal.anhaengen([art, wert.id, str(wert.zeit)])
+                    else:
+                        self.journal.anhaengen([art, wert])
+                if fremde is None:  # Journal wurde inzwischen von einem anderen Prozess kompaktiert
+                    fremde = self.__unterschiede(events, {ergebnis[0]: ergebnis for ergebnis in self.__laden()})
+                self.__fremd.extend(fremde)
+                if not self.__fremd and self.journal.kompaktierung_noetig:
+                    self.journal.kompaktieren(self.kopf, [self.zeile(ev) for ev in sorted(events, key=_nach_id)])
+            self.stand.schreiben(generation + 1, max(self.naechste_id, self.stand.naechste_id))
+            self.__stand_merken(lesen=False)
+
+    def ids_reservieren(self, anzahl:int, ab:int) -> int:
+        """Reserviert Event-IDs über die nächste freie ID in der Stand-Datei, damit zwei Prozesse nie dieselbe ID vergeben.
+        :param anzahl: Anzahl der benötigten IDs.
+        :param ab: Kleinste ID, die der Eventmanager vergeben würde.
+        :return: Erste reservierte ID.
+        """
+        with self.sperre:
+            generation, naechste_id = self.stand.lesen()
+            start = max(ab, naechste_id, self.naechste_id)
+            self.stand.schreiben(generation, start + anzahl)
+            return start
+
+    def stand_merken(self) -> None:
+        """Merkt sich Generation und Journal-Position als bekannt, z.B. wenn der Zustand aus dem binären Snapshot kam."""
+        with self.sperre.geteilt():
+            self.__fremd = []
+            self.__stand_merken()
+
+    def __stand_merken(self, lesen:bool = True) -> None:
+        """Übernimmt Generation und nächste freie ID aus der Stand-Datei und merkt sich das Ende des Journals. Nur unter der Sperre.
+        :param lesen: Bei False gilt der zuletzt gelesene oder geschriebene Stand, die Datei wird nicht erneut gelesen.
+        """
+        if lesen:
+            self.stand.lesen()
+        self.generation = self.stand.generation
+        self.naechste_id = max(self.naechste_id, self.stand.naechste_id)
+        if self.journal is not None:
+            pfad = self.journal.journal_pfad
+            self.__journal_position = (datei_kennung(pfad), os.path.getsize(pfad) if os.path.exists(pfad) else 0)
+
+    def fremde_aenderungen(self, events:list[Event]) -> list[tuple]:
+        """Liefert die Änderungen anderer Prozesse seit dem zuletzt bekannten Stand.
+        Ohne Änderung der Stand-Datei kostet das nur ein stat(). Im Journal-Modus werden nur die neuen Journal-Datensätze
+        gelesen, ohne Journal oder nach einer fremden Kompaktierung wird der Dateistand mit events verglichen.
+        :param events: Aktueller Zustand des Eventmanagers.
+        :return: Liste von Änderungs-Tupeln, siehe Speicher.
+        """
+        if self.stand.geaendert() or self.stand.generation != self.generation:
+            with self.sperre.geteilt():
+                self.stand.lesen()
+                if self.stand.generation != self.generation:
+                    fremde = self.__journal_nachlesen() if self.journal is not None else None
+                    if fremde is None:
+                        fremde = self.__unterschiede(events, {ergebnis[0]: ergebnis for ergebnis in self.__laden()})
+                    self.__fremd.extend(fremde)
+                    self.__stand_merken(lesen=False)
+        fremde, self.__fremd = self.__fremd, []
+        return fremde
+
+    def fremd_geaendert(self) -> bool:
+        """Prüft mit einem stat(), ob andere Prozesse seit dem bekannten Stand geschrieben haben oder Änderungen noch abzuholen sind."""
+        return bool(self.__fremd) or self.stand.geaendert() or self.stand.generation != self.generation
+
+    def __journal_nachlesen(self) -> list[tuple] | None:
+        """Liest die Journal-Datensätze, die seit der gemerkten Position angehängt wurden. Nur unter der Sperre.
+        Wurde das Journal inzwischen rotiert, wird das rotierte Journal ab der Position und das neue von Anfang an gelesen.
+        :return: Änderungs-Tupel, oder None wenn die gemerkte Position nicht mehr existiert (Kompaktierung abgeschlossen).
+        """
+        kennung, position = self.__journal_position or (None, 0)
+        if kennung is None:
+            return None
+        if kennung == datei_kennung(self.journal.journal_pfad):
+            datensaetze, _ = Journal.lesen_ab(self.journal.journal_pfad, position)
+        elif kennung == datei_kennung(self.journal.alt_pfad):
+            datensaetze, _ = Journal.lesen_ab(self.journal.alt_pfad, position)
+            datensaetze += Journal.lesen_ab(self.journal.journal_pfad, 0)[0]
+        else:
+            return None
+        aenderungen: list[tuple] = []
+        for nummer, datensatz in enumerate(datensaetze, start=1):
+            try:
+                art, event_id = datensatz[0], int(datensatz[1])
+                if art == Journal.ERSTELLT:
+                    ergebnis = self.__zeile_parsen(datensatz[1:], f"Nachgelesener Journal-Datensatz {nummer}")
+                    if ergebnis is not None:
+                        aenderungen.append((self.ERSTELLT, ergebnis))
+                        self.naechste_id = max(self.naechste_id, event_id + 1)
+                elif art == Journal.ENTFERNT:
+                    aenderungen.append((self.ENTFERNT, event_id))
+                elif art == Journal.VERSCHOBEN:
+                    aenderungen.append((self.VERSCHOBEN, (event_id, zeitstempel_parsen(datensatz[2]))))
+                else:
+                    raise ValueError(f"unbekannte Art '{art}'")
+            except (ValueError, IndexError) as e:
+                self.ladefehler.append(f"Nachgelesener Journal-Datensatz {nummer}: {e}")
+        return aenderungen
+
+    def __unterschiede(self, events:list[Event], zustand:dict[int, tuple]) -> list[tuple]:
+        """Vergleicht die Event-Liste mit einem eingelesenen Dateistand.
+        :param events: Zustand des Eventmanagers.
+        :param zustand: Dateistand, Event-ID → geladenes Tupel.
+        :return: (ERSTELLT, Tupel) für neue oder veränderte Events, (ENTFERNT, Event-ID) für fehlende.
+        """
+        eigene = {ev.id: ev for ev in events}
+        aenderungen: list[tuple] = []
+        for event_id, ergebnis in zustand.items():
+            ev = eigene.pop(event_id, None)
+            if ev is None or self.zeile(ev) != self.tupel_zeile(ergebnis):
+                aenderungen.append((self.ERSTELLT, ergebnis))
+        aenderungen.extend((self.ENTFERNT, event_id) for event_id in eigene)
+        return aenderungen
+
+    def __schreiben(self, zeilen) -> None:
+        """Schreibt alle Zeilen in eine temporäre Datei und ersetzt die CSV-Datei atomar.
+        Bei einem Absturz während des Schreibens bleibt die alte Datei vollständig erhalten.
+        :param zeilen: Iterable der zu speichernden CSV-Zeilen ohne Kopfzeile.
+        """
+        temp_pfad = self.pfad + ".tmp"
+        with open(temp_pfad, 'w', newline='', encoding='utf-8') as f:
+            csv_writer = writer(f)
+            csv_writer.writerow(self.kopf)
+            csv_writer.writerows(zeilen)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_pfad, self.pfad)
+
+    def schliessen(self) -> None:
+        """Kompaktiert im Journal-Modus ein nicht leeres Journal in die CSV-Datei und wartet darauf,
+        damit Eventmanager ohne Journal-Modus auf denselben Dateien alle Events sehen. Schließt danach Journal, Stand- und Sperrdatei.
+        Der Zustand wird unter der exklusiven Sperre aus CSV-Datei und Journal gelesen und enthält so auch Änderungen anderer Prozesse.
+        """
+        if self.journal is not None:
+            self.journal.warten()
+            with self.sperre:
+                if os.path.exists(self.journal.alt_pfad) or os.path.getsize(self.journal.journal_pfad) > 0:
+                    _, naechste_id = self.stand.lesen()
+                    self.naechste_id = max(self.naechste_id, naechste_id)
+                    zustand = sorted(self.__laden(), key=lambda ergebnis: ergebnis[0])
+                    self.journal.kompaktieren(self.kopf, [self.tupel_zeile(ergebnis) for ergebnis in zustand])
+            self.journal.schliessen()  # wartet auf das Schreiben der CSV-Datei, das die Sperre selbst nimmt
+        self.stand.schliessen()
+        self.sperre.schliessen()
+
+
+class SqliteSpeicher(Speicher):
+    """Speichert die Events in einer SQLite-Datenbank (WAL-Modus).
+    Die Fälligkeit wird als Ganzzahl JJJJMMTThhmmss gespeichert und ist zusammen mit der ID indiziert,
+    dadurch laufen Bereichsabfragen (z.B. "Events im Monat") und "nächstes fälliges Event" direkt über den Index.
+    Jede Änderung ist ein Schreibzugriff auf eine Zeile, mehrere Änderungen laufen in einer Transaktion.
+    Die nächste freie Event-ID wird in der Tabelle meta gespeichert.
+    Datenbanken ohne Spalte regel werden beim Öffnen ergänzt.
+    ————————————Attribute: ————————————
+        pfad (str): Pfad zur Datenbankdatei.
+    """
+    SQL_TABELLE = ("CREATE TABLE IF NOT EXISTS events ("
+                   "id INTEGER PRIMARY KEY, faellig INTEGER NOT NULL, aktion TEXT NOT NULL, name TEXT NOT NULL, "
+                   "taeglich INTEGER NOT NULL, monatlich INTEGER NOT NULL, jaehrlich INTEGER NOT NULL, regel TEXT)")
+    SQL_SPALTEN = "PRAGMA table_info(events)"
+    SQL_REGEL_SPALTE = "ALTER TABLE events ADD COLUMN regel TEXT"
+    SQL_INDEX = "CREATE INDEX IF NOT EXISTS events_faellig ON events (faellig, id)"
+    SQL_META = "CREATE TABLE IF NOT EXISTS meta (schluessel TEXT PRIMARY KEY, wert INTEGER NOT NULL)"
+    SQL_ID_LESEN = "SELECT wert FROM meta WHERE schluessel = 'naechste_id'"
+    SQL_ID_SCHREIBEN = "INSERT OR REPLACE INTO meta (schluessel, wert) VALUES ('naechste_id', ?)"
+    SQL_MAX_ID = "SELECT MAX(id) FROM events"
+    SQL_LADEN = "SELECT id, faellig, aktion, name, taeglich, monatlich, jaehrlich, regel FROM events ORDER BY id"
+    SQL_EINFUEGEN = ("INSERT OR REPLACE INTO events (id, faellig, aktion, name, taeglich, monatlich, jaehrlich, regel) "
+                     "VALUES (?, ?, ?, ?, ?, ?, ?, ?)")
+    SQL_ENTFERNEN = "DELETE FROM events WHERE id = ?"
+    SQL_VERSCHIEBEN = "UPDATE events SET faellig = ? WHERE id = ?"
+    SQL_BEREICH = "SELECT id FROM events WHERE faellig >= ? AND faellig < ? ORDER BY faellig, id"
+    SQL_NAECHSTES = "SELECT id FROM events ORDER BY faellig, id LIMIT 1"
+
+    def __init__(self, pfad:str) -> None:
+        """Öffnet bzw. erstellt die Datenbank.
+        :param pfad: Pfad zur Datenbankdatei.
+        """
+        self.pfad = pfad
+        self.__lock = Lock()
+        self.__verbindung = sqlite3.connect(pfad, check_same_thread=False)
+        self.__verbindung.execute("PRAGMA journal_mode=WAL")
+        self.__verbindung.execute("PRAGMA synchronous=NORMAL")
+        with self.__verbindung:
+            self.__verbindung.execute(self.SQL_TABELLE)
+            if "regel" not in (spalte[1] for spalte in self.__verbindung.execute(self.SQL_SPALTEN)):
+                self.__verbindung.execute(self.SQL_REGEL_SPALTE)
+            self.__verbindung.execute(self.SQL_INDEX)
+            self.__verbindung.execute(self.SQL_META)
+        zeile = self.__verbindung.execute(self.SQL_ID_LESEN).fetchone()
+        max_id = self.__verbindung.execute(self.SQL_MAX_ID).fetchone()[0]
+        self.naechste_id = max(zeile[0] if zeile else 1, (max_id or 0) + 1)
+
+    @staticmethod
+    def faelligkeit(zeit:list[int]) -> int:
+        """Wandelt [J, M, T, h, m, s] in die sortierbare Ganzzahl JJJJMMTThhmmss um."""
+        j, mo, t, h, mi, s = zeit
+        return ((((j * 100 + mo) * 100 + t) * 100 + h) * 100 + mi) * 100 + s
+
+    @staticmethod
+    def zeit_aus_faelligkeit(faellig:int) -> list[int]:
+        """Wandelt JJJJMMTThhmmss zurück in [J, M, T, h, m, s]."""
+        zeit = []
+        for _ in range(5):
+            faellig, rest = divmod(faellig, 100)
+            zeit.append(rest)
+        zeit.append(faellig)
+        return zeit[::-1]
+
+    def laden(self):
+        """Liest alle Events aus der Datenbank. Ungültige Regeln werden übersprungen und in ladefehler gesammelt.
+        :return: Iterator über die geladenen Events als Tupel.
+        """
+        self.ladefehler = []
+        with self.__lock:
+            zeilen = self.__verbindung.execute(self.SQL_LADEN).fetchall()
+        for event_id, faellig, aktion, name, taeglich, monatlich, jaehrlich, regel in zeilen:
+            try:
+                regel = regel_parsen(regel or "")
+            except ValueError as e:
+                self.ladefehler.append(f"Event-ID {event_id}: {e}")
+                continue
+            yield (event_id, self.zeit_aus_faelligkeit(faellig), aktion, name,
+                   bool(taeglich), bool(monatlich), bool(jaehrlich), regel)
+
+    def anwenden(self, aenderungen:list[tuple], events:list[Event]) -> None:
+        """Schreibt jede Änderung als einzelne Zeile, alle Änderungen in einer Transaktion.
+        :param aenderungen: Liste von (Art, Event)- bzw. (ENTFERNT, Event-ID)-Tupeln.
+        :param events: Wird nicht benötigt.
+        """
+        with self.__lock, self.__verbindung:
+            for art, wert in aenderungen:
+                if art == self.ERSTELLT:
+                    self.__verbindung.execute(self.SQL_EINFUEGEN, (
+                        wert.id, self.faelligkeit(wert.zeit), wert.akt, wert.name,
+                        int(wert.taeglich), int(wert.monatlich), int(wert.jaehrlich),
+                        str(wert.regel) if wert.regel is not None else None))
+                elif art == self.VERSCHOBEN:
+                    self.__verbindung.execute(self.SQL_VERSCHIEBEN, (self.faelligkeit(wert.zeit), wert.id))
+                else:
+                    self.__verbindung.execute(self.SQL_ENTFERNEN, (wert,))
+            if self._id_stand_fortschreiben(aenderungen):
+                self.__verbindung.execute(self.SQL_ID_SCHREIBEN, (self.naechste_id,))
+
+    def ids_im_bereich(self, start:list[int], ende:list[int]) -> list[int]:
+        """Sucht die Event-IDs mit Fälligkeit in [start, ende[ über den Index.
+        :param start: Beginn als [J, M, T, h, m, s].
+        :param ende: Ende (exklusiv) als [J, M, T, h, m, s].
+        :return: Nach Fälligkeit sortierte Liste der Event-IDs.
+        """
+        with self.__lock:
+            zeilen = self.__verbindung.execute(self.SQL_BEREICH, (self.faelligkeit(start), self.faelligkeit(ende))).fetchall()
+        return [zeile[0] for zeile in zeilen]
+
+    def frueheste_id(self) -> int | None:
+        """Sucht die ID des Events mit der frühesten Fälligkeit über den Index.
+        :return: Event-ID, oder None wenn keine Events gespeichert sind.
+        """
+        with self.__lock:
+            zeile = self.__verbindung.execute(self.SQL_NAECHSTES).fetchone()
+        return zeile[0] if zeile else None
+
+    def schliessen(self) -> None:
+        """Schließt die Datenbankverbindung."""
+        with self.__lock:
+            self.__verbindung.close()
+
+
+class EventStand(NamedTuple):
+    """Unveränderliche Momentaufnahme der gespeicherten Felder eines Events, mit denselben Attributen wie Event,
+    damit die Backends sie wie Events schreiben können."""
+    id: int
+    zeitpunkt: Zeitpunkt
+    akt: str
+    name: str
+    taeglich: bool
+    monatlich: bool
+    jaehrlich: bool
+    regel: Regel | None
+
+    @classmethod
+    def von(cls, ev:Event) -> "EventStand":
+        """Hält den aktuellen Stand eines Events fest."""
+        return cls(ev.id, ev.zeitpunkt, ev.akt, ev.name, ev.taeglich, ev.monatlich, ev.jaehrlich, ev.regel)
+
+    @property
+    def zeit(self) -> list[int]:
+        """Zeit als Liste [J, M, T, h, m, s] wie Event.zeit."""
+        return self.zeitpunkt.als_liste()
+
+
+class NachlaufSpeicher(Speicher):
+    """Schreibt die Änderungen eines anderen Backends verzögert in einem Hintergrund-Thread (write-behind).
+    anwenden() sammelt nur und kehrt sofort zurück. Eine Folge von Änderungen wird gebündelt geschrieben, sobald
+    verzoegerung Sekunden lang keine neue Änderung kam, spätestens aber max_verzoegerung Sekunden nach der ersten.
+    Änderungen und Zustand werden schon in anwenden() auf dem aufrufenden Thread als EventStand festgehalten,
+    der Hintergrund-Thread sieht keine später geänderten Events. Den Zustand führt der NachlaufSpeicher selbst
+    je Event-ID mit den Änderungen nach, nur nach Änderungen anderer Prozesse wird er aus der Event-Liste neu aufgebaut.
+    Schlägt das Schreiben fehl,
+    bleiben die Änderungen erhalten und werden im nächsten Fenster erneut geschrieben.
+    Beim Schließen wird alles Ausstehende geschrieben.
+    ————————————Attribute: ————————————
+        speicher (Speicher): Backend, das tatsächlich schreibt.
+        verzoegerung (float): Ruhezeit in Sekunden, nach der gesammelte Änderungen geschrieben werden.
+        max_verzoegerung (float): Höchstens so viele Sekunden nach der ersten Änderung wird geschrieben.
+        letzter_fehler (Exception | None): Fehler des letzten fehlgeschlagenen Schreibens, None nach Erfolg.
+    """
+
+    def __init__(self, speicher:Speicher, verzoegerung:float = 0.5, max_verzoegerung:float | None = None) -> None:
+        """Startet den Schreib-Thread.
+        :param speicher: Backend, das tatsächlich schreibt.
+        :param verzoegerung: Ruhezeit in Sekunden.
+        :param max_verzoegerung: Obergrenze der Verzögerung in Sekunden, ohne Angabe das Zehnfache der Ruhezeit.
+        """
+        self.speicher = speicher
+        self.verzoegerung = verzoegerung
+        self.max_verzoegerung = max_verzoegerung if max_verzoegerung is not None else 10 * verzoegerung
+        self.snapshot_pfad = speicher.snapshot_pfad
+        self.letzter_fehler: Exception | None = None
+        self.__bedingung = Condition(Lock())
+        self.__aenderungen: list[tuple] = []
+        self.__stand: dict[int, EventStand] | None = None  # Zustand nach allen gemeldeten Änderungen, None = beim nächsten anwenden() aufbauen
+        self.__erste: float | None = None  # monotonic() der ersten ausstehenden Änderung
+        self.__letzte: float = 0.0  # monotonic() der letzten Änderung
+        self.__schreibt = False
+        self.__sofort = False
+        self.__fehlversuche = 0
+        self.__geschlossen = False
+        self.__thread = Thread(target=self.__schreiben_im_hintergrund, name="speicher-nachlauf", daemon=True)
+        self.__thread.start()
+
+    @property
+    def naechste_id(self) -> int:
+        """Hochwassermarke der Event-IDs des Backends."""
+        return self.speicher.naechste_id
+    @naechste_id.setter
+    def naechste_id(self, wert:int) -> None:
+        self.speicher.naechste_id = wert
+
+    @property
+    def ladefehler(self) -> list[str]:
+        """Beim Laden übersprungene Datensätze des Backends."""
+        return self.speicher.ladefehler
+
+    def laden(self):
+        """Lädt über das Backend, siehe Speicher.laden()."""
+        with self.__bedingung:
+            self.__stand = None
+        return self.speicher.laden()
+
+    def quelldateien(self) -> list[str]:
+        """Gibt die Quelldateien des Backends zurück."""
+        return self.speicher.quelldateien()
+
+    def ids_reservieren(self, anzahl:int, ab:int) -> int:
+        """Reserviert Event-IDs über das Backend, siehe Speicher.ids_reservieren()."""
+        return self.speicher.ids_reservieren(anzahl, ab)
+
+    def stand_merken(self) -> None:
+        """Merkt sich den Stand über das Backend, siehe Speicher.stand_merken()."""
+        self.speicher.stand_merken()
+
+    def fremde_aenderungen(self, events:list[Event]) -> list[tuple]:
+        """Fragt das Backend nach Änderungen anderer Prozesse, solange nichts aussteht.
+        Sonst leer: Ein Vergleich mit den Dateien hielte die noch nicht geschriebenen eigenen Änderungen für fremde.
+        Das Backend findet die fremden Änderungen dann beim nächsten Schreiben.
+        """
+        with self.__bedingung:
+            if self.__aenderungen or self.__schreibt:
+                return []
+            fremde = self.speicher.fremde_aenderungen(events)  # unter der Sperre, damit der Schreib-Thread nicht dazwischen beginnt
+            if fremde:
+                self.__stand = None  # der Eventmanager übernimmt sie in seine Liste, daraus wird der Zustand neu aufgebaut
+            return fremde
+
+    def fremd_geaendert(self) -> bool:
+        """Fragt das Backend, siehe Speicher.fremd_geaendert()."""
+        return self.speicher.fremd_geaendert()
+
+    def anwenden(self, aenderungen:list[tuple], events:list[Event]) -> None:
+        """Hält die Änderungen als EventStand fest, merkt sie sich für den Schreib-Thread und kehrt sofort zurück.
+        :param aenderungen: Liste von (Art, Event)- bzw. (ENTFERNT, Event-ID)-Tupeln.
+        :param events: Aktuelle Event-Liste, wird nur gelesen, wenn der eigene Zustand neu aufgebaut werden muss.
+        """
+        festgehalten = [(art, wert if art == self.ENTFERNT else EventStand.von(wert)) for art, wert in aenderungen]
+        with self.__bedingung:
+            jetzt = monotonic()
+            self.__aenderungen.extend(festgehalten)
+            if self.__stand is None:
+                self.__stand = {ev.id: EventStand.von(ev) for ev in events}
+            else:
+                for art, wert in festgehalten:
+                    if art == self.ENTFERNT:
+                        self.__stand.pop(wert, None)
+                    else:
+                        self.__stand[wert.id] = wert
+            if self.__erste is None:
+                self.__erste = jetzt
+            self.__letzte = jetzt
+            self.__bedingung.notify_all()
+
+    @property
+    def ausstehend(self) -> int:
+        """Gibt die Anzahl der noch nicht geschriebenen Änderungen zurück."""
+        with self.__bedingung:
+            return len(self.__aenderungen)
+
+    def __schreiben_im_hintergrund(self) -> None:
+        """Schreib-Thread: wartet das Bündelungsfenster ab und schreibt die gesammelten Änderungen über das Backend."""
+        while True:
+            with self.__bedingung:
+                while True:
+                    if self.__aenderungen:
+                        faellig = min(self.__letzte + self.verzoegerung, self.__erste + self.max_verzoegerung)
+                        rest = faellig - monotonic()
+                        if rest <= 0 or self.__sofort or self.__geschlossen:
+                            break
+                        self.__bedingung.wait(rest)
+                    elif self.__geschlossen:
+                        return
+                    else:
+                        self.__bedingung.wait()
+                aenderungen, stand = self.__aenderungen, list(self.__stand.values())
+                self.__aenderungen, self.__erste = [], None
+                self.__schreibt = True
+            try:
+                self.speicher.anwenden(aenderungen, stand)
+                fehler = None
+            except Exception as e:
+                fehler = e
+            with self.__bedingung:
+                self.__schreibt = False
+                self.letzter_fehler = fehler
+                if fehler is not None:
+                    print(f"Änderungen konnten nicht gespeichert werden, neuer Versuch folgt: {str(fehler).strip()}\n")
+                    self.__aenderungen[:0] = aenderungen
+                    self.__erste = self.__letzte = monotonic()
+                    self.__fehlversuche += 1
+                self.__bedingung.notify_all()
+                if fehler is not None and self.__geschlossen:
+                    return
+
+    def sichern(self, timeout:float | None = None) -> None:
+        """Schreibt ausstehende Änderungen sofort und wartet, bis sie geschrieben sind.
+        :param timeout: Höchstens so viele Sekunden warten, None für unbegrenzt.
+        :raises Exception: Wenn das Schreiben fehlschlägt oder der Timeout abläuft.
+        """
+        with self.__bedingung:
+            fehlversuche = self.__fehlversuche
+            self.__sofort = True
+            self.__bedingung.notify_all()
+            fertig = self.__bedingung.wait_for(
+                lambda: (not self.__aenderungen and not self.__schreibt) or self.__fehlversuche > fehlversuche, timeout)
+            self.__sofort = False
+            if self.__fehlversuche > fehlversuche:
+                raise Exception(f"Fehler beim Speichern: {str(self.letzter_fehler).strip()}\n")
+            if not fertig:
+                raise Exception("Zeitüberschreitung beim Speichern.\n")
+
+    def ids_im_bereich(self, start:list[int], ende:list[int]) -> list[int] | None:
+        """Fragt den Index des Backends ab, solange nichts aussteht. Sonst None, der Eventmanager sucht dann selbst."""
+        with self.__bedingung:
+            if self.__aenderungen or self.__schreibt:
+                return None
+            return self.speicher.ids_im_bereich(start, ende)  # unter der Sperre, damit der Schreib-Thread nicht dazwischen beginnt
+
+    def frueheste_id(self) -> int | None:
+        """Fragt den Index des Backends ab, solange nichts aussteht. Sonst None, der Eventmanager nutzt dann den Planer."""
+        with self.__bedingung:
+            if self.__aenderungen or self.__schreibt:
+                return None
+            return self.speicher.frueheste_id()  # unter der Sperre, damit der Schreib-Thread nicht dazwischen beginnt
+
+    def schliessen(self) -> None:
+        """Schreibt alles Ausstehende, beendet den Schreib-Thread und schließt das Backend.
+        :raises Exception: Wenn ausstehende Änderungen nicht geschrieben werden konnten.
+        """
+        with self.__bedingung:
+            self.__geschlossen = True
+            self.__bedingung.notify_all()
+        self.__thread.join()
+        self.speicher.schliessen()
+        if self.__aenderungen:
+            raise Exception(f"{len(self.__aenderungen)} Änderungen konnten nicht gespeichert werden: {str(self.letzter_fehler).strip()}\n")
@@ -1,5 +1,17 @@
-from scripts.m_datumzeit import Datumzeit
+"""
+Modul: m_wecker_termine
+
+Wecker und Termine des Kalenders sowie der WeckerPlaner, der sie zur richtigen Zeit auslöst.
+Der Planer hält die Weckzeiten in einem Min-Heap, entfernte oder verschobene Wecker werden erst beim Herausnehmen verworfen.
+Geweckt wird er wie der Eventmanager über einen Planer-Callback genau zur nächsten Fälligkeit, nicht in einem festen Takt.
+
+"""
+
+from scripts.m_datumzeit import Datumzeit, Zeitpunkt
 from scripts.m_eventman import Eventman as em
+from itertools import count
+from time import time
+import heapq
 
 class Wecker:
     def __init__(self,dz:Datumzeit,em:em):
@@ -23,7 +35,7 @@ class Wecker:
         if not (1 <= tag <= 31):
             print("Ungültiger Tag!")
             return
-        if not (0 <= stunde < 60):
+        if not (0 <= stunde < 24):
             print("Ungültige Stunde!")
             return
         if not (0 <= minute < 60):
@@ -36,6 +48,7 @@ class Wecker:
         self._datumzeit.jahr = jahr
         self._datumzeit.monat = monat
         self._datumzeit.tag = tag
+        self._datumzeit.stunde = stunde
         self._datumzeit.minute = minute
         self._datumzeit.sekunde = sekunde
         
@@ -44,35 +57,11 @@ class Wecker:
 
     def schlummermodus(self, minuten: int, stunden:int) -> None:
         """ Funktion, die es erlaubt, die Uhrzeit des Weckers neu einzustellen, so dass er später erneut aktiviert wird. """
-        # Holt aktuelle Zeit
-        aktuelle_zeit = self._datumzeit
-
-        # Neue Zeit berechnen: Alles bleibt gleich, nur Minuten und Stunden werden erhöht
-        neue_minute = self._datumzeit.minute + minuten
-        neue_stunde = self._datumzeit.stunde + stunden
-        neue_tag = self._datumzeit.tag
-        neue_monat = self._datumzeit.monat
-        neue_jahr = self._datumzeit.jahr
-
-
-        # Minutenüberlauf berücksichtigen
-        if neue_minute >= 60:
-            neue_minute -= 60
-            neue_stunde += 1
-
-        # Stundenüberlauf berücksichtigen
-        if neue_stunde >= 24:
-            neue_stunde = 0
-            neue_tag += 1
-
-        self._datumzeit.set_datumzeit(
-            jahr=neue_jahr,
-            monat=neue_monat,
-            tag=neue_tag,
-            minute=neue_minute
-        )
-
-        print(f"Wecker in Schlummermodus neuer Alarm um {neue_stunde:02}:{neue_minute:02} Uhr.")
+        # Neue Zeit über die Kalenderarithmetik berechnen, Über- und Unterläufe von Minute, Stunde, Tag, Monat und Jahr inklusive
+        neue_zeit = self._datumzeit.zeitpunkt().plus_sekunden(stunden * 3600 + minuten * 60)
+        self._datumzeit.setze_zeitpunkt(neue_zeit)
+
+        print(f"Wecker in Schlummermodus neuer Alarm um {neue_zeit.stunde:02}:{neue_zeit.minute:02} Uhr.")
     
 
 class Termine(Wecker):
@@ -80,6 +69,134 @@ class Termine(Wecker):
         super().__init__(dz,em)
 
 
+class WeckerPlaner:
+    """Plant Wecker (und Termine) in einem Min-Heap nach ihrer Weckzeit.
+    Einplanen, Verschieben und Schlummern kosten O(log n), Entfernen O(1). Der alte Heap-Eintrag eines verschobenen
+    oder entfernten Weckers bleibt liegen und wird erst beim Herausnehmen übersprungen.
+    Ein Aufruf von ausloesen() ohne fällige Wecker kostet O(1), die Anzahl der Wecker spielt für den Takt keine Rolle.
+    ————————————Attribute: ————————————
+        __heap (list[tuple[int, int, Wecker]]): (Sekunden, laufende Nummer, Wecker), die Nummer verhindert Vergleiche der Wecker.
+        __geplant (dict[Wecker, tuple]): Aktueller Heap-Eintrag je Wecker. Veraltete Einträge im Heap werden beim Herausnehmen übersprungen.
+        bei_alarm (callable | None): Wird mit jedem fälligen Wecker aufgerufen.
+        planer_callback (callable | None): Wird mit der Verzögerung in Sekunden bis zur nächsten Fälligkeit aufgerufen (z.B. Clock.schedule_once in der App).
+    ————————————Methoden: ————————————
+        planen(wecker: Wecker) → None: Plant einen Wecker zu seiner Weckzeit ein bzw. verschiebt ihn dorthin.
+        entfernen(wecker: Wecker) → bool: Nimmt einen Wecker aus der Planung.
+        schlummern(wecker: Wecker, minuten: int, stunden: int) → None: Verschiebt einen Wecker per Schlummermodus und plant ihn neu.
+        naechste_faelligkeit() → float | None: Sekunden bis zum nächsten fälligen Wecker.
+        ausloesen() → list[Wecker]: Nimmt alle fälligen Wecker aus der Planung und meldet sie.
+    """
+    MAX_SCHLAFZEIT = 3600  # Sekunden, nach denen der Planer spätestens erneut geweckt wird (Schutz gegen Änderungen der Systemzeit)
+
+    def __init__(self, bei_alarm=None) -> None:
+        """
+        :param bei_alarm: Wird mit jedem fälligen Wecker aufgerufen (optional).
+        """
+        self.__heap: list[tuple[int, int, Wecker]] = []
+        self.__geplant: dict[Wecker, tuple] = {}
+        self.__nummern = count()
+        self.__planer_callback = None
+        self.bei_alarm = bei_alarm
+
+    def __len__(self) -> int:
+        """Gibt die Anzahl der geplanten Wecker zurück."""
+        return len(self.__geplant)
+
+    def __contains__(self, wecker:Wecker) -> bool:
+        """Prüft, ob ein Wecker geplant ist."""
+        return wecker in self.__geplant
+
+    @property
+    def planer_callback(self):
+        """Gibt die Funktion zurück, mit der das nächste Wecken des Planers angefordert wird.
+        :return: Callable, das die Verzögerung in Sekunden (oder None) erhält, sonst None.
+        """
+        return self.__planer_callback
+    @planer_callback.setter
+    def planer_callback(self, callback) -> None:
+        if callback is not None and not callable(callback):
+            raise TypeError("planer_callback muss aufrufbar sein.")
+        self.__planer_callback = callback
+        self.__neu_planen()
+
+    def planen(self, wecker:Wecker) -> None:
+        """Plant einen Wecker zu seiner aktuellen Weckzeit ein. Ein schon geplanter Wecker wird dorthin verschoben.
+        :param wecker: Wecker oder Termin.
+        """
+        eintrag = (wecker.get_datumzeit().zeitpunkt().sekunden, next(self.__nummern), wecker)
+        self.__geplant[wecker] = eintrag
+        heapq.heappush(self.__heap, eintrag)
+        if len(self.__heap) > 2 * len(self.__geplant) + 64:
+            # Zu viele veraltete Einträge: Heap aus den gültigen Einträgen neu aufbauen
+            self.__heap = list(self.__geplant.values())
+            heapq.heapify(self.__heap)
+        self.__neu_planen()
+
+    def entfernen(self, wecker:Wecker) -> bool:
+        """Nimmt einen Wecker aus der Planung. Der Heap-Eintrag wird erst beim Herausnehmen verworfen.
+        :param wecker: Wecker oder Termin.
+        :return: True, wenn der Wecker geplant war.
+        """
+        return self.__geplant.pop(wecker, None) is not None
+
+    def schlummern(self, wecker:Wecker, minuten:int, stunden:int = 0) -> None:
+        """Verschiebt einen Wecker per Schlummermodus und plant ihn neu ein, auch wenn er schon ausgelöst wurde.
+        :param wecker: Wecker oder Termin.
+        :param minuten: Minuten bis zum erneuten Wecken.
+        :param stunden: Stunden bis zum erneuten Wecken.
+        """
+        wecker.schlummermodus(minuten, stunden)
+        self.planen(wecker)
+
+    def __naechster_eintrag(self) -> tuple | None:
+        """Gibt den frühesten gültigen Heap-Eintrag zurück und verwirft dabei veraltete Einträge.
+        :return: (Sekunden, Nummer, Wecker) oder None, wenn kein Wecker geplant ist.
+        """
+        while self.__heap:
+            eintrag = self.__heap[0]
+            if self.__geplant.get(eintrag[2]) is eintrag:
+                return eintrag
+            heapq.heappop(self.__heap)
+        return None
+
+    def naechste_faelligkeit(self) -> float | None:
+        """Berechnet die Zeit bis zum nächsten fälligen Wecker.
+        :return: Verzögerung in Sekunden (mindestens 0), oder None, wenn kein Wecker geplant ist.
+        """
+        eintrag = self.__naechster_eintrag()
+        if eintrag is None:
+            return None
+        jetzt = time()
+        return max(0.0, eintrag[0] - Zeitpunkt.jetzt(jetzt).sekunden - (jetzt % 1))
+
+    def __neu_planen(self) -> None:
+        """Teilt dem Planer-Callback mit, wann ausloesen() das nächste Mal aufgerufen werden soll."""
+        if self.__planer_callback is None:
+            return
+        verzoegerung = self.naechste_faelligkeit()
+        if verzoegerung is not None:
+            verzoegerung = min(verzoegerung, self.MAX_SCHLAFZEIT)
+        self.__planer_callback(verzoegerung)
+
+    def ausloesen(self, *args) -> list[Wecker]:
+        """Nimmt alle fälligen Wecker aus der Planung, ruft für jeden bei_alarm auf und plant das nächste Wecken.
+        Ein ausgelöster Wecker ist danach nicht mehr geplant, schlummern() plant ihn wieder ein.
+        :param args: Wird hier gebraucht für die Timeout-Zeit von schedule_once() in der App.
+        :return: Die fälligen Wecker in Reihenfolge ihrer Weckzeit.
+        """
+        jetzt = Zeitpunkt.jetzt().sekunden
+        faellig: list[Wecker] = []
+        while (eintrag := self.__naechster_eintrag()) is not None and eintrag[0] <= jetzt:
+            heapq.heappop(self.__heap)
+            del self.__geplant[eintrag[2]]
+            faellig.append(eintrag[2])
+        if self.bei_alarm is not None:
+            for wecker in faellig:
+                self.bei_alarm(wecker)
+        self.__neu_planen()
+        return faellig
+
+
 if __name__ == '__main__':
     eventmanager = em()
     dz = Datumzeit()
@@ -0,0 +1,203 @@
+"""
+Modul: m_wiederholung
+
+Wiederholungsregeln für Events (täglich, wöchentlich, monatlich, jährlich) mit Intervall, Anzahl, Enddatum und Wochentagen.
+Das n-te Vorkommen und "nächstes Vorkommen nach t" werden direkt berechnet (O(1) bzw. O(log k) bei Wochentagen),
+verpasste Vorkommen lassen sich dadurch in einem Schritt überspringen.
+Vorkommen in einem Zeitraum werden als Generator geliefert und nie vollständig erzeugt.
+
+"""
+
+from bisect import bisect_left
+from scripts.m_datumzeit import Zeitpunkt
+from scripts import m_kalendermathe as km
+
+
+class Regel:
+    """Wiederholungsregel mit festem Ankerzeitpunkt (erstes Vorkommen).
+    ————————————Attribute: ————————————
+        frequenz (str): "taeglich", "woechentlich", "monatlich" oder "jaehrlich".
+        start (Zeitpunkt): Anker der Regel, alle Vorkommen werden von hier aus gezählt.
+        intervall (int): Jedes wievielte Vorkommen der Frequenz gilt (2 = jede zweite Woche).
+        anzahl (int | None): Gesamtzahl der Vorkommen ab start, None für unbegrenzt.
+        bis (Zeitpunkt | None): Letzter erlaubter Zeitpunkt (einschließlich), None für unbegrenzt.
+        wochentage (tuple[int] | None): Nur bei "woechentlich": Wochentage 0 = Montag … 6 = Sonntag.
+    ————————————Methoden: ————————————
+        vorkommen_nr(n: int) → Zeitpunkt | None: n-tes Vorkommen (ab 0).
+        naechstes_nach(t: Zeitpunkt) → Zeitpunkt | None: Erstes Vorkommen echt nach t.
+        vorkommen(von: Zeitpunkt, bis: Zeitpunkt) → Iterator[Zeitpunkt]: Vorkommen in [von, bis[.
+        phasen() → tuple[tuple[str, int], tuple[int, ...]]: Raster und Phasen der Vorkommen für Bereichsindizes.
+        aus_text(text: str) → Regel: Liest die mit str() erzeugte Textform.
+    """
+    FREQUENZEN = ("taeglich", "woechentlich", "monatlich", "jaehrlich")
+    MONAT = 31 * km.SEKUNDEN_PRO_TAG  # Länge eines Monats im Monats- und Jahresraster von phasen()
+
+    def __init__(
+            self,
+            frequenz:str,
+            start:Zeitpunkt,
+            intervall:int = 1,
+            anzahl:int | None = None,
+            bis:Zeitpunkt | None = None,
+            wochentage = None):
+        if frequenz not in self.FREQUENZEN:
+            raise ValueError(f"Ungültige Frequenz '{frequenz}'. Gültig: {self.FREQUENZEN}")
+        if not isinstance(start, Zeitpunkt):
+            raise TypeError("start muss ein Zeitpunkt sein.")
+        if not isinstance(intervall, int) or intervall < 1:
+            raise ValueError("intervall muss eine ganze Zahl >= 1 sein.")
+        if anzahl is not None and anzahl < 1:
+            raise ValueError("anzahl muss >= 1 sein.")
+        if wochentage is not None:
+            if frequenz != "woechentlich":
+                raise ValueError("wochentage sind nur bei wöchentlicher Wiederholung erlaubt.")
+            wochentage = tuple(sorted(set(wochentage)))
+            if not wochentage or not all(0 <= tag <= 6 for tag in wochentage):
+                raise ValueError("wochentage müssen Werte von 0 (Montag) bis 6 (Sonntag) enthalten.")
+        self.frequenz = frequenz
+        self.start = start
+        self.intervall = intervall
+        self.anzahl = anzahl
+        self.bis = bis
+        self.wochentage = wochentage
+        # Vorberechnete Werte für die direkten Berechnungen
+        self.__tag, self.__uhrzeit = divmod(start.sekunden, km.SEKUNDEN_PRO_TAG)
+        if frequenz == "taeglich":
+            self.__periode = intervall * km.SEKUNDEN_PRO_TAG
+        elif frequenz == "woechentlich" and wochentage is None:
+            self.__periode = 7 * intervall * km.SEKUNDEN_PRO_TAG
+        else:
+            self.__periode = None
+        self.__monate = intervall * (12 if frequenz == "jaehrlich" else 1)
+        if wochentage is not None:
+            start_wochentag = km.wochentag_aus_ordinal(self.__tag + 1)
+            self.__montag = self.__tag - start_wochentag
+            self.__erste_woche = tuple(tag for tag in wochentage if tag >= start_wochentag)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Regel):
+            return NotImplemented
+        return str(self) == str(other)
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+    def __str__(self) -> str:
+        teile = [self.frequenz, f"start={self.start.sekunden}", f"intervall={self.intervall}"]
+        if self.anzahl is not None:
+            teile.append(f"anzahl={self.anzahl}")
+        if self.bis is not None:
+            teile.append(f"bis={self.bis.sekunden}")
+        if self.wochentage is not None:
+            teile.append("wochentage=" + ",".join(str(tag) for tag in self.wochentage))
+        return ";".join(teile)
+
+    def __repr__(self) -> str:
+        return f"Regel.aus_text('{self}')"
+
+    @classmethod
+    def aus_text(cls, text:str) -> "Regel":
+        """Liest eine Regel in der Textform von str(regel).
+        :raises ValueError: bei unbekannten oder fehlenden Angaben
+        """
+        frequenz, *teile = text.strip().split(";")
+        werte = dict(teil.split("=", 1) for teil in teile)
+        if "start" not in werte:
+            raise ValueError(f"Regel '{text}' ohne start")
+        return cls(
+            frequenz,
+            Zeitpunkt(int(werte["start"])),
+            intervall=int(werte.get("intervall", 1)),
+            anzahl=int(werte["anzahl"]) if "anzahl" in werte else None,
+            bis=Zeitpunkt(int(werte["bis"])) if "bis" in werte else None,
+            wochentage=[int(tag) for tag in werte["wochentage"].split(",")] if "wochentage" in werte else None)
+
+    def __roh_nr(self, n:int) -> int:
+        """Sekunden des n-ten Vorkommens ohne Prüfung von anzahl und bis."""
+        if self.__periode is not None:
+            return self.start.sekunden + n * self.__periode
+        if self.wochentage is None:
+            return km.plus_monate(self.start.sekunden, n * self.__monate)
+        erste = len(self.__erste_woche)
+        if n < erste:
+            tag = self.__montag + self.__erste_woche[n]
+        else:
+            woche, rest = divmod(n - erste, len(self.wochentage))
+            tag = self.__montag + 7 * self.intervall * (woche + 1) + self.wochentage[rest]
+        return tag * km.SEKUNDEN_PRO_TAG + self.__uhrzeit
+
+    def __anzahl_bis(self, t:int) -> int:
+        """Anzahl der Vorkommen <= t ohne Prüfung von anzahl und bis, direkt berechnet."""
+        if t < self.__roh_nr(0):
+            return 0
+        if self.__periode is not None:
+            return (t - self.start.sekunden) // self.__periode + 1
+        if self.wochentage is None:
+            jahr, monat, _ = km.aus_ordinal(t // km.SEKUNDEN_PRO_TAG + 1)
+            start_jahr, start_monat, _ = km.aus_ordinal(self.__tag + 1)
+            n = km.monatsdifferenz(jahr, monat, start_jahr, start_monat) // self.__monate
+            return n + 1 if self.__roh_nr(n) <= t else n
+        t_tag, t_uhrzeit = divmod(t, km.SEKUNDEN_PRO_TAG)
+        woche = (t_tag - self.__montag) // 7
+        block, rest = divmod(woche, self.intervall)
+        if block == 0:
+            vorher, kandidaten = 0, self.__erste_woche
+        else:
+            vorher, kandidaten = len(self.__erste_woche) + (block - 1) * len(self.wochentage), self.wochentage
+        if rest:  # Woche ohne Vorkommen, der ganze Block liegt vor t
+            return vorher + len(kandidaten)
+        wochentag = t_tag - self.__montag - 7 * woche
+        gleich = 1 if wochentag in kandidaten and self.__uhrzeit <= t_uhrzeit else 0
+        return vorher + bisect_left(kandidaten, wochentag) + gleich
+
+    def __gueltig(self, n:int, sekunden:int) -> bool:
+        """Prüft anzahl und bis für das n-te Vorkommen."""
+        return (self.anzahl is None or n < self.anzahl) and (self.bis is None or sekunden <= self.bis.sekunden)
+
+    def vorkommen_nr(self, n:int) -> Zeitpunkt | None:
+        """Gibt das n-te Vorkommen (ab 0) zurück.
+        :return: Zeitpunkt oder None, wenn die Regel vorher endet.
+        """
+        sekunden = self.__roh_nr(n)
+        return Zeitpunkt(sekunden) if n >= 0 and self.__gueltig(n, sekunden) else None
+
+    def naechstes_nach(self, t:Zeitpunkt) -> Zeitpunkt | None:
+        """Berechnet das erste Vorkommen echt nach t, ohne die Vorkommen dazwischen zu durchlaufen.
+        :param t: Zeitpunkt, z.B. jetzt beim Nachholen verpasster Vorkommen.
+        :return: Zeitpunkt oder None, wenn die Regel bis dahin endet.
+        """
+        return self.vorkommen_nr(self.__anzahl_bis(t.sekunden))
+
+    def phasen(self) -> tuple[tuple[str, int], tuple[int, ...]]:
+        """Gibt das Raster, in dem sich die Vorkommen wiederholen, und ihre Phasen darin zurück, z.B. für den Zeitindex.
+        ("sekunden", P): Vorkommen liegen bei Sekunden mit Sekunden % P == Phase (täglich, wöchentlich).
+        ("monat", MONAT): Phase (Tag - 1) * SEKUNDEN_PRO_TAG + Uhrzeit, ("jahr", 12 * MONAT): zusätzlich (Monat - 1) * MONAT.
+        Der Tag gilt ungekürzt, in kürzeren Monaten liegt das Vorkommen am Monatsende (siehe km.plus_monate).
+        Intervalle über 1 und die Grenzen anzahl und bis werden nicht abgebildet, die Phasen beschreiben eine Obermenge.
+        :return: (Raster, Phasen)
+        """
+        if self.__periode is not None:
+            return ("sekunden", self.__periode), (self.start.sekunden % self.__periode,)
+        if self.wochentage is not None:
+            periode = 7 * self.intervall * km.SEKUNDEN_PRO_TAG
+            return ("sekunden", periode), tuple(
+                ((self.__montag + tag) * km.SEKUNDEN_PRO_TAG + self.__uhrzeit) % periode for tag in self.wochentage)
+        _, monat, tag = km.aus_ordinal(self.__tag + 1)
+        phase = (tag - 1) * km.SEKUNDEN_PRO_TAG + self.__uhrzeit
+        if self.frequenz == "monatlich":
+            return ("monat", self.MONAT), (phase,)
+        return ("jahr", 12 * self.MONAT), ((monat - 1) * self.MONAT + phase,)
+
+    def vorkommen(self, von:Zeitpunkt, bis:Zeitpunkt):
+        """Liefert die Vorkommen im Bereich [von, bis[ nacheinander, ohne sie vorher zu erzeugen.
+        :param von: Beginn des Bereichs.
+        :param bis: Ende des Bereichs (exklusiv).
+        :return: Generator über Zeitpunkte in aufsteigender Reihenfolge.
+        """
+        n = self.__anzahl_bis(von.sekunden - 1)
+        while True:
+            sekunden = self.__roh_nr(n)
+            if sekunden >= bis.sekunden or not self.__gueltig(n, sekunden):
+                return
+            yield Zeitpunkt(sekunden)
+            n += 1
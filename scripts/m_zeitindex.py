@@ -0,0 +1,173 @@
+"""
+Modul: m_zeitindex
+
+Zeitindex für Bereichsabfragen wie "Events an diesem Tag, in dieser Woche, in diesem Monat".
+Die Fälligkeiten aller Events liegen in einem nach (Zeitpunkt, ID) sortierten Array und werden per Binärsuche gefunden.
+Wiederholte Events sind zusätzlich nach der Phase ihrer Regel in ihrem Raster (Periode, Monat, Jahr) einsortiert,
+eine Abfrage erweitert nur die Events, deren Phase in den Bereich fällt.
+Der Index wird über die Änderungsmeldungen des Eventmanagers schrittweise nachgeführt.
+
+"""
+
+from bisect import bisect_left, insort
+from heapq import merge
+from itertools import repeat
+from scripts.m_datumzeit import Zeitpunkt
+from scripts.m_event import Event
+from scripts.m_speicher import Speicher
+from scripts.m_wiederholung import Regel
+from scripts import m_kalendermathe as km
+
+
+def _vorkommen_schluessel(vorkommen:tuple) -> tuple[int, int]:
+    """Sortierschlüssel für (Zeitpunkt, Event)-Tupel."""
+    return vorkommen[0].sekunden, vorkommen[1].id
+
+
+def _phasenbereiche(raster:tuple[str, int], von:int, bis:int) -> list[tuple[int, int]]:
+    """Übersetzt den Bereich [von, bis[ in Phasenbereiche [lo, hi[ eines Rasters aus Regel.phasen().
+    Das Ergebnis ist eine Obermenge: Berührt der Bereich den letzten Tag eines Monats,
+    reicht der Phasenbereich bis zum Ende des Rastermonats, dort liegen auch die auf das Monatsende gekürzten Tage.
+    :param raster: (Art, Länge in Sekunden)
+    :param von: Beginn in Sekunden.
+    :param bis: Ende in Sekunden (exklusiv).
+    :return: Liste von Phasenbereichen.
+    """
+    art, laenge = raster
+    if bis - von >= laenge:
+        return [(0, laenge)]
+    if art == "sekunden":
+        lo = von % laenge
+        hi = lo + bis - von
+        return [(lo, hi)] if hi <= laenge else [(lo, laenge), (0, hi - laenge)]
+    bereiche = []
+    jahr, monat, _ = km.aus_ordinal(von // km.SEKUNDEN_PRO_TAG + 1)
+    anfang = (km.ordinal(jahr, monat, 1) - 1) * km.SEKUNDEN_PRO_TAG
+    while anfang < bis:  # höchstens 13 Monate, der Bereich ist kürzer als das Raster
+        tage = km.monatslaenge(jahr, monat)
+        lo = max(von - anfang, 0)
+        hi = min(bis - anfang, tage * km.SEKUNDEN_PRO_TAG)
+        if hi > (tage - 1) * km.SEKUNDEN_PRO_TAG:
+            hi = Regel.MONAT
+        versatz = (monat - 1) * Regel.MONAT if art == "jahr" else 0
+        bereiche.append((versatz + lo, versatz + hi))
+        anfang += tage * km.SEKUNDEN_PRO_TAG
+        jahr, monat = km.monat_plus(jahr, monat, 1)
+    return bereiche
+
+
+class Zeitindex:
+    """Bereichsindex über die Fälligkeiten der Events.
+    Eine Abfrage kostet O(log n + k) für n Events und k Treffer, dazu je Raster der wiederholten Events
+    eine Binärsuche über ihre Phasen. Erweitert werden nur wiederholte Events, die im Bereich vorkommen können.
+    ————————————Attribute: ————————————
+        __schluessel (list[tuple[int, int]]): Sortierte (Sekunden, Event-ID)-Paare der Fälligkeiten aller Events.
+        __einmalig (dict[int, Event]): Einmalige Events nach ID.
+        __eingetragen (dict[int, tuple[int, int]]): Aktueller Schlüssel je Event, zum Entfernen.
+        __wiederholt (dict[int, Event]): Events mit Wiederholungsregel nach ID.
+        __phasen (dict[tuple[str, int], list[tuple[int, int]]]): Sortierte (Phase, Event-ID)-Paare der wiederholten Events je Raster.
+        __phasen_je_event (dict[int, tuple]): Raster und Phasen je wiederholtem Event, zum Entfernen.
+    ————————————Methoden: ————————————
+        einfuegen(ev: Event) → None: Nimmt ein Event auf bzw. trägt es nach einer Verschiebung neu ein.
+        entfernen(event_id: int) → None: Entfernt ein Event aus dem Index.
+        aenderungen_anwenden(aenderungen: list[tuple]) → None: Führt den Index mit Änderungsmeldungen des Eventmanagers nach.
+        vorkommen_im_bereich(von: Zeitpunkt, bis: Zeitpunkt) → Iterator[tuple[Zeitpunkt, Event]]: Vorkommen in [von, bis[.
+    """
+
+    def __init__(self, events=()) -> None:
+        """Baut den Index einmal aus den übergebenen Events auf.
+        :param events: Iterable aus Event-Objekten, z.B. die Event-Liste des Eventmanagers.
+        """
+        self.__einmalig: dict[int, Event] = {}
+        self.__eingetragen: dict[int, tuple[int, int]] = {}
+        self.__wiederholt: dict[int, Event] = {}
+        self.__phasen: dict[tuple[str, int], list[tuple[int, int]]] = {}
+        self.__phasen_je_event: dict[int, tuple] = {}
+        for ev in events:
+            self.__eingetragen[ev.id] = (ev.zeitpunkt.sekunden, ev.id)
+            if ev.regel is None:
+                self.__einmalig[ev.id] = ev
+            else:
+                self.__wiederholt[ev.id] = ev
+                raster, phasen = self.__phasen_je_event[ev.id] = ev.regel.phasen()
+                self.__phasen.setdefault(raster, []).extend((phase, ev.id) for phase in phasen)
+        self.__schluessel: list[tuple[int, int]] = sorted(self.__eingetragen.values())
+        for eintraege in self.__phasen.values():
+            eintraege.sort()
+
+    def __len__(self) -> int:
+        """Gibt die Anzahl der indizierten Events zurück."""
+        return len(self.__einmalig) + len(self.__wiederholt)
+
+    def einfuegen(self, ev:Event) -> None:
+        """Nimmt ein Event auf. Ein bereits enthaltenes Event mit derselben ID wird vorher entfernt.
+        :param ev: Aufzunehmendes Event.
+        """
+        self.entfernen(ev.id)
+        schluessel = (ev.zeitpunkt.sekunden, ev.id)
+        insort(self.__schluessel, schluessel)
+        self.__eingetragen[ev.id] = schluessel
+        if ev.regel is None:
+            self.__einmalig[ev.id] = ev
+            return
+        self.__wiederholt[ev.id] = ev
+        raster, phasen = self.__phasen_je_event[ev.id] = ev.regel.phasen()
+        eintraege = self.__phasen.setdefault(raster, [])
+        for phase in phasen:
+            insort(eintraege, (phase, ev.id))
+
+    def entfernen(self, event_id:int) -> None:
+        """Entfernt ein Event aus dem Index, unbekannte IDs werden ignoriert.
+        :param event_id: ID-Nummer des Events.
+        """
+        schluessel = self.__eingetragen.pop(event_id, None)
+        if schluessel is None:
+            return
+        del self.__schluessel[bisect_left(self.__schluessel, schluessel)]
+        if self.__einmalig.pop(event_id, None) is not None:
+            return
+        del self.__wiederholt[event_id]
+        raster, phasen = self.__phasen_je_event.pop(event_id)
+        eintraege = self.__phasen[raster]
+        for phase in phasen:
+            del eintraege[bisect_left(eintraege, (phase, event_id))]
+        if not eintraege:
+            del self.__phasen[raster]
+
+    def aenderungen_anwenden(self, aenderungen:list[tuple]) -> None:
+        """Führt den Index mit den Änderungen des Eventmanagers nach, passend für Eventman.beobachter_anmelden().
+        :param aenderungen: Liste von (Art, Event)- bzw. (Speicher.ENTFERNT, Event-ID)-Tupeln.
+        """
+        for art, wert in aenderungen:
+            if art == Speicher.ENTFERNT:
+                self.entfernen(wert)
+            else:
+                self.einfuegen(wert)
+
+    def __kandidaten(self, von:int, bis:int, faellig:list[tuple[int, int]]) -> set[int]:
+        """Sammelt die IDs der wiederholten Events, die in [von, bis[ vorkommen können:
+        Fälligkeit im Bereich oder eine Phase ihrer Regel in den Phasenbereichen.
+        :param faellig: Ausschnitt von __schluessel mit den Fälligkeiten im Bereich.
+        """
+        kandidaten = {event_id for _, event_id in faellig if event_id in self.__wiederholt}
+        for raster, eintraege in self.__phasen.items():
+            for lo, hi in _phasenbereiche(raster, von, bis):
+                kandidaten.update(event_id for _, event_id in eintraege[bisect_left(eintraege, (lo,)):bisect_left(eintraege, (hi,))])
+        return kandidaten
+
+    def vorkommen_im_bereich(self, von:Zeitpunkt, bis:Zeitpunkt):
+        """Liefert alle Vorkommen im Bereich [von, bis[ nach Zeit sortiert, Wiederholungen eingeschlossen.
+        :param von: Beginn des Bereichs.
+        :param bis: Ende des Bereichs (exklusiv).
+        :return: Generator über (Zeitpunkt, Event)-Tupel.
+        """
+        anfang = bisect_left(self.__schluessel, (von.sekunden, 0))
+        ende = bisect_left(self.__schluessel, (bis.sekunden, 0))
+        faellig = self.__schluessel[anfang:ende]
+        einmalig = ((Zeitpunkt(sekunden), self.__einmalig[event_id]) for sekunden, event_id in faellig if event_id in self.__einmalig)
+        if not self.__wiederholt:
+            yield from einmalig
+            return
+        folgen = [zip(self.__wiederholt[event_id].vorkommen(von, bis), repeat(self.__wiederholt[event_id]))
+                  for event_id in self.__kandidaten(von.sekunden, bis.sekunden, faellig)]
+        yield from merge(einmalig, *folgen, key=_vorkommen_schluessel)